@@ -0,0 +1,139 @@
+import sys
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# 모든 기사에 있는 필드 (없으면 빈 문자열 / published는 None)
+CORE_FIELDS = ('title', 'link', 'summary', 'published', 'source')
+# HN 기사에만 있는 필드 (None이면 키가 없는 것으로 취급)
+OPTIONAL_FIELDS = ('score', 'comments')
+_FIELDS = frozenset(CORE_FIELDS + OPTIONAL_FIELDS)
+
+
+def normalize_published(value) -> Optional[datetime]:
+    """발행일 표현을 naive datetime 하나로 통일 (해석 불가면 None)
+
+    struct_time/튜플(feedparser, 스트리밍 파서), JSON에서 복원된 리스트,
+    datetime, ISO 문자열(저장소/캐시)을 모두 받음.
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (tuple, list)) and len(value) >= 6:
+        try:
+            return datetime(*value[:6])
+        except (TypeError, ValueError):
+            return None
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+class Article(MutableMapping):
+    """수집한 기사 하나 (__slots__ 레코드)
+
+    발행일은 만들 때 한 번만 datetime으로 정규화하고, 출처 이름은 intern해
+    수천 개 피드의 기사가 같은 문자열을 공유함. 기존 코드가 dict처럼 다룰 수 있도록
+    article['title'], article.get('score', 0), dict(article)을 지원하며,
+    rank_score처럼 정해지지 않은 필드는 extra에 따로 둠.
+    """
+
+    __slots__ = CORE_FIELDS + OPTIONAL_FIELDS + ('extra',)
+
+    def __init__(self, title: str = '', link: str = '', summary: str = '', published=None,
+                 source: str = '', score: Optional[int] = None, comments: Optional[int] = None,
+                 **extra):
+        self.title = title or ''
+        self.link = link or ''
+        self.summary = summary or ''
+        self.published = normalize_published(published)
+        self.source = sys.intern(source) if source else ''
+        self.score = score
+        self.comments = comments
+        self.extra: Optional[Dict] = extra or None   # 대부분의 기사는 비어 있으므로 필요할 때만 생성
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        """JSON으로 저장할 수 있는 dict (published는 ISO 문자열)"""
+        data = dict(self)
+        data['published'] = self.published.isoformat() if self.published else ''
+        return data
+
+    def copy(self) -> 'Article':
+        article = Article.__new__(Article)
+        for name in Article.__slots__:
+            setattr(article, name, getattr(self, name))
+        if self.extra:
+            article.extra = dict(self.extra)
+        return article
+
+    def __getitem__(self, key: str):
+        if key in _FIELDS:
+            value = getattr(self, key)
+            if value is None and key in OPTIONAL_FIELDS:
+                raise KeyError(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key == 'published':
+            self.published = normalize_published(value)
+        elif key == 'source':
+            self.source = sys.intern(value) if value else ''
+        elif key in _FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in OPTIONAL_FIELDS and getattr(self, key) is not None:
+            setattr(self, key, None)
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from CORE_FIELDS
+        for key in OPTIONAL_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return (len(CORE_FIELDS) + sum(getattr(self, key) is not None for key in OPTIONAL_FIELDS)
+                + len(self.extra or ()))
+
+    def __repr__(self) -> str:
+        return f"Article({self.title[:40]!r}, {self.source!r})"
+
+
+def json_default(value):
+    """json.dump(default=...)용: Article / datetime을 직렬화 가능한 값으로"""
+    if isinstance(value, Article):
+        return value.to_dict()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def with_cluster_members(articles: Sequence[Dict]) -> List[Dict]:
+    """이력에 기록할 기사: 대표 기사 + 같은 주제로 묶였던 기사 (topic_cluster.select_diverse의 cluster)
+
+    numpy를 쓰지 않으므로 렌더링/발송 단계에서 불러도 topic_cluster를 import하지 않음.
+    """
+    covered = []
+    for article in articles:
+        covered.append(article)
+        covered.extend(article.get('cluster') or ())
+    return covered
@@ -0,0 +1,219 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from feed_cache import CACHE_DIR
+from metrics import current as current_metrics
+
+# 본문 추출 설정
+EXTRACT_MAX_WORKERS = 8           # 동시에 받을 페이지 수
+EXTRACT_TIMEOUT = 8               # 페이지당 타임아웃 (초)
+EXTRACT_MAX_BYTES = 1_500_000     # 페이지당 최대 다운로드 크기 (넘으면 앞부분만 사용)
+EXTRACT_MAX_CHARS = 8000          # 캐시에 보관할 본문 최대 길이
+EXTRACT_SUMMARY_SENTENCES = 4     # 추출 요약 문장 수
+EXTRACT_SUMMARY_CHARS = 600       # 추출 요약 최대 길이
+EXTRACT_CACHE_PATH = os.path.join(CACHE_DIR, 'articles.json')
+EXTRACT_CACHE_TTL = 7 * 24 * 3600     # 본문은 거의 바뀌지 않으므로 길게 보관
+EXTRACT_FAILURE_TTL = 3600            # 실패한 URL은 이 시간 동안 다시 시도하지 않음
+EXTRACT_USER_AGENT = 'Mozilla/5.0 (compatible; blog-auto/1.0)'
+
+
+_NOISE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside',
+               'form', 'figure', 'iframe', 'svg', 'button']
+_MIN_PARAGRAPH_CHARS = 40
+_SENTENCE = re.compile(r'(?<=[.!?。])\s+')
+_WORD = re.compile(r'[A-Za-z가-힣][A-Za-z0-9가-힣\-]+')
+_STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i in is it its of on or our
+she that the their them they this to was we were which will with you your said says
+also more than about after into over new one two can could would should been not
+""".split())
+
+
+@lru_cache(maxsize=None)
+def html_parser() -> str:
+    """lxml이 있으면 lxml 파서 사용"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+
+def extract_main_text(html: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    """HTML에서 본문 문단만 추출 (article → main → 문단이 가장 많은 블록 순)
+
+    바이트로 받으면 encoding(응답 헤더의 charset)을, 없으면 문서의 <meta charset>을 따라 디코딩.
+    """
+    from bs4 import BeautifulSoup   # 본문 추출 단계에서만 필요
+    options = {'from_encoding': encoding} if encoding and isinstance(html, bytes) else {}
+    soup = BeautifulSoup(html, html_parser(), **options)
+    for tag in soup(_NOISE_TAGS):
+        tag.decompose()
+
+    root = soup.find('article') or soup.find('main')
+    if root is None:
+        # 문단 글자 수가 가장 많은 부모 블록을 본문으로 간주
+        weights: Counter = Counter()
+        parents = {}
+        for p in soup.find_all('p'):
+            if p.parent is not None:
+                parents[id(p.parent)] = p.parent
+                weights[id(p.parent)] += len(p.get_text())
+        root = parents[weights.most_common(1)[0][0]] if weights else soup
+
+    paragraphs = []
+    for p in root.find_all('p'):
+        text = ' '.join(p.get_text(' ', strip=True).split())
+        if len(text) >= _MIN_PARAGRAPH_CHARS:
+            paragraphs.append(text)
+    return '\n'.join(paragraphs)[:EXTRACT_MAX_CHARS]
+
+
+def summarize(text: str, max_sentences: int = EXTRACT_SUMMARY_SENTENCES,
+              max_chars: int = EXTRACT_SUMMARY_CHARS) -> str:
+    """단어 빈도 기반 추출 요약: 점수 높은 문장을 원래 순서대로 이어 붙임"""
+    sentences = [s.strip() for s in _SENTENCE.split(text.replace('\n', ' ')) if len(s.strip()) > 20]
+    if len(sentences) <= max_sentences:
+        return ' '.join(sentences)[:max_chars]
+
+    freq = Counter(w for w in (w.lower() for w in _WORD.findall(text)) if w not in _STOPWORDS)
+    if not freq:
+        return ' '.join(sentences[:max_sentences])[:max_chars]
+    top = freq.most_common(1)[0][1]
+
+    def score(index: int) -> float:
+        words = [w.lower() for w in _WORD.findall(sentences[index])]
+        if not words:
+            return 0.0
+        value = sum(freq.get(w, 0) for w in words) / (top * len(words) ** 0.5)
+        return value * (1.2 if index == 0 else 1.0)   # 리드 문장 가산점
+
+    chosen = sorted(sorted(range(len(sentences)), key=score, reverse=True)[:max_sentences])
+    summary = ''
+    for index in chosen:
+        if len(summary) + len(sentences[index]) + 1 > max_chars and summary:
+            break
+        summary = f"{summary} {sentences[index]}".strip()
+    return summary[:max_chars]
+
+
+class ArticleExtractor:
+    """기사 링크의 본문을 동시에 받아 추출/요약하고 URL별로 디스크에 캐시"""
+
+    def __init__(self, max_workers: int = EXTRACT_MAX_WORKERS,
+                 timeout: float = EXTRACT_TIMEOUT,
+                 max_bytes: int = EXTRACT_MAX_BYTES,
+                 cache_path: Optional[str] = EXTRACT_CACHE_PATH):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.cache_path = cache_path
+        self.stats = {'hit': 0, 'miss': 0, 'failed': 0}
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict] = self._load_cache()
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = EXTRACT_USER_AGENT
+        adapter = HTTPAdapter(pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        now = time.time()
+        with self._lock:
+            self._cache = {
+                url: e for url, e in self._cache.items()
+                if now - e['fetched_at'] <= (EXTRACT_CACHE_TTL if e['text'] else EXTRACT_FAILURE_TTL)
+            }
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+
+    def _download(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """크기 제한을 지키며 HTML 다운로드 → (본문 바이트, 헤더에 명시된 charset) (HTML이 아니면 빈 바이트)
+
+        charset 없는 text/html에 requests가 채우는 ISO-8859-1은 쓰지 않고 문서의 <meta charset>에 맡김.
+        """
+        with self.session.get(url, timeout=self.timeout, stream=True) as resp:
+            resp.raise_for_status()
+            content_type = resp.headers.get('Content-Type', 'text/html')
+            if 'html' not in content_type:
+                return b'', None
+            body = b''
+            for chunk in resp.iter_content(64 * 1024):
+                body += chunk
+                if len(body) >= self.max_bytes:
+                    break
+            current_metrics().count('extract', bytes=len(body))
+            declared = resp.encoding if 'charset=' in content_type.lower() else None
+            return body[:self.max_bytes], declared
+
+    def extract(self, url: str) -> Dict:
+        """URL 하나의 {text, summary} (캐시 우선, 실패 시 빈 값)"""
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry:
+                ttl = EXTRACT_CACHE_TTL if entry['text'] else EXTRACT_FAILURE_TTL
+                if time.time() - entry['fetched_at'] <= ttl:
+                    self.stats['hit'] += 1
+                    return entry
+
+        try:
+            text = extract_main_text(*self._download(url))
+        except Exception as e:
+            print(f"본문 추출 실패 {url}: {e}")
+            text = ''
+        entry = {'fetched_at': time.time(), 'text': text, 'summary': summarize(text) if text else ''}
+        with self._lock:
+            self._cache[url] = entry
+            self.stats['miss' if text else 'failed'] += 1
+        return entry
+
+    def enrich(self, articles: List[Dict]) -> List[Dict]:
+        """기사 summary를 본문 추출 요약으로 교체 (추출 실패한 기사, Perplexity가 쓴 요약은 그대로)"""
+        started = time.perf_counter()
+        urls = ['' if a.get('curated') else a.get('link', '') for a in articles]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            entries = list(executor.map(lambda u: self.extract(u) if u else None, urls))
+        self._save_cache()
+
+        enriched = []
+        for article, entry in zip(articles, entries):
+            article = article.copy()
+            if entry and entry['summary']:
+                article['summary'] = entry['summary']
+                article['extracted'] = True
+            enriched.append(article)
+        count = sum(1 for a in enriched if a.get('extracted'))
+        current_metrics().count('extract', items_in=len(articles), items_out=count)
+        print(f"본문 추출 완료: {count}/{len(articles)}개, {time.perf_counter() - started:.2f}s "
+              f"(캐시 hit {self.stats['hit']} / miss {self.stats['miss']} / 실패 {self.stats['failed']})")
+        return enriched
+
+
+def enrich_articles(articles: List[Dict]) -> List[Dict]:
+    """선택된 기사들의 본문 요약을 채움"""
+    return ArticleExtractor().enrich(articles)
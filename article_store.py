@@ -0,0 +1,124 @@
+import json
+import os
+import sqlite3
+import time
+from typing import List, Dict, Optional, Tuple
+
+from article import Article, json_default
+from dedup import DedupIndex, canonicalize_url, simhash
+from ranking import score_articles
+
+# 수집 기사 저장소 설정
+ARTICLE_DB_PATH = os.getenv('ARTICLE_DB_PATH', os.path.join('data', 'articles.db'))
+ARTICLE_RETENTION_HOURS = 72      # 처음 본 뒤 이 시간이 지난 기사는 삭제
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT,
+    data TEXT NOT NULL,             -- 기사 dict (JSON)
+    rank_score REAL NOT NULL DEFAULT 0,
+    first_seen REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles(first_seen);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _dump(article: Dict) -> str:
+    """published를 ISO 문자열로 바꿔 JSON 직렬화"""
+    data = article if isinstance(article, Article) else Article.from_dict(article)
+    return json.dumps(data.to_dict(), ensure_ascii=False, default=json_default)
+
+
+def _load(raw: str) -> Article:
+    return Article.from_dict(json.loads(raw))
+
+
+class ArticleStore:
+    """하루 동안 조금씩 수집한 기사를 중복 병합/점수화해 보관하는 SQLite 저장소
+
+    중복 판단은 메모리의 DedupIndex로 하고, 바뀐 기사만 바로 DB에 기록하므로
+    프로세스가 재시작돼도 수집한 기사와 상태(state)가 그대로 남음.
+    """
+
+    def __init__(self, path: str = ARTICLE_DB_PATH,
+                 retention_hours: float = ARTICLE_RETENTION_HOURS):
+        self.path = path
+        self.retention_hours = retention_hours
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+        self.prune()
+        self._load_index()
+
+    def _load_index(self):
+        self.index = DedupIndex()
+        self._row_ids: List[int] = []
+        for row_id, raw in self.conn.execute('SELECT id, data FROM articles ORDER BY id'):
+            self.index.add(_load(raw))
+            self._row_ids.append(row_id)
+
+    def add_articles(self, articles: List[Dict]) -> Tuple[int, int]:
+        """새 기사는 추가, 이미 있는 기사는 병합하고 점수 갱신 → (새 기사 수, 병합 수)"""
+        changed = set()
+        added = 0
+        for article in articles:
+            url = canonicalize_url(article.get('link', ''))
+            title = article.get('title', '')
+            existing = self.index.find(url, simhash(title) if title.strip() else None)
+            self.index.add(article)
+            if existing is None:
+                added += 1
+                changed.add(len(self.index.articles) - 1)
+            else:
+                changed.add(existing)
+
+        if changed:
+            positions = sorted(changed)
+            scores = score_articles([self.index.articles[i] for i in positions])['total']
+            now = time.time()
+            with self.conn:
+                for i, score in zip(positions, scores):
+                    article = self.index.articles[i]
+                    article['rank_score'] = round(float(score), 4)
+                    url = canonicalize_url(article.get('link', '')) or None
+                    if i < len(self._row_ids):
+                        self.conn.execute(
+                            'UPDATE articles SET url = ?, data = ?, rank_score = ?, updated_at = ? WHERE id = ?',
+                            (url, _dump(article), article['rank_score'], now, self._row_ids[i]))
+                    else:
+                        cur = self.conn.execute(
+                            'INSERT INTO articles (url, data, rank_score, first_seen, updated_at) '
+                            'VALUES (?, ?, ?, ?, ?)',
+                            (url, _dump(article), article['rank_score'], now, now))
+                        self._row_ids.append(cur.lastrowid)
+        return added, len(changed) - added
+
+    def articles(self) -> List[Dict]:
+        """보관 중인 기사 (수집 순서)"""
+        return [a.copy() for a in self.index.articles]
+
+    def prune(self):
+        """보관 기간이 지난 기사 삭제 (삭제된 게 있으면 인덱스 재구성)"""
+        cutoff = time.time() - self.retention_hours * 3600
+        with self.conn:
+            deleted = self.conn.execute('DELETE FROM articles WHERE first_seen < ?', (cutoff,)).rowcount
+        if deleted and hasattr(self, 'index'):
+            self._load_index()
+
+    def get_state(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_state(self, key: str, value: str):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)', (key, value))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,55 @@
+"""주제 군집 벤치마크 (네트워크 없이 합성 기사 사용)
+
+실행: python -m benchmarks.bench_cluster [기사 수 ...]
+
+같은 사건을 여러 매체가 조금씩 다른 제목으로 쓴 기사 묶음을 만들어
+TF-IDF 계산, 유사 쌍 계산, 군집화, 대표 선택 시간과 군집 수를 측정.
+"""
+import random
+import sys
+import time
+from typing import Dict, List
+
+from topic_cluster import article_text, cluster_articles, select_diverse, similar_pairs, tfidf
+
+STORIES_PER_100 = 15              # 기사 100개당 서로 다른 사건 수
+COMMON = ('AI', 'startup', 'model', 'cloud', 'developers', 'security', '출시', '발표', '서비스')
+
+
+def synthetic_articles(count: int, seed: int = 7) -> List[Dict]:
+    """사건마다 고유 단어 5개, 기사마다 그중 3-4개 + 흔한 단어/잡음 단어로 제목과 요약을 만듦"""
+    rng = random.Random(seed)
+    stories = [[f"story{s}word{w}" for w in range(5)] for s in range(max(1, count * STORIES_PER_100 // 100))]
+    articles = []
+    for i in range(count):
+        words = rng.sample(rng.choice(stories), rng.randint(3, 4))
+        title = ' '.join(words + rng.sample(COMMON, 2))
+        summary = ' '.join(words + [rng.choice(COMMON) if rng.random() < 0.3 else f"filler{rng.randint(0, 50000)}"
+                                    for _ in range(30)])
+        articles.append({'title': title, 'summary': summary, 'link': f'https://news.example/{i}',
+                         'source': f'Publisher {i % 40}'})
+    return articles
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+    print(f"{'기사 수':>8} {'TF-IDF':>9} {'유사 쌍':>9} {'군집화':>9} {'대표 10개':>9} {'군집 수':>7} {'쌍 수':>8}")
+    for count in sizes:
+        articles = synthetic_articles(count)
+        texts = [article_text(a) for a in articles]
+        _, tfidf_time = timed(tfidf, texts)
+        (left, _, _), pairs_time = timed(similar_pairs, texts)
+        clusters, cluster_time = timed(cluster_articles, articles)
+        _, select_time = timed(select_diverse, articles, 10)
+        print(f"{count:>8} {tfidf_time * 1000:>7.1f}ms {pairs_time * 1000:>7.1f}ms "
+              f"{cluster_time * 1000:>7.1f}ms {select_time * 1000:>7.1f}ms {len(clusters):>7} {len(left):>8}")
+
+
+if __name__ == '__main__':
+    main()
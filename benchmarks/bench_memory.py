@@ -0,0 +1,97 @@
+"""기사 레코드 메모리 / 피드 파싱 벤치마크 (네트워크 없이 합성 피드 사용)
+
+실행: python -m benchmarks.bench_memory [피드 수] [--processes 4]
+
+- 메모리: 같은 기사를 이전 dict 형식(struct_time 발행일, 피드마다 따로 만든 출처 문자열)과
+  Article(__slots__, datetime, intern된 출처)로 들고 있을 때, 그리고 피드 캐시 JSON을
+  다시 읽을 때의 tracemalloc 사용량
+- 파싱: 전체 피드 본문을 한 프로세스에서 파싱할 때와 프로세스 풀로 나눌 때의 시간
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from article import Article
+from feed_stream import parse_feed_bytes
+
+ITEMS_PER_FEED = 5
+PUBLISHERS = 40                   # 피드 제목 종류 (같은 매체의 여러 카테고리 피드)
+
+
+def synthetic_feeds(count: int) -> List[bytes]:
+    """RSS 2.0 본문 count개 (피드당 ITEMS_PER_FEED + 5개 항목)"""
+    now = datetime(2025, 6, 1, 9, 0, 0)
+    feeds = []
+    for f in range(count):
+        items = ''.join(
+            f"<item><title>AI startup {f} raises seed round for agent tooling {i}</title>"
+            f"<link>https://news{f % 97}.example/{f}/{i}?utm_source=rss</link>"
+            f"<description>Developers get a new open-source LLM inference API. " * 3
+            + f"</description><pubDate>{(now - timedelta(hours=i)).strftime('%a, %d %b %Y %H:%M:%S +0000')}"
+            f"</pubDate></item>"
+            for i in range(ITEMS_PER_FEED + 5))
+        feeds.append(f"<?xml version='1.0'?><rss><channel><title>Publisher {f % PUBLISHERS}</title>"
+                     f"{items}</channel></rss>".encode())
+    return feeds
+
+
+def legacy_record(row: tuple, source: str) -> dict:
+    """이전 파서가 만들던 기사 dict"""
+    title, link, summary, published, _ = row
+    return {'title': title, 'link': link, 'summary': summary,
+            'published': published.timetuple(), 'source': source}
+
+
+def measure(label: str, build: Callable[[], list]) -> int:
+    tracemalloc.start()
+    records = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  {label:<34} {size / 1024 / 1024:8.2f} MB  {size / len(records):7.0f} B/기사")
+    del records
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='기사 레코드 메모리 / 피드 파싱 벤치마크')
+    parser.add_argument('feeds', nargs='?', type=int, default=2000)
+    parser.add_argument('--processes', type=int, default=4)
+    args = parser.parse_args()
+
+    bodies = synthetic_feeds(args.feeds)
+    print(f"# 합성 피드 {args.feeds}개, {sum(map(len, bodies)) / 1024 / 1024:.1f} MB")
+
+    started = time.perf_counter()
+    parsed = [parse_feed_bytes(body, ITEMS_PER_FEED) for body in bodies]
+    serial = time.perf_counter() - started
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        list(pool.map(parse_feed_bytes, bodies, [ITEMS_PER_FEED] * len(bodies), chunksize=64))
+    pooled = time.perf_counter() - started
+    print(f"\n# 파싱")
+    print(f"  {'1 프로세스':<34} {serial:8.2f} s")
+    print(f"  {f'프로세스 풀 {args.processes}개 (시작 포함)':<34} {pooled:8.2f} s")
+
+    # 피드마다 파서가 출처 문자열을 새로 만들던 상황을 재현
+    feeds = [(''.join(list(source)), rows) for source, rows in parsed]
+    print(f"\n# 수집 결과 보관 ({sum(len(rows) for _, rows in feeds)}개 기사)")
+    legacy = measure('dict + struct_time', lambda: [
+        legacy_record(row, source) for source, rows in feeds for row in rows])
+    compact = measure('Article (__slots__)', lambda: [
+        Article(*row) for _, rows in feeds for row in rows])
+    print(f"  → {legacy / compact:.1f}배 절약")
+
+    raw = json.dumps([Article(*row).to_dict() for _, rows in feeds for row in rows])
+    print(f"\n# 피드 캐시 JSON 다시 읽기 ({len(raw) / 1024 / 1024:.1f} MB)")
+    legacy = measure('json.loads → dict', lambda: json.loads(raw))
+    compact = measure('json.loads → Article.from_dict', lambda: [
+        Article.from_dict(data) for data in json.loads(raw)])
+    print(f"  → {legacy / compact:.1f}배 절약")
+
+
+if __name__ == '__main__':
+    main()
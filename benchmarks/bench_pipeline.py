@@ -0,0 +1,166 @@
+"""파이프라인 단계별 end-to-end 벤치마크 (기록된 fixture를 stub 서버로 재생)
+
+기록 (실제 API 키 필요):  python -m benchmarks.bench_pipeline record
+합성 fixture 재생성:      python -m benchmarks.make_fixtures
+실행:                     python -m benchmarks.bench_pipeline run [--repeat 3] [--latency 0.05] [--jitter 0.02] [--fail-rate 0]
+기준 갱신:                python -m benchmarks.bench_pipeline run --update-baseline
+
+fixtures/와 baseline.json은 커밋되어 있어 키 없이 바로 실행 가능 (fixture는 make_fixtures의 합성 응답).
+각 실행은 빈 임시 디렉터리에서 돌리므로 캐시/이력/outbox가 결과에 영향을 주지 않음.
+단계 시간의 중앙값이 기준보다 threshold 이상 느려지면 종료 코드 1
+(--repeat 1이면 첫 실행의 openai import 시간이 generate에 포함되므로 기본값 3 사용 권장).
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+REGRESSION_THRESHOLD = 0.5        # 기준 대비 50% 넘게 느려지면 실패
+MIN_REGRESSION_SECONDS = 0.05     # 이보다 작은 차이는 측정 잡음으로 보고 무시
+
+# 재생 시에는 키가 없어도 되도록 더미 값 (실제 값이 있으면 유지, 요청은 stub 서버로만 감)
+REPLAY_ENV = {
+    'PERPLEXITY_API_KEY': 'replay',
+    'OPENAI_API_KEY': 'replay',
+    'RESEND_API_KEY': 'replay',
+}
+
+
+def _preset(name: str) -> Callable[[], None]:
+    def run():
+        from cli import run_preset
+        run_preset(name, dry_run=False)
+    return run
+
+
+# 모두 cli.run_stages를 거치는 프리셋 실행 (python cli.py run --preset <name> 과 같음)
+PIPELINES: Dict[str, Callable[[], None]] = {
+    'trend': _preset('trend'),       # Perplexity → trend 에디션 (python main.py)
+    'blog': _preset('blog'),         # RSS/HN → report 에디션 (python blog.py)
+    'unified': _preset('all'),       # 전체 소스 수집 1회 → 에디션 전체
+}
+
+
+def _in_scratch_dir(func: Callable[[], None]) -> Dict[str, float]:
+    """빈 임시 디렉터리에서 func 실행 → 단계별 시간(초)"""
+    from metrics import current as current_metrics
+    cwd = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix='bench-')
+    os.chdir(scratch)
+    try:
+        func()
+        return {name: stage['seconds'] for name, stage in current_metrics().stages.items()}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def record_fixtures(names: List[str]):
+    """실제 API를 호출해 파이프라인별 fixture 기록"""
+    from benchmarks.replay import record
+    for name in names:
+        path = os.path.join(FIXTURES_DIR, name)
+        shutil.rmtree(path, ignore_errors=True)
+        print(f"📼 {name} 기록 중...")
+        with record(path):
+            _in_scratch_dir(PIPELINES[name])
+
+
+def run_benchmarks(names: List[str], repeat: int, **stub_options) -> Dict[str, Dict[str, float]]:
+    """fixture 재생으로 파이프라인을 repeat번 실행 → {pipeline: {stage: 중앙값(초)}}"""
+    import resilience
+    from benchmarks.replay import pinned_clock, replay
+    from benchmarks.stub_server import StubServer
+
+    results = {}
+    for name in names:
+        path = os.path.join(FIXTURES_DIR, name)
+        if not os.path.exists(os.path.join(path, 'index.json')):
+            print(f"⚠️  {name}: fixture 없음 ({path}) - 먼저 record 실행")
+            continue
+        samples: Dict[str, List[float]] = {}
+        with StubServer(path, **stub_options) as stub:
+            for i in range(repeat):
+                with replay(stub.url), pinned_clock(stub.store.recorded_at):
+                    stages = _in_scratch_dir(PIPELINES[name])
+                for stage, seconds in stages.items():
+                    samples.setdefault(stage, []).append(seconds)
+            print(f"🔁 {name}: stub {stub.stats}")
+            print(f"🛡️  {name}: {resilience.summary()}")
+        results[name] = {stage: statistics.median(values) for stage, values in samples.items()}
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """기준 대비 느려진 단계 목록"""
+    regressions = []
+    for name, stages in results.items():
+        print(f"\n[{name}]")
+        for stage, seconds in stages.items():
+            base = baseline.get(name, {}).get(stage)
+            if base is None:
+                print(f"  {stage:<16} {seconds:8.3f}s   (기준 없음)")
+                continue
+            change = (seconds - base) / base if base else 0.0
+            regressed = seconds - base > MIN_REGRESSION_SECONDS and change > threshold
+            print(f"  {stage:<16} {seconds:8.3f}s   기준 {base:.3f}s ({change:+.0%}){'  ❌' if regressed else ''}")
+            if regressed:
+                regressions.append(f"{name}.{stage}: {base:.3f}s → {seconds:.3f}s ({change:+.0%})")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='파이프라인 단계별 벤치마크')
+    parser.add_argument('command', choices=['record', 'run'])
+    parser.add_argument('--pipeline', choices=list(PIPELINES), action='append',
+                        help='대상 파이프라인 (기본: 전체)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help='요청당 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='요청당 추가 무작위 지연 최대값 (초)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='503으로 실패시킬 요청 비율')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args(argv)
+    names = args.pipeline or list(PIPELINES)
+
+    if args.command == 'record':
+        record_fixtures(names)
+        return 0
+
+    for key, value in REPLAY_ENV.items():
+        os.environ.setdefault(key, value)
+    results = run_benchmarks(names, args.repeat, latency=args.latency,
+                             jitter=args.jitter, fail_rate=args.fail_rate)
+    if not results:
+        return 1
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.update_baseline:
+        baseline.update({name: {k: round(v, 4) for k, v in stages.items()}
+                         for name, stages in results.items()})
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\n기준 갱신 → {BASELINE_PATH}")
+        return 0
+    if regressions:
+        print("\n❌ 성능 저하:\n  " + "\n  ".join(regressions))
+        return 1
+    print("\n✅ 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
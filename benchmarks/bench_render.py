@@ -0,0 +1,75 @@
+"""마크다운 렌더러 마이크로 벤치마크
+
+실행: python -m benchmarks.bench_render [반복 횟수]
+"""
+import re
+import sys
+import time
+
+from email_payload import markdown_to_text, optimize_email
+from markdown_render import render_markdown, render_page
+
+SECTION = """## 💥 요즘 다들 **AI 에이전트** 얘기만 하잖아?
+
+그래서 이번 주 뉴스를 정리해 봤어. `pip install agent` 한 줄이면 된다는데… 진짜일까?
+[원문 보기](https://example.com/news?id=42&utm_source=rss)
+
+### 📍 무슨 일이었냐면
+- 오픈소스 모델이 **벤치마크 1위**를 찍었고
+- API 가격은 절반으로 내려갔어
+- [ ] 우리 서비스에 바로 붙여볼 것
+- [x] 가격표 확인 완료
+
+1. 첫째, 비용
+2. 둘째, 속도
+
+> 한 줄 요약: 지금 안 써보면 손해야.
+
+---
+"""
+
+
+def legacy_render(md: str) -> str:
+    """이전 AITrendAnalyzer._markdown_to_html의 본문 변환 (비교 기준)"""
+    html = md
+    html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
+    html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
+    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
+    html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
+    html = re.sub(r'^- (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
+    html = re.sub(r'(<li>.*?</li>)', r'<ul>\1</ul>', html, flags=re.DOTALL)
+    html = re.sub(r'- \[ \] (.+)$', r'<li><input type="checkbox" disabled> \1</li>', html, flags=re.MULTILINE)
+    html = re.sub(r'- \[x\] (.+)$', r'<li><input type="checkbox" checked disabled> \1</li>', html, flags=re.MULTILINE)
+    paragraphs = [p.strip() for p in html.split('\n\n') if p.strip()]
+    return '\n'.join(p if p.startswith('<') else f'<p>{p}</p>' for p in paragraphs)
+
+
+def bench(name: str, func, md: str, repeat: int):
+    func(md)  # 워밍업
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(md)
+    elapsed = (time.perf_counter() - started) / repeat
+    size_mb = len(md.encode('utf-8')) / (1024 * 1024)
+    print(f"{name:<28} {elapsed * 1000:8.2f} ms/회  {size_mb / elapsed:8.1f} MB/s")
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for sections in (1, 50, 500):
+        md = SECTION * sections
+        print(f"\n# 입력 {len(md.encode('utf-8')) / 1024:.0f} KB ({sections} 섹션)")
+        bench('legacy (regex 여러 번)', legacy_render, md, repeat)
+        bench('render_markdown', render_markdown, md, repeat)
+        bench('render_markdown + page', lambda text: render_page(render_markdown(text)), md, repeat)
+        bench('+ optimize_email', lambda text: optimize_email(render_page(render_markdown(text)), 'trend'),
+              md, repeat)
+        bench('markdown_to_text', markdown_to_text, md, repeat)
+        page = render_page(render_markdown(md))
+        optimized, report = optimize_email(page, 'trend')
+        print(f"{'메일 HTML 크기':<28} {report['before'] / 1024:8.1f} KB → {report['after'] / 1024:.1f} KB "
+              f"(인라인 {report['inlined']}, 잘림 {report['truncated']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""API 키 없이 벤치마크/테스트를 돌리기 위한 합성 fixture 생성
+
+실행: python -m benchmarks.make_fixtures
+
+benchmarks/fixtures/<pipeline>/ 에 record와 같은 형식(index.json + bodies/*.gz)으로
+Perplexity, OpenAI, Resend, RSS(feeds.txt), HN, 기사 본문 응답을 만듦. 실제 응답으로
+바꾸려면 키를 설정하고 python -m benchmarks.bench_pipeline record 실행.
+내용과 시각이 고정되어 있어 다시 만들어도 같은 요청/응답이 나옴 (baseline.json과 함께 커밋).
+"""
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+
+from benchmarks.bench_pipeline import FIXTURES_DIR, PIPELINES
+from benchmarks.replay import FixtureStore
+from feed_fetcher import load_feed_list
+from hn_client import HN_API_BASE
+
+RECORDED_AT = datetime(2025, 6, 2, 9, 0, 0)
+FEED_ITEMS = 8
+HN_STORIES = 10
+JSON_HEADERS = {'content-type': 'application/json'}
+HTML_HEADERS = {'content-type': 'text/html; charset=utf-8'}
+
+TOPICS = [
+    ('OpenAI', 'ships an agent SDK for developers'),
+    ('Nvidia', 'unveils a cheaper inference GPU'),
+    ('Mistral', 'open-sources a small coding model'),
+    ('Anthropic', 'raises a new funding round'),
+    ('Google', 'adds long-context search to Gemini API'),
+    ('Meta', 'releases an on-device vision model'),
+    ('Stripe', 'launches usage-based billing for AI apps'),
+    ('Hugging Face', 'hosts a new open leaderboard'),
+]
+
+POST_MARKDOWN = "# 이번 주 AI 소식\n\n" + "\n\n".join(
+    f"## 💥 {company} 소식\n\n**{company}**가 {what}. [원문](https://news.example/{i})\n\n"
+    f"- 실무 포인트 {i}: 비용과 속도\n- 체크할 것: API 가격표"
+    for i, (company, what) in enumerate(TOPICS))
+
+
+def article_page(title: str) -> bytes:
+    paragraphs = ''.join(
+        f"<p>{title}. The release gives developers a faster way to ship features, and "
+        f"startups are already testing it in production workloads ({i}).</p>"
+        for i in range(12))
+    return (f"<html><head><title>{title}</title></head><body><nav>menu</nav>"
+            f"<article><h1>{title}</h1>{paragraphs}</article><footer>footer</footer></body></html>").encode()
+
+
+def chat_completion(content: str, model: str, prompt_tokens: int = 900, completion_tokens: int = 1200) -> bytes:
+    return json.dumps({
+        'id': 'chatcmpl-fixture', 'object': 'chat.completion', 'created': int(RECORDED_AT.timestamp()),
+        'model': model,
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+        'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                  'total_tokens': prompt_tokens + completion_tokens},
+    }).encode()
+
+
+def add_perplexity(store: FixtureStore):
+    """오늘의 뉴스 5개 + 끝이 잘린 항목 (관대한 JSON 파싱 경로)"""
+    items = [{'title': f"{company} {what}", 'summary': f"{company} {what} this week.",
+              'implications': 'Teams can try it today without new infrastructure.',
+              'url': f"https://news.example/{i}"} for i, (company, what) in enumerate(TOPICS[:5])]
+    content = ("Here are today's top 5 news [as of today]:\n```json\n" + json.dumps(items)[:-1]
+               + ', {"title": "cut off", "summary": "trunc')
+    store.add('POST', 'https://api.perplexity.ai/chat/completions', None, 200, JSON_HEADERS,
+              chat_completion(content, 'sonar', 50, 400))
+    for i, (company, what) in enumerate(TOPICS[:5]):
+        store.add('GET', f"https://news.example/{i}", None, 200, HTML_HEADERS, article_page(f"{company} {what}"))
+
+
+def add_feeds(store: FixtureStore):
+    """feeds.txt의 피드마다 FEED_ITEMS개 항목과 각 기사 본문"""
+    for f, url in enumerate(load_feed_list()):
+        items = []
+        for i in range(FEED_ITEMS):
+            company, what = TOPICS[(f + i) % len(TOPICS)]
+            link = f"https://feed{f}.example/{i}"
+            published = (RECORDED_AT - timedelta(hours=i + f)).strftime('%a, %d %b %Y %H:%M:%S +0000')
+            items.append(f"<item><title>{company} {what} ({f}-{i})</title><link>{link}</link>"
+                         f"<description>{company} {what}. Developers react.</description>"
+                         f"<pubDate>{published}</pubDate></item>")
+            store.add('GET', link, None, 200, HTML_HEADERS, article_page(f"{company} {what}"))
+        body = f"<?xml version='1.0'?><rss><channel><title>Feed {f}</title>{''.join(items)}</channel></rss>"
+        store.add('GET', url, None, 200, {'content-type': 'application/rss+xml', 'etag': f'"feed-{f}"'},
+                  body.encode())
+
+
+def add_hacker_news(store: FixtureStore):
+    store.add('GET', f'{HN_API_BASE}/topstories.json', None, 200, JSON_HEADERS,
+              json.dumps(list(range(1, HN_STORIES + 1))).encode())
+    for i in range(1, HN_STORIES + 1):
+        company, what = TOPICS[i % len(TOPICS)]
+        story = {'id': i, 'type': 'story', 'title': f"Show HN: {company} tool {i}",
+                 'url': f"https://hn.example/{i}", 'score': 100 * i, 'descendants': 10 * i,
+                 'time': int((RECORDED_AT - timedelta(hours=i)).timestamp())}
+        store.add('GET', f'{HN_API_BASE}/item/{i}.json', None, 200, JSON_HEADERS, json.dumps(story).encode())
+        store.add('GET', f"https://hn.example/{i}", None, 200, HTML_HEADERS, article_page(story['title']))
+
+
+def build(name: str):
+    path = os.path.join(FIXTURES_DIR, name)
+    shutil.rmtree(path, ignore_errors=True)
+    store = FixtureStore(path)
+    store.recorded_at = RECORDED_AT.isoformat()
+    if name in ('trend', 'unified'):
+        add_perplexity(store)
+        store.add('POST', 'https://api.openai.com/v1/chat/completions', None, 200, JSON_HEADERS,
+                  chat_completion(POST_MARKDOWN, 'gpt-4.1-nano-2025-04-14'))
+    if name in ('blog', 'unified'):
+        add_feeds(store)
+        add_hacker_news(store)
+        store.add('POST', 'https://api.openai.com/v1/chat/completions', None, 200, JSON_HEADERS,
+                  chat_completion(POST_MARKDOWN, 'gpt-3.5-turbo-16k'))
+    store.add('POST', 'https://api.resend.com/emails/batch', None, 200, JSON_HEADERS,
+              json.dumps({'data': [{'id': 'fixture-message'}]}).encode())
+    store.save()
+    print(f"📼 {name}: {len(store.entries)}개 응답 → {path}")
+
+
+if __name__ == '__main__':
+    for pipeline in PIPELINES:
+        build(pipeline)
@@ -0,0 +1,196 @@
+"""외부 HTTP 호출 기록/재생
+
+requests(Perplexity, Resend, RSS, HN, 본문 추출)와 httpx(OpenAI SDK)의 전송 함수를 감싸서
+- record: 실제 응답을 fixture 디렉터리에 저장
+- replay: 모든 요청을 로컬 stub 서버(stub_server.py)로 보내 저장된 응답을 재생
+
+fixture 구조:
+    <dir>/index.json      {"recorded_at": ISO 시각, "entries": [{method, url, body_hash, status, headers, body}]}
+    <dir>/bodies/<sha256>.gz   응답 본문 (gzip)
+요청 헤더(API 키 등)와 요청 본문은 저장하지 않고 본문 해시만 남김.
+"""
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+import requests
+
+REPLAY_URL_HEADER = 'X-Replay-Url'
+REPLAY_BODY_HEADER = 'X-Replay-Body-Hash'
+# 재생 시 그대로 돌려줄 응답 헤더 (본문은 이미 디코딩되어 저장되므로 인코딩/길이 헤더는 제외)
+KEPT_HEADERS = ('content-type', 'etag', 'last-modified', 'location')
+# 재생 시 시계를 기록 시점으로 맞출 모듈 (최근 N일 필터가 fixture를 버리지 않도록)
+CLOCK_MODULES = ('blog', 'main', 'pipeline', 'ranking', 'feed_fetcher', 'feed_stream')
+
+_original_requests_send = requests.Session.send
+_original_httpx_send = httpx.Client.send
+
+
+def body_hash(body) -> str:
+    """요청 본문 해시 (본문이 없으면 빈 문자열)"""
+    if not body:
+        return ''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+class FixtureStore:
+    """fixture 디렉터리 읽기/쓰기 및 요청 → 응답 매칭"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.recorded_at: Optional[str] = None
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+        self._cursor: Dict[tuple, int] = {}
+        index_path = os.path.join(path, 'index.json')
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.recorded_at = data.get('recorded_at')
+            self.entries = data.get('entries', [])
+
+    def add(self, method: str, url: str, request_body, status: int,
+            headers: Dict[str, str], content: bytes):
+        digest = hashlib.sha256(content).hexdigest()
+        os.makedirs(os.path.join(self.path, 'bodies'), exist_ok=True)
+        body_path = os.path.join(self.path, 'bodies', f'{digest}.gz')
+        if not os.path.exists(body_path):
+            with gzip.open(body_path, 'wb') as f:
+                f.write(content)
+        with self._lock:
+            self.entries.append({
+                'method': method.upper(),
+                'url': url,
+                'body_hash': body_hash(request_body),
+                'status': status,
+                'headers': {k.lower(): v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+                'body': digest,
+            })
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump({'recorded_at': self.recorded_at or datetime.now().isoformat(timespec='seconds'),
+                       'entries': self.entries}, f, ensure_ascii=False, indent=1)
+
+    def match(self, method: str, url: str, request_body_hash: str = '') -> Optional[Dict]:
+        """method+url+본문 해시가 같은 응답 우선, 없으면 method+url이 같은 응답을 기록 순서대로"""
+        method = method.upper()
+        same_url = [e for e in self.entries if e['method'] == method and e['url'] == url]
+        if not same_url:
+            return None
+        exact = [e for e in same_url if e['body_hash'] == request_body_hash]
+        candidates = exact or same_url
+        key = (method, url, request_body_hash if exact else None)
+        with self._lock:
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+        return candidates[index % len(candidates)]
+
+    def read_body(self, entry: Dict) -> bytes:
+        with gzip.open(os.path.join(self.path, 'bodies', f"{entry['body']}.gz"), 'rb') as f:
+            return f.read()
+
+
+@contextmanager
+def record(path: str):
+    """이 블록 안의 모든 HTTP 응답을 path에 기록"""
+    store = FixtureStore(path)
+    store.entries = []
+    store.recorded_at = datetime.now().isoformat(timespec='seconds')
+
+    def requests_send(session, request, **kwargs):
+        resp = _original_requests_send(session, request, **kwargs)
+        store.add(request.method, request.url, request.body, resp.status_code,
+                  dict(resp.headers), resp.content)
+        return resp
+
+    def httpx_send(client, request, **kwargs):
+        resp = _original_httpx_send(client, request, **kwargs)
+        store.add(request.method, str(request.url), request.content, resp.status_code,
+                  dict(resp.headers), resp.read())
+        return resp
+
+    requests.Session.send = requests_send
+    httpx.Client.send = httpx_send
+    try:
+        yield store
+    finally:
+        requests.Session.send = _original_requests_send
+        httpx.Client.send = _original_httpx_send
+        store.save()
+        print(f"📼 {len(store.entries)}개 응답 기록 → {path}")
+
+
+class _PinnedClockMeta(type):
+    # 모듈의 datetime을 바꿔 끼워도 isinstance(값, datetime) 검사는 그대로 동작하도록
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, datetime)
+
+
+class _PinnedClock(datetime, metaclass=_PinnedClockMeta):
+    """now()가 기록 시점 + 실제 경과 시간을 돌려주는 datetime"""
+    origin: datetime = datetime.now()
+    started: float = time.monotonic()
+
+    @classmethod
+    def now(cls, tz=None):
+        value = cls.origin + timedelta(seconds=time.monotonic() - cls.started)
+        return value if tz is None else value.astimezone(tz)
+
+
+@contextmanager
+def pinned_clock(recorded_at: Optional[str]):
+    """CLOCK_MODULES의 datetime.now()를 기록 시점 기준으로 고정"""
+    if not recorded_at:
+        yield
+        return
+    _PinnedClock.origin = datetime.fromisoformat(recorded_at)
+    _PinnedClock.started = time.monotonic()
+    patched = []
+    for name in CLOCK_MODULES:
+        module = importlib.import_module(name)
+        if getattr(module, 'datetime', None) is datetime:
+            module.datetime = _PinnedClock
+            patched.append(module)
+    try:
+        yield
+    finally:
+        for module in patched:
+            module.datetime = datetime
+
+
+@contextmanager
+def replay(stub_url: str):
+    """이 블록 안의 모든 HTTP 요청을 stub 서버로 보냄 (원래 URL은 헤더로 전달)"""
+    stub_url = stub_url.rstrip('/')
+
+    def requests_send(session, request, **kwargs):
+        request.headers[REPLAY_URL_HEADER] = request.url
+        request.headers[REPLAY_BODY_HEADER] = body_hash(request.body)
+        request.url = f"{stub_url}/replay"
+        return _original_requests_send(session, request, **kwargs)
+
+    def httpx_send(client, request, **kwargs):
+        request.headers[REPLAY_URL_HEADER] = str(request.url)
+        request.headers[REPLAY_BODY_HEADER] = body_hash(request.content)
+        request.url = httpx.URL(f"{stub_url}/replay")
+        return _original_httpx_send(client, request, **kwargs)
+
+    requests.Session.send = requests_send
+    httpx.Client.send = httpx_send
+    try:
+        yield
+    finally:
+        requests.Session.send = _original_requests_send
+        httpx.Client.send = _original_httpx_send
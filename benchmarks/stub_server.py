@@ -0,0 +1,122 @@
+"""기록된 fixture를 재생하는 로컬 stub HTTP 서버
+
+지연/지터/실패를 주입해 느린 소스, 타임아웃, 재시도 경로를 재현할 수 있음.
+요청은 benchmarks.replay.replay()가 /replay 로 보내며 원래 URL은 X-Replay-Url 헤더에 담김.
+
+실행: python -m benchmarks.stub_server <fixture 디렉터리> [--port 8780] [--latency 0.1] [--jitter 0.05] [--fail-rate 0.1]
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from benchmarks.replay import REPLAY_BODY_HEADER, REPLAY_URL_HEADER, FixtureStore
+
+STUB_CHUNK_SIZE = 16 * 1024       # 본문을 이 크기로 나눠 전송 (스트리밍 응답 재현)
+
+
+class StubServer:
+    """fixture 재생 서버 (별도 스레드에서 실행)"""
+
+    def __init__(self, fixtures: str, port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, fail_rate: float = 0.0,
+                 chunk_delay: float = 0.0, seed: Optional[int] = 0):
+        self.store = FixtureStore(fixtures)
+        self.latency = latency            # 응답 전 기본 지연 (초)
+        self.jitter = jitter              # 지연에 더할 최대 무작위 값 (초)
+        self.fail_rate = fail_rate        # 503으로 실패시킬 비율
+        self.chunk_delay = chunk_delay    # 본문 청크 사이 지연 (초)
+        self.random = random.Random(seed)
+        self.stats = {'served': 0, 'injected_failures': 0, 'unmatched': 0}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                with server._lock:
+                    delay = server.latency + server.random.uniform(0, server.jitter)
+                    fail = server.random.random() < server.fail_rate
+                time.sleep(delay)
+
+                entry = server.store.match(self.command, self.headers.get(REPLAY_URL_HEADER, ''),
+                                           self.headers.get(REPLAY_BODY_HEADER, ''))
+                if fail or entry is None:
+                    if entry is None:
+                        print(f"stub: fixture 없음 {self.command} {self.headers.get(REPLAY_URL_HEADER)}")
+                    with server._lock:
+                        server.stats['injected_failures' if fail else 'unmatched'] += 1
+                    body = b'injected failure' if fail else b'no fixture for this request'
+                    self.send_response(503 if fail else 404)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                body = server.store.read_body(entry)
+                self.send_response(entry['status'])
+                for name, value in entry['headers'].items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                for start in range(0, len(body), STUB_CHUNK_SIZE):
+                    if start and server.chunk_delay:
+                        time.sleep(server.chunk_delay)
+                    self.wfile.write(body[start:start + STUB_CHUNK_SIZE])
+                with server._lock:
+                    server.stats['served'] += 1
+
+            do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='fixture 재생 stub 서버')
+    parser.add_argument('fixtures')
+    parser.add_argument('--port', type=int, default=8780)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--chunk-delay', type=float, default=0.0)
+    args = parser.parse_args()
+    stub = StubServer(args.fixtures, args.port, args.latency, args.jitter,
+                      args.fail_rate, args.chunk_delay)
+    print(f"stub 서버 {stub.url} ({len(stub.store.entries)}개 fixture)")
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
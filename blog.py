@@ -1,425 +1,160 @@
 import os
-import feedparser
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from openai import OpenAI
-from typing import List, Dict
-import resend
-import schedule
-import time
+from typing import List, Dict, Optional
 from dotenv import load_dotenv
 import json
 
+from article import Article
+from article_store import ArticleStore
+from editions import EDITIONS
+from feed_cache import FeedCache
+from feed_fetcher import fetch_feeds_concurrently, load_feed_list
+from hn_client import HackerNewsClient
+from llm_cache import ResponseCache
+from llm_stream import OPENAI_STREAM, openai_client
+from ranking import print_ranking, rank_articles
+from topic_cluster import select_diverse
+
 # 환경 변수 로드
 load_dotenv()
 
 # 설정
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 RESEND_API_KEY = os.getenv('RESEND_API_KEY')
-EMAIL_FROM = os.getenv('EMAIL_FROM', 'blog@company.com')
-# EMAIL_TO = os.getenv('EMAIL_TO', '').split(',')
-EMAIL_TO='gyu3637@gmail.com'
+# 모델/대체 모델/발신자/수신자는 editions의 'report' 에디션에서 설정
+OPENAI_TIMEOUT = 120
+# 선택할 주제 수와, 같은 주제 기사를 묶기 위해 군집화에 넘길 상위 기사 수 (나머지는 랭킹에서 바로 제외)
+SELECT_TOP_N = 10
+CLUSTER_POOL_SIZE = 100
 
-# API 키 설정
-client = OpenAI(api_key=OPENAI_API_KEY)
-resend.api_key = RESEND_API_KEY
 
-# RSS 피드 소스
-RSS_FEEDS = [
-    'https://techcrunch.com/feed/',
-    'https://www.theverge.com/rss/index.xml',
-    'https://feeds.feedburner.com/TechCrunch/startups',
-    'https://www.wired.com/feed/rss',
-    'https://feeds.arstechnica.com/arstechnica/technology-lab',
-]
+# RSS 피드 소스 (feeds.txt 또는 FEEDS_PATH)
+RSS_FEEDS = load_feed_list()
 
 class ITTrendAnalyzer:
     def __init__(self):
         self.articles = []
+        self.debug_info = {}
+        self.rendered_body = ''  # 스트리밍 중 미리 렌더링된 HTML 본문
+        self.used_articles = []  # 프롬프트에 실제로 들어간 기사
+        self.post = {}           # 생성 결과 (프롬프트, 사용량 등 - 실행 기록용)
+        self.llm_cache = ResponseCache()  # 같은 입력 재실행 시 GPT 응답 재사용
         
-    def fetch_rss_feeds(self) -> List[Dict]:
-        """RSS 피드에서 최신 기사 수집"""
-        all_articles = []
-        
-        for feed_url in RSS_FEEDS:
-            try:
-                feed = feedparser.parse(feed_url)
-                for entry in feed.entries[:5]:  # 각 피드에서 최신 5개로 증가
-                    article = {
-                        'title': entry.title,
-                        'link': entry.link,
-                        'summary': entry.get('summary', ''),
-                        'published': entry.get('published_parsed', ''),
-                        'source': feed.feed.title
-                    }
-                    all_articles.append(article)
-            except Exception as e:
-                print(f"Error fetching {feed_url}: {e}")
-                
-        return all_articles
-    
-    def fetch_hacker_news(self) -> List[Dict]:
-        """Hacker News 상위 스토리 수집"""
+    def fetch_rss_feeds(self, days: int = 1) -> List[Dict]:
+        """RSS 피드에서 최신 기사 수집 (동시 수집, 조건부 GET 캐시, 스트리밍 파싱)"""
+        # filter_recent_articles와 같은 기준일 이전 항목이 나오면 읽기 중단
+        since = datetime.now() - timedelta(days=days)
+        return fetch_feeds_concurrently(RSS_FEEDS, limit=5,  # 각 피드에서 최신 5개
+                                        cache=FeedCache(), stream=True, since=since)
+    
+    def fetch_hacker_news(self, top_n: int = 10) -> List[Dict]:
+        """Hacker News 상위 스토리 수집 (상위 N개를 동시에 조회)"""
         articles = []
         try:
-            # Top stories API
-            response = requests.get('https://hacker-news.firebaseio.com/v0/topstories.json')
-            story_ids = response.json()[:10]  # 상위 10개로 증가
-            
-            for story_id in story_ids:
-                story_response = requests.get(f'https://hacker-news.firebaseio.com/v0/item/{story_id}.json')
-                story = story_response.json()
-                
-                if story and story.get('type') == 'story':
-                    article = {
-                        'title': story.get('title', ''),
-                        'link': story.get('url', ''),
-                        'summary': f"HN Score: {story.get('score', 0)} | Comments: {story.get('descendants', 0)}",
-                        'published': datetime.fromtimestamp(story.get('time', 0)),
-                        'source': 'Hacker News'
-                    }
-                    articles.append(article)
+            for story in HackerNewsClient().top_stories(top_n):
+                article = Article(
+                    title=story.get('title', ''),
+                    link=story.get('url', ''),
+                    summary=f"HN Score: {story.get('score', 0)} | Comments: {story.get('descendants', 0)}",
+                    published=datetime.fromtimestamp(story.get('time', 0)),
+                    source='Hacker News',
+                    score=story.get('score', 0),
+                    comments=story.get('descendants', 0)
+                )
+                articles.append(article)
         except Exception as e:
             print(f"Error fetching Hacker News: {e}")
             
         return articles
     
-    def filter_recent_articles(self, articles: List[Dict], days: int = 1) -> List[Dict]:
-        """최근 N일 이내 기사만 필터링"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        filtered = []
-        
-        for article in articles:
-            try:
-                # 발행일 파싱
-                if isinstance(article['published'], tuple):
-                    pub_date = datetime(*article['published'][:6])
-                elif isinstance(article['published'], datetime):
-                    pub_date = article['published']
-                else:
-                    continue
-                    
-                if pub_date > cutoff_date:
-                    filtered.append(article)
-            except:
-                continue
-                
-        # 상위 10개로 증가 (더 많은 컨텍스트 제공)
-        return filtered[:10]
-    
-    def analyze_with_gpt(self, articles: List[Dict]) -> str:
-        """GPT를 사용해 트렌드 분석 및 블로그 포스트 생성"""
-        # 기사 정보 준비 - 상위 5개만 사용하여 입력 토큰 절감
-        top_articles = articles[:5]
-        articles_text = "\n".join([
-            f"{i+1}. {a['title']} ({a['source']})"
-            for i, a in enumerate(top_articles)
-        ])
-        
-        prompt = f"""AI 시장 관심자를 위한 IT 트렌드 블로그 작성
-
-[뉴스 제목]
-{articles_text}
-
-[타겟 독자]
-- AI 시장에 관심있는 스타트업 대표
-- 실무 개발자
-
-[작성 요구사항]
-분량: 2500-3000자
-톤앤매너: 밝고 현실적인 분위기, 담담한 지식 전달 (과한 강조나 과장 표현 지양)
-
-[구조]
-## 1. 인트로 (후킹) - 300자
-- 기사 기반의 후킹될 수 있는 질문이나 통계로 시작
-- 독자의 현실적 고민과 연결
-
-## 2. 본문 - 핵심 3가지 (각 600-700자)
-각 섹션별로:
-- 소제목: 50자 내외, 설명적이지 않게 (예: "개발 리스크" X → "정리가 안 되면 생기는 일" O)
-- 내용: 실무적 관점의 팁이나 구체적 사례 중심
-- 정보, 통찰, 리스크 등 다양한 관점 포함
-- 짧고 명확한 단락 구성
-
-## 3. 마무리 - 300자
-- 핵심 요약 정리
-- 실무에 적용 가능한 인사이트나 한 줄 메시지
-
-[스타일 가이드]
-- 마크다운 사용 (##, ###, **굵은글씨**)
-- 구체적 수치나 사례 포함
-- 한국 스타트업이나 개발자 상황에 맞는 예시
-- 지나친 미사여구나 감탄사 배제"""
-        
+    def filter_recent_articles(self, articles: List[Dict], days: int = 1,
+                               top_n: int = SELECT_TOP_N) -> List[Dict]:
+        """최근 N일 이내 기사 중 점수(최신성/HN 반응/소스/키워드 가중합) 상위 CLUSTER_POOL_SIZE개를 고른 뒤
+        주제 군집마다 대표 기사 하나씩 상위 top_n개 선택 (같은 주제 기사는 대표의 cluster/related로)"""
+        ranked = rank_articles(articles, k=max(top_n, CLUSTER_POOL_SIZE), max_age_hours=days * 24)
+        selected = select_diverse(ranked, top_n)
+        clustered = sum(len(a.get('cluster') or ()) for a in selected)
+        print(f"🏅 랭킹: {len(articles)}개 중 {len(ranked)}개 → 주제 {len(selected)}개 선택 "
+              f"(같은 주제 기사 {clustered}개 묶음)")
+        print_ranking(selected)
+        return selected
+    
+    def analyze_with_gpt(self, articles: List[Dict], stream: bool = OPENAI_STREAM) -> str:
+        """GPT를 사용해 트렌드 분석 및 블로그 포스트 생성 (stream=True면 스트리밍 생성)"""
         try:
-            # 토큰 최적화 설정
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo-16k",  # 비용 효율적인 모델로 변경
-                messages=[
-                    {"role": "system", "content": "AI 시장 전문가. 스타트업과 개발자를 위한 실용적이고 담담한 인사이트 제공."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2500  # 토큰 수 감소
-            )
-            
-            return response.choices[0].message.content
+            # 입력 토큰 예산 안에서 제목/출처/요약을 최대한 포함하고, 일시적 장애는 재시도,
+            # 계속 실패하면 대체 모델로 생성 (stream=True면 스트리밍)
+            # 클라이언트는 처음 생성할 때 만듦 (수집만 할 때는 openai를 import하지 않음)
+            client = openai_client(OPENAI_API_KEY, timeout=OPENAI_TIMEOUT)
+            self.post = post = EDITIONS['report'].generate(articles, client, self.llm_cache, stream)
         except Exception as e:
             print(f"GPT 분석 오류: {e}")
             return None
+        self.rendered_body, metrics = post['html'], post['metrics']
+        self.used_articles = post['used']
+        self.debug_info['packed_prompt'] = {'articles': len(self.used_articles), 'tokens': post['prompt_tokens']}
+        print(f"프롬프트: 기사 {len(self.used_articles)}/{len(articles)}개, 입력 {post['prompt_tokens']} 토큰")
+        if metrics:
+            self.debug_info['stream_metrics'] = metrics
+            print(f"TTFT {metrics['ttft']}s, {metrics['tokens_per_sec']} tok/s, "
+                  f"렌더링 마무리 {metrics['render_tail_ms']}ms")
+        self.debug_info['openai_usage'] = post['usage']
+        self.debug_info['llm_cache'] = self.llm_cache.hit_rate()
+        if post['cached']:
+            print("캐시된 GPT 응답 사용")
+        return post['content']
 
 class EmailSender:
     def __init__(self):
         self.api_key = RESEND_API_KEY
+        self.html_content = ''   # 마지막으로 발송한 HTML
         
-    def send_blog_post(self, content: str, recipients: List[str]):
-        """Resend API를 사용해 블로그 포스트를 이메일로 발송"""
-        subject = f"[AI 트렌드 리포트] {datetime.now().strftime('%Y년 %m월 %d일')} - 스타트업이 놓치면 안 되는 오늘의 인사이트"
-        
+    def send_blog_post(self, content: str, recipients: List[str], body_html: str = '') -> Optional[int]:
+        """Resend API를 사용해 블로그 포스트를 이메일로 발송 (HTML + 플레인 텍스트)
+        → post_id (한 명에게도 전달되지 않았으면 None)"""
         # HTML 버전 생성
-        html_content = self._markdown_to_html(content)
+        self.html_content = self._markdown_to_html(content, body_html)
         
         try:
-            # Resend API를 사용한 이메일 발송
-            r = resend.Emails.send({
-                "from": EMAIL_FROM,
-                "to": recipients,
-                "subject": subject,
-                "html": html_content,
-                "text": content  # 플레인 텍스트 버전
-            })
+            # Resend batch API로 발송 (실패한 수신자는 outbox에 남아 재시도 가능)
+            delivery = EDITIONS['report'].mail(self.html_content, content, recipients)
             
-            print(f"이메일 발송 완료: {r}")
+            if not delivery['sent']:
+                print(f"이메일 발송 실패: 포스트 #{delivery['post_id']}, 전달된 수신자 없음")
+                return None
+            print(f"이메일 발송 완료: 포스트 #{delivery['post_id']}, 수신자 {len(recipients)}명 중 {delivery['sent']}명")
+            return delivery['post_id']
             
         except Exception as e:
             print(f"이메일 발송 실패: {e}")
+            return None
     
-    def _markdown_to_html(self, markdown_text: str) -> str:
-        """마크다운을 HTML로 변환"""
-        html = markdown_text
-        
-        # 제목 변환
-        lines = html.split('\n')
-        formatted_lines = []
-        
-        for line in lines:
-            if line.startswith('#### '):
-                formatted_lines.append(f'<h4 style="color: #2c3e50; margin-top: 25px; font-size: 20px;">{line[5:]}</h4>')
-            elif line.startswith('### '):
-                formatted_lines.append(f'<h3 style="color: #34495e; margin-top: 35px; font-size: 24px; border-left: 4px solid #3498db; padding-left: 15px;">{line[4:]}</h3>')
-            elif line.startswith('## '):
-                formatted_lines.append(f'<h2 style="color: #2c3e50; margin-top: 40px; font-size: 28px;">{line[3:]}</h2>')
-            elif line.startswith('# '):
-                formatted_lines.append(f'<h1 style="color: #1a1a1a; font-size: 36px; margin-bottom: 30px;">{line[2:]}</h1>')
-            elif line.strip() == '':
-                formatted_lines.append('<br>')
-            else:
-                formatted_lines.append(f'<p style="line-height: 1.8; margin: 15px 0; text-align: justify;">{line}</p>')
-        
-        html = '\n'.join(formatted_lines)
-        
-        # 굵은 글씨
-        import re
-        html = re.sub(r'\*\*(.*?)\*\*', r'<strong style="color: #e74c3c; font-weight: 600;">\1</strong>', html)
-        
-        # 링크 변환
-        html = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2" target="_blank" style="color: #3498db; text-decoration: none; border-bottom: 1px dotted #3498db;">\1</a>', html)
-        
-        # 스타일 추가
-        styled_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{ 
-                    font-family: 'Noto Sans KR', -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif; 
-                    line-height: 1.8; 
-                    color: #333; 
-                    background-color: #f5f5f5;
-                }}
-                .container {{
-                    max-width: 800px; 
-                    margin: 0 auto; 
-                    padding: 50px 30px;
-                    background-color: white;
-                    box-shadow: 0 2px 20px rgba(0,0,0,0.1);
-                }}
-                h1, h2, h3, h4 {{ 
-                    color: #2c3e50; 
-                    margin-top: 30px;
-                    font-weight: 700;
-                }}
-                h1 {{ 
-                    border-bottom: 3px solid #3498db; 
-                    padding-bottom: 20px; 
-                    font-size: 36px;
-                    text-align: center;
-                }}
-                h2 {{
-                    font-size: 28px;
-                    color: #34495e;
-                    margin-top: 50px;
-                }}
-                h3 {{
-                    font-size: 24px;
-                    color: #2c3e50;
-                    border-left: 4px solid #3498db;
-                    padding-left: 15px;
-                    margin-top: 40px;
-                }}
-                h4 {{
-                    font-size: 20px;
-                    color: #34495e;
-                    margin-top: 30px;
-                }}
-                p {{ 
-                    margin: 20px 0; 
-                    text-align: justify;
-                    font-size: 16px;
-                    color: #444;
-                }}
-                strong {{ 
-                    color: #e74c3c; 
-                    font-weight: 600;
-                }}
-                a {{
-                    color: #3498db !important;
-                    text-decoration: none;
-                    border-bottom: 1px dotted #3498db;
-                    transition: all 0.3s ease;
-                }}
-                a:hover {{
-                    color: #2980b9 !important;
-                    border-bottom-style: solid;
-                }}
-                .reference-section {{
-                    margin-top: 60px;
-                    padding: 30px;
-                    background-color: #f8f9fa;
-                    border-left: 4px solid #3498db;
-                    border-radius: 5px;
-                }}
-                .reference-section h3 {{
-                    margin-top: 0;
-                    border: none;
-                    padding: 0;
-                }}
-                .reference-section ul {{
-                    list-style-type: none;
-                    padding: 0;
-                }}
-                .reference-section li {{
-                    margin: 15px 0;
-                    padding: 12px 0;
-                    border-bottom: 1px solid #e9ecef;
-                }}
-                .footer {{
-                    margin-top: 70px;
-                    padding-top: 30px;
-                    border-top: 2px solid #ecf0f1;
-                    font-size: 14px;
-                    color: #95a5a6;
-                    text-align: center;
-                }}
-                .footer p {{
-                    text-align: center;
-                }}
-                .highlight-box {{
-                    background-color: #f0f7ff;
-                    border-left: 4px solid #3498db;
-                    padding: 20px;
-                    margin: 30px 0;
-                    border-radius: 5px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                {html}
-                <div class="footer">
-                    <p>이 메일은 IT 트렌드 자동 분석 시스템에 의해 생성되었습니다.</p>
-                    <p>매일 오전 9시, 최신 IT 트렌드를 여러분의 메일함으로 전달해 드립니다.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return styled_html
+    def _markdown_to_html(self, markdown_text: str, body_html: str = '') -> str:
+        """마크다운을 HTML로 변환 (스트리밍 중 렌더링된 본문이 있으면 재사용)"""
+        return EDITIONS['report'].render(markdown_text, body_html)
 
-def run_daily_analysis():
-    """일일 분석 실행"""
+def run_daily_analysis(store: Optional[ArticleStore] = None) -> int:
+    """일일 분석 실행 (python cli.py run --preset blog 와 같음)
+
+    store가 주어지면 수집 대신 데몬이 미리 모아 둔 기사 사용.
+    수집/필터/생성/발송/이력 기록은 cli.run_stages가 담당.
+    """
+    from cli import run_preset
     print(f"트렌드 분석 시작: {datetime.now()}")
-    
-    # 1. 트렌드 분석기 초기화
-    analyzer = ITTrendAnalyzer()
-    
-    # 2. 기사 수집
-    print("기사 수집 중...")
-    rss_articles = analyzer.fetch_rss_feeds()
-    hn_articles = analyzer.fetch_hacker_news()
-    all_articles = rss_articles + hn_articles
-    
-    # 3. 최신 기사 필터링
-    recent_articles = analyzer.filter_recent_articles(all_articles)
-    print(f"수집된 최신 기사: {len(recent_articles)}개")
-    
-    if not recent_articles:
-        print("최신 기사가 없습니다.")
-        return
-    
-    # 4. GPT 분석
-    print("GPT 분석 중...")
-    blog_post = analyzer.analyze_with_gpt(recent_articles)
-    
-    if not blog_post:
-        print("블로그 포스트 생성 실패")
-        return
-    
-    # 5. 이메일 발송
-    print("이메일 발송 중...")
-    email_sender = EmailSender()
-    email_sender.send_blog_post(blog_post, EMAIL_TO)
-    
-    # 6. 로컬 파일로도 저장 (백업)
-    # filename = f"blog_post_{datetime.now().strftime('%Y%m%d_%H%M')}.md"
-    # with open(filename, 'w', encoding='utf-8') as f:
-    #     f.write(blog_post)
-    # print(f"블로그 포스트 저장: {filename}")
-    
-    # 7. 글자 수 확인
-    char_count = len(blog_post)
-    print(f"생성된 블로그 포스트 길이: {char_count}자")
-    
-    # 8. 비용 계산 출력 (최적화된 값)
-    input_tokens = 5 * 20 + 250  # 5개 기사 제목 + 간결한 프롬프트
-    output_tokens = 2500  # 줄어든 응답
-    # GPT-3.5-turbo-16k 가격 기준
-    cost = (input_tokens * 0.001 + output_tokens * 0.002) / 1000
-    print(f"예상 GPT 비용: ${cost:.4f} (약 {cost * 1350:.0f}원)")
-    print(f"토큰 절감률: 약 75% (이전 대비)")
-    
-    print("작업 완료!")
+    return run_preset('blog', store=store)
 
 def main():
-    """메인 실행 함수"""
+    """메인 실행 함수 - 수집 데몬으로 실행"""
     print("IT 트렌드 블로그 자동화 시작")
     
-    # 스케줄 설정 (매일 오전 9시)
-    schedule.every().day.at("09:00").do(run_daily_analysis)
-    
-    print("스케줄러 실행 중... (매일 오전 9시에 실행됩니다)")
-    print("즉시 실행하려면 'run_daily_analysis()' 함수를 직접 호출하세요.")
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # 1분마다 체크
+    # 하루 동안 기사를 미리 수집해 두고 매일 오전 9시(SEND_AT)에는 생성/발송만 수행.
+    # 다음 작업 시각까지 잠들어 있으므로 주기적으로 깨어나 확인하지 않음.
+    from ingest_daemon import IngestDaemon
+    IngestDaemon().run()
 
 if __name__ == "__main__":
-    # 테스트로 바로 실행
-    run_daily_analysis()
-    
-    # 스케줄러로 실행하려면 아래 주석 해제
-    # main()
\ No newline at end of file
+    # python blog.py == python cli.py run --preset blog (추가 인자는 그대로 전달)
+    # 데몬으로 실행하려면 python cli.py daemon
+    import sys
+    from cli import main as cli_main
+    sys.exit(cli_main(['run', '--preset', 'blog'] + sys.argv[1:]))
@@ -0,0 +1,297 @@
+"""blog-auto 실행 진입점 (main.py / blog.py 직접 실행도 여기로 연결됨)
+
+실행:          python cli.py run [--preset all|trend|blog] [--stages ingest,generate,render,send]
+                                 [--sources perplexity,rss,hn] [--editions trend,report] [--dry-run]
+수집 데몬:     python cli.py daemon
+발송 재시도:   python cli.py deliver
+실행 기록:     python cli.py archive url <URL> | spend | runs <시작일> [<종료일>] | show <id> [--field post] | stats
+import 시간:   python cli.py imports [--budget 1.5]
+
+단계 사이 결과는 RUN_DIR(기본 data/run)에 저장되므로 단계를 나눠 실행할 수 있음
+(예: --stages ingest,generate 로 만든 뒤 <에디션>.md를 고치고 --stages send).
+TEST_MODE=true 이거나 --dry-run 이면 발송과 이력 기록 없이 RUN_DIR에 HTML까지만 만듦.
+각 단계는 필요한 모듈만 import하며, 실행이 끝나면 단계별 import 시간을 출력함.
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+RUN_DIR = os.getenv('RUN_DIR', os.path.join('data', 'run'))
+TEST_MODE = os.getenv('TEST_MODE', '').lower() in ('1', 'true', 'yes')
+STAGES = ('ingest', 'generate', 'render', 'send')
+
+# 프리셋: (수집 소스, 에디션) - None이면 전체 / ENABLED_EDITIONS
+PRESETS = {
+    'all': (None, None),
+    'trend': (['perplexity'], ['trend']),      # 기존 python main.py
+    'blog': (['rss', 'hn'], ['report']),       # 기존 python blog.py
+}
+
+# 단계별로 필요한 모듈 (함수 안에서 처음 쓸 때 import하는 외부 패키지 포함)
+STAGE_IMPORTS = {
+    'ingest': ('pipeline',),
+    'generate': ('editions', 'openai', 'tiktoken'),
+    'render': ('editions',),
+    'send': ('editions', 'requests'),
+}
+IMPORT_REPORT_TOP = 8             # imports 명령에서 단계별로 보여줄 패키지 수
+
+
+class ImportTimer:
+    """단계별 import 시간과 새로 불러온 최상위 패키지 기록"""
+
+    def __init__(self):
+        self.records: List[Tuple[str, float, List[str]]] = []
+
+    @contextmanager
+    def measure(self, label: str):
+        before = set(sys.modules)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            loaded = {name.split('.')[0] for name in set(sys.modules) - before}
+            self.records.append((label, time.perf_counter() - started,
+                                 sorted(name for name in loaded if not name.startswith('_'))))
+
+    def load(self, stage: str):
+        with self.measure(stage):
+            for name in STAGE_IMPORTS[stage]:
+                try:
+                    importlib.import_module(name)
+                except ImportError:
+                    pass
+
+    def report(self) -> str:
+        total = sum(seconds for _, seconds, _ in self.records)
+        lines = [f"⏱️  import {total:.2f}s"]
+        for label, seconds, modules in self.records:
+            shown = ', '.join(modules[:IMPORT_REPORT_TOP])
+            more = f" 외 {len(modules) - IMPORT_REPORT_TOP}개" if len(modules) > IMPORT_REPORT_TOP else ''
+            lines.append(f"   {label:<9} {seconds:6.3f}s  {len(modules):3d}개  {shown}{more}")
+        return '\n'.join(lines)
+
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def _save_articles(path: str, articles: List[Dict]):
+    from article import json_default
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        # published(datetime)는 ISO 문자열로 저장 - 이후 단계는 제목/링크/요약만 사용
+        json.dump(articles, f, ensure_ascii=False, indent=2, default=json_default)
+
+
+def _load_articles(path: str) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_stages(stages: Sequence[str], sources: List[str], edition_names: List[str],
+               run_dir: str, dry_run: bool, timer: ImportTimer, pipeline: str = 'cli',
+               store=None, collector=None) -> int:
+    """선택한 단계만 실행 (앞 단계를 건너뛰면 run_dir에 저장된 결과에서 이어감)
+
+    수집 → 필터 → 생성 → 발송 → 이력 기록의 유일한 구현 (main.py / blog.py / pipeline.py의
+    run 함수와 데몬 발송, 벤치마크가 모두 여기를 거침).
+    store(ArticleStore)가 주어지면 소스를 호출하지 않고 데몬이 모아 둔 기사로 필터부터 진행하고,
+    collector(UnifiedPipeline)가 주어지면 그 설정(소스별 타임아웃 등)으로 수집함.
+    """
+    if dry_run and 'send' in stages:
+        stages = [stage for stage in stages if stage != 'send'] + ['render']
+        print(f"🧪 테스트 모드: 발송/이력 기록 생략, 결과는 {run_dir}에 저장")
+    started = time.perf_counter()
+
+    with timer.measure('metrics'):
+        from metrics import start_run
+    run_metrics = start_run(pipeline)
+    candidates_path = os.path.join(run_dir, 'candidates.json')
+
+    if 'ingest' in stages:
+        timer.load('ingest')
+        from pipeline import UnifiedPipeline
+        collector = collector or UnifiedPipeline(sources=sources)
+        candidates = collector.collect(store.articles() if store is not None else None)
+        _save_articles(candidates_path, candidates)
+        print(f"📥 후보 {len(candidates)}개 → {candidates_path}")
+        if not candidates:
+            print("⚠️  최신 기사가 없습니다.")
+            return 0
+    else:
+        candidates = _load_articles(candidates_path)
+
+    post_stages = [stage for stage in STAGES[1:] if stage in stages]
+    if post_stages:
+        for stage in post_stages:
+            timer.load(stage)
+        from editions import articles_to_items, covered_articles, enabled_editions, publish_editions
+        editions = enabled_editions(','.join(edition_names)) if edition_names else enabled_editions()
+        print(f"✍️  에디션 {', '.join(e.name for e in editions)}: {' → '.join(post_stages)}")
+        with run_metrics.stage('publish'):
+            results = publish_editions(articles_to_items(candidates), editions,
+                                       stages=post_stages, out_dir=run_dir)
+        if 'send' in post_stages:
+            from history_store import CoveredStore
+            history = CoveredStore()
+            history.mark_covered(covered_articles(candidates, results))
+            history.close()
+        if any('error' in result for result in results.values()):
+            print(f"📊 {run_metrics.summary()} → {run_metrics.write()}")
+            return 1
+
+    print(f"📊 {run_metrics.summary()} → {run_metrics.write()}")
+    print(f"🎉 모든 작업 완료! ({time.perf_counter() - started:.2f}s)")
+    return 0
+
+
+def run_preset(preset: str = 'all', edition_names: List[str] = None, store=None,
+               collector=None, run_dir: str = RUN_DIR, dry_run: bool = TEST_MODE) -> int:
+    """프리셋 전체 단계 실행 (python cli.py run --preset <preset> 과 같음)"""
+    sources, editions = PRESETS[preset]
+    timer = ImportTimer()
+    try:
+        return run_stages(STAGES, sources, edition_names or editions, run_dir, dry_run, timer,
+                          pipeline='unified' if preset == 'all' else preset,
+                          store=store, collector=collector)
+    finally:
+        print(timer.report())
+
+
+def import_breakdown(stage: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """새 프로세스에서 -X importtime으로 단계 모듈을 import → (총 초, [(최상위 패키지, 초)])
+
+    하위 모듈의 self 시간을 최상위 패키지(numpy, openai, ...)별로 합산함.
+    """
+    code = '\n'.join(f"try:\n    import {name}\nexcept ImportError:\n    pass"
+                     for name in STAGE_IMPORTS[stage])
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True)
+    packages: Dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or line.rstrip().endswith('imported package'):
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        root = name.strip().split('.')[0]
+        packages[root] = packages.get(root, 0.0) + int(self_us) / 1e6
+    ranked = sorted(packages.items(), key=lambda item: -item[1])
+    return sum(packages.values()), ranked
+
+
+def report_imports(budget: float = 0.0) -> int:
+    """단계별 콜드 스타트 import 시간 출력, budget(초)을 넘는 단계가 있으면 1"""
+    over = []
+    for stage in STAGES:
+        total, packages = import_breakdown(stage)
+        print(f"[{stage}] {total:.3f}s")
+        for name, seconds in packages[:IMPORT_REPORT_TOP]:
+            print(f"   {seconds:7.3f}s  {name}")
+        if budget and total > budget:
+            over.append(f"{stage} {total:.3f}s")
+    if over:
+        print(f"❌ import 시간 예산({budget}s) 초과: {', '.join(over)}")
+        return 1
+    return 0
+
+
+def query_archive(archive, query: str, values: List[str], field: str = None) -> int:
+    """실행 기록 인덱스 조회 결과를 한 줄에 하나씩 JSON으로 출력"""
+    if query in ('url', 'runs', 'show') and not values:
+        print(f"archive {query}: 값이 필요합니다")
+        return 2
+    if query == 'show':
+        run = archive.get_run(int(values[0]), [field] if field else ('items', 'prompt', 'post'))
+        if run is None:
+            print(f"실행 기록 #{values[0]} 없음")
+            return 1
+        if field:
+            value = run[field]
+            print(value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, indent=2))
+        else:
+            print(json.dumps(run, ensure_ascii=False, indent=2))
+        return 0
+    rows = {
+        'url': lambda: archive.runs_mentioning(values[0]),
+        'spend': archive.spend_by_month,
+        'runs': lambda: archive.runs_between(values[0], values[1] if len(values) > 1 else '9999-12-31'),
+        'sources': archive.top_sources,
+        'stats': lambda: [archive.stats()],
+    }[query]()
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='AI 트렌드 포스트 자동화')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='수집/생성/렌더링/발송 (단계 선택 가능)')
+    run.add_argument('--preset', choices=list(PRESETS), default='all')
+    run.add_argument('--stages', type=_split, default=list(STAGES),
+                     help=f"쉼표 구분 ({','.join(STAGES)}, 기본: 전체)")
+    run.add_argument('--sources', type=_split, help='수집 소스 (perplexity,rss,hn)')
+    run.add_argument('--editions', type=_split, help='에디션 (기본: 프리셋 또는 ENABLED_EDITIONS)')
+    run.add_argument('--run-dir', default=RUN_DIR)
+    run.add_argument('--dry-run', action='store_true', default=TEST_MODE,
+                     help='발송/이력 기록 없이 HTML까지만 생성 (TEST_MODE 환경 변수와 같음)')
+
+    commands.add_parser('daemon', help='하루 동안 수집하고 SEND_AT에 생성/발송')
+    commands.add_parser('deliver', help='outbox의 미발송/실패 수신자 재시도')
+    archive = commands.add_parser('archive', help='실행 기록 조회')
+    archive.add_argument('query', choices=['url', 'spend', 'runs', 'show', 'sources', 'stats'])
+    archive.add_argument('values', nargs='*', help='url: URL / runs: 시작일 [종료일] / show: 실행 번호')
+    archive.add_argument('--field', choices=['items', 'prompt', 'post', 'html'],
+                         help='show: 이 본문만 출력')
+    imports = commands.add_parser('imports', help='단계별 import 시간 측정')
+    imports.add_argument('--budget', type=float, default=0.0, help='단계별 허용 import 시간 (초)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'imports':
+        return report_imports(args.budget)
+    if args.command == 'run':
+        unknown = [stage for stage in args.stages if stage not in STAGES]
+        if unknown:
+            parser.error(f"알 수 없는 단계: {', '.join(unknown)}")
+
+    timer = ImportTimer()
+    with timer.measure('dotenv'):
+        from dotenv import load_dotenv
+    # 에디션 설정 등 모듈 상수가 .env 값을 읽도록 다른 모듈보다 먼저 로드
+    load_dotenv()
+    try:
+        if args.command == 'run':
+            sources, editions = PRESETS[args.preset]
+            return run_stages([stage for stage in STAGES if stage in args.stages],
+                              args.sources or sources, args.editions or editions,
+                              args.run_dir, args.dry_run, timer,
+                              pipeline='unified' if args.preset == 'all' else args.preset)
+        if args.command == 'daemon':
+            with timer.measure('daemon'):
+                from ingest_daemon import IngestDaemon
+            IngestDaemon().run()
+        elif args.command == 'deliver':
+            with timer.measure('send'):
+                from mailer import BatchMailer
+            with BatchMailer() as mailer:
+                print(mailer.deliver())
+        elif args.command == 'archive':
+            with timer.measure('archive'):
+                from run_archive import RunArchive
+            return query_archive(RunArchive(), args.query, args.values, args.field)
+        return 0
+    finally:
+        print(timer.report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import hashlib
+import re
+from typing import List, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 제거할 추적용 쿼리 파라미터
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref_src', 'cmpid', 'ncid', 'sr_share', 'guccounter',
+}   # ref/source 같은 일반적인 이름은 콘텐츠 식별에 쓰는 사이트가 있어 유지
+TRACKING_PREFIXES = ('utm_',)
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 8                 # 64비트를 8비트씩 8개 밴드로 나눠 인덱싱
+SIMHASH_MAX_DISTANCE = 6          # 이 해밍 거리 이하면 같은 기사로 판단 (밴드 수보다 작아야 함)
+SHINGLE_SIZE = 3                  # 제목 문자 n-gram 크기
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def canonicalize_url(url: str) -> str:
+    """추적 파라미터/스킴/호스트/끝 슬래시 차이를 없앤 비교용 URL"""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip('/')
+    # 스킴은 https로 통일, fragment는 제거
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def _shingles(text: str) -> List[str]:
+    normalized = _NON_WORD.sub(' ', text.lower()).strip()
+    if len(normalized) <= SHINGLE_SIZE:
+        return [normalized] if normalized else []
+    return [normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)]
+
+
+def simhash(text: str) -> int:
+    """문자 n-gram 기반 64비트 SimHash"""
+    shingles = _shingles(text)
+    if not shingles:
+        return 0
+    # 해시를 비트 문자열로 펼쳐 자리별 1의 개수를 세면 비트 루프 없이 계산 가능
+    rows = [
+        format(int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big'),
+               f'0{SIMHASH_BITS}b')
+        for s in shingles
+    ]
+    half = len(rows) / 2
+    bits = ''.join('1' if column.count('1') > half else '0' for column in zip(*rows))
+    return int(bits, 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def band_keys(value: int):
+    """SimHash를 (밴드 번호, 밴드 값) 쌍으로 분할"""
+    band_bits = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << band_bits) - 1
+    for band in range(SIMHASH_BANDS):
+        yield band, value >> (band * band_bits) & mask
+
+
+def _merge(kept: Dict, dup: Dict):
+    """중복 기사의 메타데이터 중 더 좋은 값을 kept에 반영"""
+    # 출처 목록은 아래에서 source를 바꾸기 전에 두 기사의 출처로 채움
+    sources = list(kept.get('sources') or ([kept['source']] if kept.get('source') else []))
+    for source in dup.get('sources') or [dup.get('source', '')]:
+        if source and source not in sources:
+            sources.append(source)
+    kept['sources'] = sources
+    for key in ('score', 'comments'):
+        if dup.get(key, 0) > kept.get(key, 0):
+            kept[key] = dup[key]
+    if not kept.get('link') and dup.get('link'):
+        kept['link'] = dup['link']
+    if kept.get('curated'):
+        pass  # Perplexity가 써 준 요약/시사점은 유지
+    elif dup.get('curated'):
+        kept['summary'], kept['implications'] = dup['summary'], dup.get('implications', '')
+        kept['curated'] = True
+    elif dup.get('source') == 'Hacker News':
+        pass  # HN 요약은 점수 문자열뿐이므로 사용하지 않음
+    elif kept.get('source') == 'Hacker News':
+        # 원문 매체의 요약/출처를 우선
+        kept['summary'], kept['source'] = dup.get('summary', ''), dup.get('source', '')
+    elif len(dup.get('summary', '')) > len(kept.get('summary', '')):
+        kept['summary'] = dup['summary']
+    if not kept.get('published') and dup.get('published'):
+        kept['published'] = dup['published']
+
+
+class DedupIndex:
+    """정규화 URL 해시 + SimHash 밴드 인덱스로 중복 기사를 찾는 인덱스
+
+    SimHash를 밴드로 나눠 저장하므로 해밍 거리가 밴드 수 미만인 후보는
+    최소 한 밴드가 일치하고, 조회 시 같은 밴드 버킷만 비교하면 됨.
+    """
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.articles: List[Dict] = []
+        self._hashes: List[int] = []
+        self._by_url: Dict[str, int] = {}
+        self._bands: Dict[tuple, List[int]] = {}
+
+    def find(self, url: str, fingerprint: Optional[int]) -> Optional[int]:
+        """같은 기사로 보이는 기존 항목의 위치"""
+        if url and url in self._by_url:
+            return self._by_url[url]
+        if fingerprint is None:
+            return None
+        for key in band_keys(fingerprint):
+            for idx in self._bands.get(key, ()):
+                if hamming_distance(fingerprint, self._hashes[idx]) <= self.max_distance:
+                    return idx
+        return None
+
+    def add(self, article: Dict) -> bool:
+        """기사 추가. 새 기사면 True, 기존 기사에 병합되면 False"""
+        url = canonicalize_url(article.get('link', ''))
+        title = article.get('title', '')
+        fingerprint = simhash(title) if title.strip() else None
+
+        idx = self.find(url, fingerprint)
+        if idx is not None:
+            _merge(self.articles[idx], article)
+            if url:
+                self._by_url.setdefault(url, idx)
+            return False
+
+        idx = len(self.articles)
+        self.articles.append(article.copy())
+        self._hashes.append(fingerprint or 0)
+        if url:
+            self._by_url[url] = idx
+        if fingerprint is not None:
+            for key in band_keys(fingerprint):
+                self._bands.setdefault(key, []).append(idx)
+        return True
+
+
+def dedupe_articles(articles: List[Dict]) -> List[Dict]:
+    """중복 기사를 병합해 처음 등장한 순서대로 반환"""
+    index = DedupIndex()
+    for article in articles:
+        index.add(article)
+    print(f"중복 제거: {len(articles)}개 → {len(index.articles)}개")
+    return index.articles
@@ -0,0 +1,367 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from article import json_default, with_cluster_members
+from email_payload import markdown_to_text, optimize_email
+from llm_cache import ResponseCache
+from llm_stream import StreamingPostWriter, complete_with_fallback, fallback_candidates, openai_client
+from mailer import BatchMailer, load_recipients
+from markdown_render import render_markdown, render_page
+from metrics import current as current_metrics
+from prompt_builder import build_prompt
+from run_archive import archive_post
+
+# 에디션 동시 생성 설정
+EDITION_MAX_PARALLEL = int(os.getenv('EDITION_MAX_PARALLEL', '3'))   # 동시에 생성/발송할 에디션 수
+ENABLED_EDITIONS = os.getenv('ENABLED_EDITIONS', '')                 # 쉼표 구분, 비어 있으면 전체
+POST_STAGES = ('generate', 'render', 'send')                         # 수집 이후 에디션별 단계
+
+# 모든 에디션이 공유하는 고정 지시문. 요청마다 바뀌는 뉴스 데이터는 항상 맨 뒤(user 메시지)에
+# 두어 system 메시지 앞부분이 요청 간에 그대로 유지되게 함 → 제공자 측 프롬프트 캐시 적용
+SHARED_INSTRUCTIONS = """입력 데이터는 마지막 user 메시지의 JSON 배열이며 한 줄에 뉴스 하나씩 중요도 순으로 들어 있습니다.
+필드: title(제목), source(출처), url(원문 링크), summary(요약), implications(시사점),
+related(같은 주제를 다룬 다른 기사의 "출처: 제목" 목록). 비어 있는 필드는 생략됩니다.
+뉴스 하나가 주제 하나이므로, 본문의 각 섹션은 주제 하나를 다루고 related의 출처도 함께 참고할 것.
+
+공통 규칙:
+- 입력에 없는 사실, 수치, 인용은 지어내지 말 것
+- 결과는 한국어 마크다운 본문만 출력 (코드펜스로 감싸지 말 것)
+- 제목(#)은 맨 첫 줄에 한 번만 쓰고, 본문의 소제목은 ## 이하를 사용할 것"""
+
+TREND_INSTRUCTIONS = """당신은 스타트업 창업자와 개발자들을 위한 AI 트렌드 분석 전문가입니다.
+입력 뉴스들을 바탕으로 한국어로 심도 있는 블로그 포스트를 작성해주세요.
+
+작성 가이드라인:
+- 전체 분량: 2500자 - 4000자 (공백 포함)
+- 독자: 한국의 스타트업 창업자, CTO, 개발자, 프로덕트 매니저
+- "뉴닉 스타일 + 스레드(Thread) 감성"
+
+1. **반말 톤**으로 말 걸듯 써줘
+2. **제목은 자극적이고 후킹되게**, 말맛 있게 쓸 것
+   (예: “AI가 책 읽고 공부했는데… 법원은 OK했대?”)
+
+3. 본문 구성은 이 순서로 이모지 포함해서 :
+- :boom: 첫 문단: 요즘 유행하는 사례(혹은 밈)나 공감가는 상황에서 시작
+- :round_pushpin: 중간 요약: 사건 or 이슈가 뭐였는지 맥락 정리
+- :eyes: 실무자 시선: “그럼 이걸 우리는 어떻게 받아들여야 할까?” 꼭 포함
+- :white_check_mark: 마지막 한 줄 요약: 캐주얼하지만 정리되는 문장
+
+4. **친절하지만 가볍게**, “설명해주듯” 말투로
+5. 너무 설명하거나 교과서처럼 쓰지 말고, **카톡하듯** 쓸 것"""
+
+REPORT_INSTRUCTIONS = """AI 시장 전문가. 스타트업과 개발자를 위한 실용적이고 담담한 인사이트 제공.
+AI 시장 관심자를 위한 IT 트렌드 블로그 작성
+
+[타겟 독자]
+- AI 시장에 관심있는 스타트업 대표
+- 실무 개발자
+
+[작성 요구사항]
+분량: 2500-3000자
+톤앤매너: 밝고 현실적인 분위기, 담담한 지식 전달 (과한 강조나 과장 표현 지양)
+
+[구조]
+## 1. 인트로 (후킹) - 300자
+- 기사 기반의 후킹될 수 있는 질문이나 통계로 시작
+- 독자의 현실적 고민과 연결
+
+## 2. 본문 - 핵심 3가지 (각 600-700자)
+각 섹션별로:
+- 소제목: 50자 내외, 설명적이지 않게 (예: "개발 리스크" X → "정리가 안 되면 생기는 일" O)
+- 내용: 실무적 관점의 팁이나 구체적 사례 중심
+- 정보, 통찰, 리스크 등 다양한 관점 포함
+- 짧고 명확한 단락 구성
+
+## 3. 마무리 - 300자
+- 핵심 요약 정리
+- 실무에 적용 가능한 인사이트나 한 줄 메시지
+
+[스타일 가이드]
+- 마크다운 사용 (##, ###, **굵은글씨**)
+- 구체적 수치나 사례 포함
+- 한국 스타트업이나 개발자 상황에 맞는 예시
+- 지나친 미사여구나 감탄사 배제"""
+
+# 뉴스 데이터만 들어가는 user 메시지 (항상 프롬프트의 마지막)
+ITEMS_TEMPLATE = """[뉴스]
+{items}"""
+
+
+class Edition:
+    """같은 후보 기사로 만드는 포스트 한 종류: 프롬프트, 모델, 독자, 수신자, 메일 형식
+
+    수신자는 EMAIL_TO_<NAME> 환경 변수가 있으면 그것을, 없으면 load_recipients() 규칙을 따름.
+    subject/footer는 {now} (datetime)로 format됨.
+    """
+
+    def __init__(self, name: str, audience: str, instructions: str, model: str,
+                 fallback_model: str = '', sender: str = '', recipients: str = '',
+                 subject: str = '', heading: str = '', footer: str = '',
+                 theme: str = 'trend', list_sources: bool = False,
+                 essential: Sequence[str] = ('title', 'source', 'url'),
+                 extra: Sequence[str] = ('summary', 'implications', 'related'),
+                 temperature: float = 0.3, max_tokens: int = 4096):
+        self.name = name
+        self.audience = audience
+        self.instructions = instructions
+        self.model = model
+        self.fallback_model = fallback_model
+        self.sender = sender
+        self.default_recipients = recipients
+        self.subject = subject
+        self.heading = heading
+        self.footer = footer
+        self.theme = theme
+        self.list_sources = list_sources
+        self.essential = essential
+        self.extra = extra
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+    @property
+    def system_prompt(self) -> str:
+        """고정 지시문 (공통 → 에디션 순, 요청 간 동일)"""
+        return f"{SHARED_INSTRUCTIONS}\n\n{self.instructions}"
+
+    def recipients(self) -> List[str]:
+        override = os.getenv(f'EMAIL_TO_{self.name.upper()}')
+        if override:
+            return [address.strip() for address in override.split(',') if address.strip()]
+        return load_recipients(self.default_recipients)
+
+    def build_request(self, items: List[Dict]) -> Dict:
+        """입력 예산 안에서 뉴스를 압축해 넣은 chat 요청 → {request, used, prompt_tokens}"""
+        system = self.system_prompt
+        prompt, packed, prompt_tokens = build_prompt(
+            ITEMS_TEMPLATE, items, self.model, system,
+            essential=self.essential, extra=self.extra)
+        request = dict(
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
+        return {'request': request, 'used': items[:len(packed)], 'prompt_tokens': prompt_tokens}
+
+    def generate(self, items: List[Dict], client, cache: ResponseCache, stream: bool = False,
+                 make_writer: Callable[[], StreamingPostWriter] = StreamingPostWriter,
+                 stage: str = 'generate') -> Dict:
+        """포스트 생성 (실패 시 재시도 → 대체 모델)
+        → {content, html, usage, cached, metrics, model, used, prompt_tokens, request}
+
+        모든 후보가 실패하면 마지막 오류를 다시 발생.
+        """
+        post = self.build_request(items)
+        content, usage, cached, html, metrics, used_model = complete_with_fallback(
+            fallback_candidates(client, self.model, self.fallback_model),
+            cache, stream, make_writer, **post['request'])
+        if not cached:
+            current_metrics().record_usage(stage, used_model, usage)
+        current_metrics().count(stage, items_in=len(post['used']))
+        post.update(content=content, html=html, usage=usage, cached=cached,
+                    metrics=metrics, model=used_model)
+        return post
+
+    def render(self, md: str, body_html: str = '', sources: Sequence[str] = ()) -> str:
+        """메일 HTML (스트리밍 중 이미 렌더링된 본문이 있으면 재사용)
+
+        포스트가 자체 제목(# → <h1>)으로 시작하면 에디션 heading은 넣지 않아 <h1>이 하나만 남음.
+        """
+        with current_metrics().stage('render'):
+            html = body_html or render_markdown(md)
+        heading = self.heading and not html.lstrip().startswith('<h1>')
+        parts = [f'<h1>{self.heading}</h1>\n' if heading else '', html]
+        if self.list_sources and sources:
+            parts.append('<h3>참고 자료</h3><ol>' + ''.join(
+                f'<li><a href="{u}" target="_blank">{u}</a></li>' for u in sources
+            ) + '</ol>')
+        parts.append(self.footer.format(now=datetime.now()))
+        page = render_page(''.join(parts), theme=self.theme)
+        # <style>을 지우는 클라이언트와 Gmail 잘림(약 102KB)에 대비해 CSS 인라인 + 압축 + 용량 제한
+        with current_metrics().stage('optimize'):
+            page, report = optimize_email(page, self.theme)
+        current_metrics().count('optimize', bytes=report['after'])
+        notes = [note for note, on in (('CSS 인라인', report['inlined']),
+                                       ('용량 제한으로 뒷부분 생략', report['truncated'])) if on]
+        print(f"  [{self.name}] 메일 HTML {report['before'] / 1024:.1f}KB → {report['after'] / 1024:.1f}KB"
+              f" ({', '.join(notes) or '<style> 유지'})")
+        return page
+
+    def send(self, md: str, body_html: str = '', sources: Sequence[str] = (),
+             recipients: Optional[List[str]] = None) -> Dict[str, int]:
+        """렌더링 후 BatchMailer로 발송 → {post_id, sent, failed, retried}"""
+        return self.mail(self.render(md, body_html, sources), md, recipients)
+
+    def mail(self, html: str, md: str, recipients: Optional[List[str]] = None) -> Dict[str, int]:
+        """렌더링된 HTML과 마크다운에서 만든 플레인 텍스트를 BatchMailer로 발송 → {post_id, sent, failed, retried}"""
+        recipients = self.recipients() if recipients is None else recipients
+        subject = self.subject.format(now=datetime.now())
+        with BatchMailer() as mailer:
+            return mailer.send(self.sender, subject, html, markdown_to_text(md), recipients)
+
+
+EDITIONS: Dict[str, Edition] = {}
+
+
+def register(edition: Edition) -> Edition:
+    EDITIONS[edition.name] = edition
+    return edition
+
+
+# main.py: 뉴닉 스타일 반말 포스트
+register(Edition(
+    name='trend',
+    audience='스타트업 창업자, CTO, 개발자, PM',
+    instructions=TREND_INSTRUCTIONS,
+    model='gpt-4.1-nano-2025-04-14',
+    fallback_model=os.getenv('OPENAI_FALLBACK_MODEL', 'gpt-3.5-turbo-16k'),
+    sender=os.getenv('EMAIL_FROM', 'ai-trends@yourdomain.com'),
+    recipients='gyu3637@gmail.com',
+    subject='[AI 트렌드] {now:%m/%d} 실무 인사이트',
+    heading='AI 트렌드 인사이트',
+    footer=('\n<div class="footer">'
+            'Generated by AI Trend Analyzer • {now:%Y년 %m월 %d일 %H:%M}'
+            '</div>\n'),
+    theme='trend',
+    list_sources=True,
+    essential=('title', 'source', 'url'),
+    extra=('summary', 'implications', 'related'),
+    temperature=0.3,
+    max_tokens=8192,
+))
+
+# blog.py: 담담한 분석 리포트
+register(Edition(
+    name='report',
+    audience='AI 시장에 관심있는 스타트업 대표, 실무 개발자',
+    instructions=REPORT_INSTRUCTIONS,
+    model='gpt-3.5-turbo-16k',
+    fallback_model=os.getenv('OPENAI_FALLBACK_MODEL', 'gpt-4.1-nano-2025-04-14'),
+    sender=os.getenv('EMAIL_FROM', 'blog@company.com'),
+    recipients='gyu3637@gmail.com',
+    subject='[AI 트렌드 리포트] {now:%Y년 %m월 %d일} - 스타트업이 놓치면 안 되는 오늘의 인사이트',
+    footer=('<div class="footer">\n'
+            '<p>이 메일은 IT 트렌드 자동 분석 시스템에 의해 생성되었습니다.</p>\n'
+            '<p>매일 오전 9시, 최신 IT 트렌드를 여러분의 메일함으로 전달해 드립니다.</p>\n'
+            '</div>\n'),
+    theme='report',
+    essential=('title', 'source'),
+    extra=('summary', 'related'),
+    temperature=0.7,
+    max_tokens=2500,
+))
+
+
+def enabled_editions(names: str = ENABLED_EDITIONS) -> List[Edition]:
+    """ENABLED_EDITIONS(쉼표 구분)에 적힌 에디션, 비어 있으면 등록된 전체"""
+    selected = [name.strip() for name in names.split(',') if name.strip()]
+    unknown = [name for name in selected if name not in EDITIONS]
+    if unknown:
+        raise ValueError(f"알 수 없는 에디션: {', '.join(unknown)} (등록: {', '.join(EDITIONS)})")
+    return [EDITIONS[name] for name in selected] if selected else list(EDITIONS.values())
+
+
+def articles_to_items(articles: List[Dict]) -> List[Dict]:
+    """공통 기사 dict → 에디션 프롬프트 입력 형식"""
+    return [{
+        'title': a['title'],
+        'summary': a.get('summary', ''),
+        'source': a.get('source', ''),
+        'url': a.get('link', ''),
+        'implications': a.get('implications', ''),
+        'related': a.get('related', ''),
+    } for a in articles]
+
+
+def save_post(out_dir: str, name: str, post: Dict):
+    """생성 결과를 <name>.md (본문) 와 <name>.json (본문 + 메타) 으로 저장"""
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, f"{name}.md"), 'w', encoding='utf-8') as f:
+        f.write(post['content'])
+    with open(os.path.join(out_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+        json.dump(post, f, ensure_ascii=False, indent=2, default=json_default)
+
+
+def load_post(out_dir: str, name: str) -> Dict:
+    """save_post로 저장한 결과 (<name>.md를 직접 고쳤으면 그 내용을 사용)"""
+    with open(os.path.join(out_dir, f"{name}.json"), 'r', encoding='utf-8') as f:
+        post = json.load(f)
+    with open(os.path.join(out_dir, f"{name}.md"), 'r', encoding='utf-8') as f:
+        content = f.read()
+    if content != post['content']:
+        post.update(content=content, html='')
+    return post
+
+
+def _publish(edition: Edition, items: List[Dict], client, stages: Sequence[str],
+             out_dir: str) -> Dict:
+    """에디션 하나를 stages(generate/render/send)만큼 진행 (실패해도 다른 에디션에 영향 없도록 결과에 오류 기록)
+
+    generate를 건너뛰면 out_dir에 저장된 결과를 읽어 이어서 진행.
+    """
+    try:
+        if 'generate' in stages:
+            with current_metrics().stage(f'generate:{edition.name}'):
+                post = edition.generate(items, client, ResponseCache(), stage=f'generate:{edition.name}')
+            print(f"  [{edition.name}] {post['model']} · 뉴스 {len(post['used'])}/{len(items)}개, "
+                  f"입력 {post['prompt_tokens']} 토큰{' (캐시)' if post['cached'] else ''}")
+            if out_dir:
+                save_post(out_dir, edition.name, post)
+        else:
+            post = load_post(out_dir, edition.name)
+
+        if 'render' in stages or 'send' in stages:
+            sources = [item['url'] for item in post['used'] if item.get('url')]
+            page = edition.render(post['content'], post['html'], sources)
+            if out_dir:
+                with open(os.path.join(out_dir, f"{edition.name}.html"), 'w', encoding='utf-8') as f:
+                    f.write(page)
+            if 'send' in stages:
+                recipients = edition.recipients()
+                post['delivery'] = delivery = edition.mail(page, post['content'], recipients)
+                post['post_id'] = delivery['post_id']
+                print(f"  [{edition.name}] 발송: 포스트 #{post['post_id']}, 수신자 {len(recipients)}명 중 "
+                      f"성공 {delivery['sent']}명, 실패 {delivery['failed']}명")
+                # 발송한 포스트는 입력/프롬프트/결과/HTML/사용량을 실행 기록에 보관
+                archive_post(current_metrics().pipeline, edition.name, post, page, post['post_id'])
+                if not delivery['sent']:
+                    # 아무에게도 전달되지 않았으면 실패로 보고 이력에도 남기지 않음 (outbox에서 재시도 가능)
+                    post['error'] = f"발송 실패: 포스트 #{post['post_id']} 전달된 수신자 없음"
+                    print(f"  [{edition.name}] {post['error']}")
+        return post
+    except Exception as e:
+        print(f"  [{edition.name}] 실패: {e}")
+        return {'error': str(e), 'used': []}
+
+
+def publish_editions(items: List[Dict], editions: Optional[List[Edition]] = None,
+                     max_parallel: int = EDITION_MAX_PARALLEL,
+                     stages: Sequence[str] = POST_STAGES, out_dir: str = '') -> Dict[str, Dict]:
+    """한 번 수집/선별한 뉴스로 여러 에디션을 동시에 생성/렌더링/발송 → {에디션 이름: 결과}
+
+    수집은 호출 전에 한 번만 하므로 에디션을 늘려도 늘어나는 것은 생성 비용뿐.
+    out_dir이 주어지면 에디션별 <name>.md/.json/.html을 저장해 단계를 나눠 실행할 수 있음.
+    """
+    editions = editions if editions is not None else enabled_editions()
+    # 클라이언트는 스레드 간 공유, openai는 생성 단계가 있을 때만 import
+    client = openai_client() if 'generate' in stages else None
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(editions)))) as executor:
+        futures = {edition.name: executor.submit(_publish, edition, items, client, stages, out_dir)
+                   for edition in editions}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def covered_articles(articles: List[Dict], results: Dict[str, Dict]) -> List[Dict]:
+    """이력에 기록할 기사: 한 명 이상에게 전달된 에디션만 대상으로, 각 에디션은 후보 앞쪽부터
+    사용하므로 가장 많이 쓴 만큼 (+ 같은 주제로 묶였던 기사)
+
+    발송에 모두 실패한 에디션의 기사는 기록하지 않아 다음 실행에서 다시 후보가 됨.
+    """
+    used = max((len(result['used']) for result in results.values()
+                if result.get('delivery', {}).get('sent')), default=0)
+    return with_cluster_members(articles[:used])
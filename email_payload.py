@@ -0,0 +1,231 @@
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from markdown_render import THEME_CSS, _compact_css
+
+# Gmail은 HTML이 약 102KB를 넘으면 뒷부분을 잘라 "메시지 잘림"으로 표시
+EMAIL_MAX_BYTES = int(os.getenv('EMAIL_MAX_BYTES', str(100 * 1024)))
+TRUNCATED_NOTICE = '<p>… 메일 용량 제한으로 이후 내용은 생략되었습니다.</p>'
+
+VOID_TAGS = frozenset(('meta', 'input', 'hr', 'br', 'img', 'link'))
+SHELL_TAGS = frozenset(('html', 'body'))
+DROPPED_PROPERTIES = frozenset(('transition',))   # 메일 클라이언트에서 의미 없는 속성은 인라인하지 않음
+_BLOCK_TAGS = 'html|head|body|meta|style|title|div|p|h[1-6]|ul|ol|li|blockquote|pre|hr|table|tr|td|th'
+
+_RULE = re.compile(r'([^{}]+)\{([^}]*)\}')
+_SIMPLE = re.compile(r'^([a-z][a-z0-9]*)?(?:\.([\w-]+))?(?:\[([\w-]+)="([^"]*)"\])?$')
+_TAG = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)((?:[^>"]|"[^"]*")*)>')
+_ATTR = re.compile(r'([\w-]+)="([^"]*)"')
+_STYLE_ATTR = re.compile(r'\sstyle="[^"]*"')
+_STYLE_BLOCK = re.compile(r'<style>.*?</style>\s*', re.DOTALL)
+_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_PRE = re.compile(r'(<pre\b.*?</pre>)', re.DOTALL)
+_SPACE = re.compile(r'\s+')
+_VALUE_COMMA = re.compile(r',\s+')
+_BLOCK_SPACE = re.compile(rf'\s*(</?(?:{_BLOCK_TAGS})\b[^>]*>)\s*')
+
+# 플레인 텍스트 변환: 코드펜스 줄, 줄 머리 기호(제목/인용), 인라인 문법(코드/굵게/링크)
+_MD_FENCE = re.compile(r'^```[^\n]*\n?', re.MULTILINE)
+_MD_LINE = re.compile(r'^(?:#{1,6} +|> ?)', re.MULTILINE)
+_MD_INLINE = re.compile(r'`([^`]+)`|\*\*(.+?)\*\*|\[([^\]]+)\]\(([^)\s]+)\)')
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+
+def _declarations(body: str) -> List[Tuple[str, str]]:
+    pairs = []
+    for declaration in body.split(';'):
+        name, _, value = declaration.partition(':')
+        name = name.strip().lower()
+        if name and value.strip() and name not in DROPPED_PROPERTIES:
+            pairs.append((name, _VALUE_COMMA.sub(',', ' '.join(value.split()))))
+    return pairs
+
+
+def _matches(simple: tuple, element: tuple) -> bool:
+    tag, cls, attr, value = simple
+    el_tag, el_classes, el_attrs = element
+    return ((not tag or tag == el_tag) and (not cls or cls in el_classes)
+            and (not attr or (attr, value) in el_attrs))
+
+
+class Stylesheet:
+    """테마 CSS를 한 번 파싱해 둔 규칙 목록
+
+    태그 / .class / tag[attr="v"] 와 그 조합의 자손 선택자만 인라인하고,
+    :hover 같은 나머지는 residual로 남겨 <style>을 지원하는 클라이언트용으로 유지.
+    요소(태그, 클래스, 조상)별로 계산한 style 값은 메모해 두어 같은 구조는 한 번만 계산함.
+    """
+
+    def __init__(self, css: str):
+        self.rules: List[Tuple[int, int, List[tuple], List[Tuple[str, str]]]] = []
+        self.attr_names = set()
+        leftover = []
+        for order, (selectors, body) in enumerate(_RULE.findall(css)):
+            declarations = _declarations(body)
+            for selector in selectors.split(','):
+                selector = selector.strip()
+                matches = [_SIMPLE.match(part) for part in selector.split()]
+                if not selector or not all(matches):
+                    leftover.append(f'{selector}{{{body}}}')
+                    continue
+                parts = [m.groups() for m in matches]
+                specificity = sum(bool(tag) + 10 * bool(cls) + 10 * bool(attr)
+                                  for tag, cls, attr, _ in parts)
+                self.attr_names.update(attr for _, _, attr, _ in parts if attr)
+                self.rules.append((specificity, order, parts, declarations))
+        # 적용 순서: 명시도 → 선언 순서 (뒤에 적용된 값이 이김)
+        self.rules.sort(key=lambda rule: (rule[0], rule[1]))
+        self.residual = _compact_css(''.join(leftover))
+        self._memo: Dict[tuple, str] = {}
+
+    def element(self, tag: str, attrs: Dict[str, str]) -> tuple:
+        return (tag, frozenset(attrs.get('class', '').split()),
+                tuple((name, attrs[name]) for name in sorted(self.attr_names) if name in attrs))
+
+    def style_for(self, element: tuple, ancestors: tuple) -> str:
+        key = (element, ancestors)
+        style = self._memo.get(key)
+        if style is None:
+            merged: Dict[str, str] = {}
+            for _, _, parts, declarations in self.rules:
+                if self._match(parts, element, ancestors):
+                    merged.update(declarations)
+            style = self._memo[key] = ';'.join(f'{name}:{value}' for name, value in merged.items())
+        return style
+
+    @staticmethod
+    def _match(parts: List[tuple], element: tuple, ancestors: tuple) -> bool:
+        if not _matches(parts[-1], element):
+            return False
+        # 자손 선택자: 남은 부분을 가까운 조상부터 차례로 맞춤
+        i = len(parts) - 2
+        for ancestor in reversed(ancestors):
+            if i < 0:
+                break
+            if _matches(parts[i], ancestor):
+                i -= 1
+        return i < 0
+
+
+@lru_cache(maxsize=None)
+def stylesheet(theme: str) -> Stylesheet:
+    return Stylesheet(THEME_CSS[theme])
+
+
+def inline_css(page: str, sheet: Stylesheet) -> str:
+    """<style> 규칙을 각 요소의 style 속성으로 옮기고 <style>에는 인라인 불가 규칙만 남김
+
+    요소에 이미 style 속성이 있으면 그 값이 뒤에 붙어 우선함.
+    """
+    page = _STYLE_BLOCK.sub(f'<style>{sheet.residual}</style>' if sheet.residual else '', page, count=1)
+    out: List[str] = []
+    stack: List[Tuple[str, tuple]] = []
+    pos = 0
+    for m in _TAG.finditer(page):
+        out.append(page[pos:m.start()])
+        pos = m.end()
+        closing, tag, attrs = m.group(1), m.group(2).lower(), m.group(3)
+        if closing:
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == tag:
+                    del stack[depth:]
+                    break
+            out.append(m.group(0))
+            continue
+        if tag in ('head', 'style', 'meta', 'title'):
+            out.append(m.group(0))
+            continue
+        parsed = dict(_ATTR.findall(attrs))
+        element = sheet.element(tag, parsed)
+        style = sheet.style_for(element, tuple(e for _, e in stack))
+        if style:
+            if 'style' in parsed:
+                style = f"{style};{parsed['style']}"
+                attrs = _STYLE_ATTR.sub('', attrs)
+            self_closing = attrs.endswith('/')
+            attrs = f'{attrs.rstrip("/").rstrip()} style="{style}"' + ('/' if self_closing else '')
+        out.append(f'<{tag}{attrs}>')
+        if tag not in VOID_TAGS and not attrs.endswith('/'):
+            stack.append((tag, element))
+    out.append(page[pos:])
+    return ''.join(out)
+
+
+def minify_html(page: str) -> str:
+    """주석 제거, 공백 압축, 블록 태그 사이 공백 제거 (<pre> 안은 그대로)"""
+    parts = _PRE.split(_COMMENT.sub('', page))
+    for i in range(0, len(parts), 2):
+        parts[i] = _BLOCK_SPACE.sub(r'\1', _SPACE.sub(' ', parts[i]))
+    return ''.join(parts).strip()
+
+
+def truncate_html(page: str, max_bytes: int) -> Tuple[str, bool]:
+    """max_bytes를 넘으면 본문 블록 경계에서 잘라 안내 문구와 닫는 태그를 붙임 → (HTML, 잘렸는지)"""
+    if len(page.encode('utf-8')) <= max_bytes:
+        return page, False
+    # 잘라도 되는 위치: 열린 태그가 html/body와 body 바로 아래 래퍼 div뿐인 곳
+    cuts: List[Tuple[int, Tuple[str, ...]]] = []
+    stack: List[Tuple[str, bool]] = []
+    for m in _TAG.finditer(page):
+        closing, tag = m.group(1), m.group(2).lower()
+        if closing:
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == tag:
+                    del stack[depth:]
+                    break
+        elif tag not in VOID_TAGS and not m.group(3).endswith('/'):
+            shell = tag in SHELL_TAGS or (tag == 'div' and bool(stack) and stack[-1][0] == 'body')
+            stack.append((tag, shell))
+            continue
+        if stack and all(shell for _, shell in stack) and any(t == 'body' for t, _ in stack):
+            cuts.append((m.end(), tuple(tag for tag, _ in stack)))
+
+    def fits(cut: Tuple[int, Tuple[str, ...]]) -> Tuple[bool, str]:
+        end, open_tags = cut
+        tail = TRUNCATED_NOTICE + ''.join(f'</{tag}>' for tag in reversed(open_tags))
+        html = page[:end] + tail
+        return len(html.encode('utf-8')) <= max_bytes, html
+
+    # 앞부분 길이는 잘린 위치에 따라 단조 증가하므로 이진 탐색
+    lo, hi, best = 0, len(cuts) - 1, None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        ok, html = fits(cuts[mid])
+        if ok:
+            best, lo = html, mid + 1
+        else:
+            hi = mid - 1
+    return (best, True) if best is not None else (page, False)
+
+
+def optimize_email(page: str, theme: str, max_bytes: int = EMAIL_MAX_BYTES) -> Tuple[str, Dict]:
+    """렌더링된 메일 HTML → CSS 인라인 + 압축 + 용량 제한 → (HTML, {before, after, inlined, truncated})
+
+    인라인 스타일은 요소마다 반복되므로 긴 포스트에서는 크기가 늘어남. 인라인한 결과가 예산을
+    넘으면 본문을 자르기보다 <style>만 둔 압축본을 쓰고, 그래도 넘을 때만 블록 경계에서 자름.
+    """
+    before = len(page.encode('utf-8'))
+    html = minify_html(inline_css(page, stylesheet(theme)))
+    inlined = len(html.encode('utf-8')) <= max_bytes
+    if not inlined:
+        html = minify_html(page)
+    html, truncated = truncate_html(html, max_bytes)
+    return html, {'before': before, 'after': len(html.encode('utf-8')),
+                  'inlined': inlined, 'truncated': truncated}
+
+
+def _plain_inline(match) -> str:
+    code, bold, label, url = match.groups()
+    if code is not None:
+        return code
+    if bold is not None:
+        return _MD_INLINE.sub(_plain_inline, bold)
+    return f'{_MD_INLINE.sub(_plain_inline, label)} ({url})'
+
+
+def markdown_to_text(md: str) -> str:
+    """멀티파트 메일의 플레인 텍스트 본문: 마크다운 기호를 걷어내고 링크는 '제목 (URL)'로"""
+    text = _MD_INLINE.sub(_plain_inline, _MD_LINE.sub('', _MD_FENCE.sub('', md)))
+    return _BLANK_LINES.sub('\n\n', text).strip() + '\n'
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+from typing import List, Dict, Optional, Set
+
+from article import Article
+
+# 캐시 설정
+CACHE_DIR = os.getenv('CACHE_DIR', '.cache')
+FEED_CACHE_PATH = os.path.join(CACHE_DIR, 'feeds.json')
+FEED_CACHE_MAX_AGE = 300            # 이 시간(초) 안에 검증된 피드는 요청 없이 재사용
+FEED_CACHE_TTL = 7 * 24 * 3600      # 이 시간(초) 동안 검증되지 않은 피드는 삭제
+FEED_CACHE_MAX_ENTRIES = int(os.getenv('FEED_CACHE_MAX_ENTRIES', '5000'))  # 최대 보관 피드 수 (오래된 순으로 삭제)
+
+
+def _dump_article(article: Dict) -> Dict:
+    """datetime 등 JSON 직렬화가 안 되는 값을 변환"""
+    return (article if isinstance(article, Article) else Article.from_dict(article)).to_dict()
+
+
+def _load_article(data: Dict) -> Article:
+    """저장된 기사 복원 (published ISO 문자열, 이전 형식의 struct_time 리스트 모두 datetime으로)"""
+    return Article.from_dict(data)
+
+
+class FeedCache:
+    """ETag/Last-Modified 기반 조건부 GET용 피드 캐시 (JSON 파일 하나에 저장)"""
+
+    def __init__(self, path: str = FEED_CACHE_PATH,
+                 max_age: float = FEED_CACHE_MAX_AGE,
+                 ttl: float = FEED_CACHE_TTL,
+                 max_entries: int = FEED_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_age = max_age
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {'hit': 0, 'miss': 0, 'not_modified': 0}
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = self._load()
+        self._read: Set[str] = set()    # 이번 실행에서 읽은 URL (304 대기 중일 수 있어 정리 대상에서 제외)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get_fresh(self, url: str) -> Optional[List[Dict]]:
+        """max_age 안에 검증된 피드면 요청 없이 기사 반환 (hit)"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry:
+                self._read.add(url)
+            if not entry or time.time() - entry['validated_at'] > self.max_age:
+                return None
+            self.stats['hit'] += 1
+            return [_load_article(a) for a in entry['articles']]
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since 헤더 생성"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry:
+                self._read.add(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidate(self, url: str) -> Optional[List[Dict]]:
+        """304 응답 처리: 검증 시각 갱신 후 캐시된 기사 반환 (항목이 없으면 None → 호출한 쪽에서 다시 받음)"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if not entry:
+                return None
+            entry['validated_at'] = time.time()
+            self.stats['not_modified'] += 1
+            return [_load_article(a) for a in entry['articles']]
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+              articles: List[Dict]):
+        """새로 받은 피드 저장 (miss)"""
+        with self._lock:
+            self._entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'validated_at': time.time(),
+                'articles': [_dump_article(a) for a in articles],
+            }
+            self.stats['miss'] += 1
+
+    def _evict(self):
+        """TTL이 지난 항목 삭제 후 max_entries 초과분을 오래된 순으로 삭제
+
+        이번 실행에서 읽은 항목은 남김 (검증자를 보낸 요청의 304가 아직 도착하지 않았을 수 있음).
+        """
+        now = time.time()
+        self._entries = {
+            url: e for url, e in self._entries.items()
+            if url in self._read or now - e['validated_at'] <= self.ttl
+        }
+        if len(self._entries) > self.max_entries:
+            newest = sorted(self._entries.items(),
+                            key=lambda item: (item[0] in self._read, item[1]['validated_at']),
+                            reverse=True)[:max(self.max_entries, len(self._read))]
+            self._entries = dict(newest)
+
+    def save(self):
+        """정리 후 디스크에 저장 (임시 파일 → 교체)"""
+        with self._lock:
+            self._evict()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def summary(self) -> str:
+        return (f"hit {self.stats['hit']} / miss {self.stats['miss']} / "
+                f"304 {self.stats['not_modified']}")
@@ -0,0 +1,210 @@
+import multiprocessing
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+import resilience
+from article import Article
+from feed_cache import FeedCache
+from feed_stream import StreamingFeedParser, parse_feed_bytes
+from metrics import current as current_metrics
+
+# 피드 목록 파일 (한 줄에 URL 하나, 줄 맨 앞이나 공백 뒤의 # 부터는 주석)
+FEEDS_PATH = os.getenv('FEEDS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feeds.txt'))
+
+# 동시 수집 설정 (피드가 수천 개면 환경 변수로 늘림)
+FEED_MAX_WORKERS = int(os.getenv('FEED_MAX_WORKERS', '8'))     # 동시에 요청할 피드 수
+FEED_TIMEOUT = 10             # 피드 하나당 타임아웃 (초)
+FEED_ATTEMPTS = 2             # 피드 하나당 최대 시도 횟수
+FEED_DEADLINE = float(os.getenv('FEED_DEADLINE', '20'))        # 전체 수집 마감 시간 (초)
+FEED_ENTRY_LIMIT = 5          # 피드당 최신 기사 수
+FEED_CHUNK_SIZE = 16 * 1024   # 스트리밍 파싱 시 한 번에 읽을 바이트 수
+# 0보다 크면 파싱을 이 수만큼의 프로세스에서 실행 (GIL 없이 CPU 사용, 본문은 FEED_MAX_BYTES까지만 받음)
+FEED_PARSE_PROCESSES = int(os.getenv('FEED_PARSE_PROCESSES', '0'))
+FEED_MAX_BYTES = 2 * 1024 * 1024
+USER_AGENT = 'Mozilla/5.0 (compatible; ITTrendBot/1.0)'
+_COMMENT = re.compile(r'(?:^|\s)#')
+
+
+def load_feed_list(path: str = FEEDS_PATH) -> List[str]:
+    """피드 목록 파일을 읽어 URL 리스트로 (빈 줄/주석/중복 제외, 순서 유지)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            # URL 안의 # (https://x/feed#atom)은 주석이 아님
+            lines = [_COMMENT.split(line, 1)[0].strip() for line in f]
+    except OSError as e:
+        print(f"피드 목록을 읽지 못했습니다 ({path}): {e}")
+        return []
+    return list(dict.fromkeys(line for line in lines if line))
+
+
+def _entries_to_articles(feed, limit: int) -> List[Article]:
+    """feedparser 결과를 Article 리스트로 변환"""
+    source = feed.feed.get('title', '')
+    return [Article(title=entry.title, link=entry.link, summary=entry.get('summary', ''),
+                    published=entry.get('published_parsed'), source=source)
+            for entry in feed.entries[:limit]]
+
+
+def _parse_with_feedparser(content: bytes, limit: int) -> List[Article]:
+    # feedparser는 스트리밍 파싱이 실패했을 때만 필요하므로 처음 쓸 때 import
+    import feedparser
+    return _entries_to_articles(feedparser.parse(content), limit)
+
+
+def _parse_streaming(resp, limit: int, since: Optional[datetime]) -> Optional[List[Article]]:
+    """응답을 청크 단위로 읽으며 파싱, 필요한 만큼 모이면 소켓 읽기를 중단
+
+    엄격한 XML 파싱에 실패하면 None (호출 측에서 feedparser로 재시도).
+    """
+    parser = StreamingFeedParser(limit, since)
+    try:
+        for chunk in resp.iter_content(FEED_CHUNK_SIZE):
+            current_metrics().count('fetch', bytes=len(chunk))
+            if parser.feed(chunk):
+                break
+    except ET.ParseError:
+        return None
+    for article in parser.articles:
+        article['source'] = article['source'] or parser.source
+    return parser.articles
+
+
+def _parse_in_pool(resp, limit: int, since: Optional[datetime], pool: Executor) -> List[Article]:
+    """본문을 FEED_MAX_BYTES까지 받아 프로세스 풀에서 파싱 (XML 오류 시 feedparser도 워커에서)"""
+    body = b''
+    for chunk in resp.iter_content(FEED_CHUNK_SIZE):
+        body += chunk
+        if len(body) >= FEED_MAX_BYTES:
+            break
+    current_metrics().count('fetch', bytes=len(body))
+    _, rows = pool.submit(parse_feed_bytes, body[:FEED_MAX_BYTES], limit, since).result()
+    return [Article(title, link, summary, published, source)
+            for title, link, summary, published, source in rows]
+
+
+def fetch_feed(url: str, limit: int = FEED_ENTRY_LIMIT,
+               timeout: float = FEED_TIMEOUT,
+               cache: Optional[FeedCache] = None,
+               stream: bool = False,
+               since: Optional[datetime] = None,
+               parse_pool: Optional[Executor] = None) -> Tuple[List[Article], float]:
+    """피드 하나를 타임아웃을 걸고 다운로드/파싱 → (기사 리스트, 소요 시간)
+
+    cache가 주어지면 조건부 GET을 보내고, 304 응답이면 파싱 없이 캐시를 사용.
+    stream=True면 최신 limit개(또는 since보다 오래된 항목)까지만 읽고 중단.
+    parse_pool이 주어지면 다운로드는 이 스레드에서, 파싱은 풀(프로세스)에서 함.
+    """
+    started = time.perf_counter()
+    headers = {'User-Agent': USER_AGENT}
+    if cache is not None:
+        cached = cache.get_fresh(url)
+        if cached is not None:
+            return cached[:limit], time.perf_counter() - started
+        headers.update(cache.conditional_headers(url))
+
+    def open_feed():
+        resp = requests.get(url, headers=headers, timeout=timeout, stream=True)
+        if resp.status_code >= 400:
+            resp.close()
+            resp.raise_for_status()
+        return resp
+
+    articles = None
+    # 일시적 오류는 한 번 재시도, 계속 실패하는 호스트는 브레이커로 차단
+    endpoint = f"feed:{urlparse(url).netloc}"
+    resp = resilience.call(endpoint, open_feed, attempts=FEED_ATTEMPTS)
+    if resp.status_code == 304 and cache is not None:
+        cached = cache.revalidate(url)
+        resp.close()
+        if cached is not None:
+            return cached[:limit], time.perf_counter() - started
+        # 검증자를 보낸 뒤 캐시 항목이 정리되어 304에 쓸 본문이 없음 → 조건 없이 다시 받음
+        headers.pop('If-None-Match', None)
+        headers.pop('If-Modified-Since', None)
+        resp = resilience.call(endpoint, open_feed, attempts=FEED_ATTEMPTS)
+    with resp:
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        if parse_pool is not None:
+            articles = _parse_in_pool(resp, limit, since, parse_pool)
+        elif stream:
+            articles = _parse_streaming(resp, limit, since)
+        else:
+            current_metrics().count('fetch', bytes=len(resp.content))
+            articles = _parse_with_feedparser(resp.content, limit)
+
+    if articles is None:
+        # XML이 깨진 피드는 관대한 feedparser로 전체를 다시 받아 처리
+        resp = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=timeout)
+        resp.raise_for_status()
+        current_metrics().count('fetch', bytes=len(resp.content), retries=1)
+        articles = _parse_with_feedparser(resp.content, limit)
+
+    if cache is not None:
+        cache.store(url, etag, last_modified, articles)
+    current_metrics().count('fetch', items_out=len(articles))
+    return articles, time.perf_counter() - started
+
+
+def fetch_feeds_concurrently(urls: List[str],
+                             limit: int = FEED_ENTRY_LIMIT,
+                             max_workers: int = FEED_MAX_WORKERS,
+                             timeout: float = FEED_TIMEOUT,
+                             deadline: float = FEED_DEADLINE,
+                             cache: Optional[FeedCache] = None,
+                             stream: bool = False,
+                             since: Optional[datetime] = None,
+                             parse_processes: int = FEED_PARSE_PROCESSES) -> List[Article]:
+    """여러 피드를 스레드 풀로 동시에 수집
+
+    마감 시간 안에 끝난 피드의 기사만 돌려주고(부분 결과), 늦은 피드는 건너뜀.
+    결과 순서는 urls 순서를 그대로 유지. parse_processes > 0이면 파싱은 프로세스 풀에서 함.
+    """
+    if not urls:
+        return []
+
+    started = time.perf_counter()
+    # 수집 스레드가 이미 떠 있는 프로세스를 fork하지 않도록 spawn 사용
+    parse_pool = (ProcessPoolExecutor(max_workers=parse_processes,
+                                      mp_context=multiprocessing.get_context('spawn'))
+                  if parse_processes > 0 else None)
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+    futures = {executor.submit(fetch_feed, url, limit, timeout,
+                               cache, stream, since, parse_pool): url for url in urls}
+    done, not_done = wait(futures, timeout=deadline)
+
+    results: Dict[str, List[Article]] = {}
+    for future in done:
+        url = futures[future]
+        try:
+            articles, elapsed = future.result()
+            results[url] = articles
+            print(f"  [{elapsed:5.2f}s] {url} → {len(articles)}개")
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+
+    for future in not_done:
+        print(f"  [timeout] {futures[future]} (마감 {deadline}s 초과, 건너뜀)")
+    # 늦은 피드는 기다리지 않음
+    executor.shutdown(wait=False, cancel_futures=True)
+    if parse_pool is not None:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+
+    if cache is not None:
+        cache.save()
+        print(f"피드 캐시: {cache.summary()}")
+    print(f"RSS 수집 완료: {len(results)}/{len(urls)}개 피드, "
+          f"{time.perf_counter() - started:.2f}s")
+
+    all_articles = []
+    for url in urls:
+        all_articles.extend(results.get(url, []))
+    return all_articles
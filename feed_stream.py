@@ -0,0 +1,128 @@
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_tz, mktime_tz
+from typing import List, Dict, Optional, Tuple
+
+from article import Article
+
+# 항목으로 취급할 태그 (RSS 2.0 / RSS 1.0: item, Atom: entry)
+ITEM_TAGS = {'item', 'entry'}
+# 피드 제목이 들어 있는 부모 태그
+FEED_TAGS = {'channel', 'feed'}
+# 발행일 태그 (우선순위 순)
+DATE_TAGS = ('pubDate', 'published', 'date', 'updated')
+
+
+def _local(tag: str) -> str:
+    """'{namespace}name' → 'name'"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_date(value: str) -> Optional[time.struct_time]:
+    """RFC 822(RSS) / ISO 8601(Atom) 날짜 → UTC struct_time (feedparser와 동일한 형식)"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    parsed = parsedate_tz(value)
+    if parsed:
+        return time.gmtime(mktime_tz(parsed))
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.utctimetuple()
+
+
+class StreamingFeedParser:
+    """청크 단위로 피드를 파싱하다가 N개(또는 기준일보다 오래된 항목)에서 멈추는 파서
+
+    feed()에 바이트 청크를 넣고, True가 반환되면 더 읽을 필요가 없음.
+    XML 문법 오류가 있으면 xml.etree.ElementTree.ParseError를 그대로 던짐.
+    """
+
+    def __init__(self, limit: int, since: Optional[datetime] = None):
+        self.limit = limit
+        self.since = since
+        self.source = ''
+        self.articles: List[Dict] = []
+        self.done = False
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._path: List[str] = []
+
+    def feed(self, chunk: bytes) -> bool:
+        if self.done:
+            return True
+        self._parser.feed(chunk)
+        for event, elem in self._parser.read_events():
+            name = _local(elem.tag)
+            if event == 'start':
+                self._path.append(name)
+                continue
+            self._path.pop()
+            if name == 'title' and not self.source and self._path and self._path[-1] in FEED_TAGS:
+                self.source = (elem.text or '').strip()
+            elif name in ITEM_TAGS:
+                self._add_item(elem)
+                elem.clear()  # 처리한 항목은 바로 해제
+                if self.done:
+                    break
+        return self.done
+
+    def _add_item(self, elem):
+        fields = {}
+        link = ''
+        for child in elem:
+            name = _local(child.tag)
+            if name == 'link':
+                # Atom은 href 속성, RSS는 텍스트
+                rel = child.get('rel', 'alternate')
+                if not link and rel == 'alternate':
+                    link = child.get('href') or (child.text or '').strip()
+            elif name not in fields:
+                fields[name] = child.text or ''
+
+        published = None
+        for tag in DATE_TAGS:
+            if tag in fields:
+                published = _parse_date(fields[tag])
+                break
+
+        # 최신순 피드이므로 기준일보다 오래된 항목이 나오면 중단
+        if self.since and published and datetime(*published[:6]) <= self.since:
+            self.done = True
+            return
+
+        self.articles.append(Article(
+            title=fields.get('title', '').strip(),
+            link=link,
+            summary=fields.get('description') or fields.get('summary') or fields.get('content', ''),
+            published=published,
+            source=self.source,
+        ))
+        if len(self.articles) >= self.limit:
+            self.done = True
+
+
+def parse_feed_bytes(content: bytes, limit: int,
+                     since: Optional[datetime] = None) -> Tuple[str, List[tuple]]:
+    """받아 둔 피드 본문 전체를 파싱 → (피드 제목, [(title, link, summary, published, source)])
+
+    프로세스 풀 워커에서 호출되므로 결과는 가벼운 튜플로 돌려주고, Article(출처 intern)은
+    부모 프로세스에서 만듦. 엄격한 XML 파싱이 실패하면 같은 본문을 feedparser로 다시 파싱.
+    """
+    parser = StreamingFeedParser(limit, since)
+    try:
+        parser.feed(content)
+        articles, source = parser.articles, parser.source
+    except ET.ParseError:
+        import feedparser
+        feed = feedparser.parse(content)
+        source = feed.feed.get('title', '')
+        articles = [Article(title=entry.get('title', ''), link=entry.get('link', ''),
+                            summary=entry.get('summary', ''),
+                            published=entry.get('published_parsed'), source=source)
+                    for entry in feed.entries[:limit]]
+    return source, [(a.title, a.link, a.summary, a.published, a.source or source) for a in articles]
@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import time
+from typing import List, Dict, Optional
+
+from dedup import (canonicalize_url, simhash, band_keys, hamming_distance,
+                   SIMHASH_BANDS, SIMHASH_MAX_DISTANCE)
+
+# 이미 다룬 기사 이력 설정
+HISTORY_DB_PATH = os.getenv('HISTORY_DB_PATH', os.path.join('data', 'history.db'))
+HISTORY_RETENTION_DAYS = int(os.getenv('HISTORY_RETENTION_DAYS', '90'))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS covered (
+    id INTEGER PRIMARY KEY,
+    url TEXT,
+    title TEXT,
+    fingerprint INTEGER,
+    covered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_covered_url ON covered(url);
+CREATE INDEX IF NOT EXISTS idx_covered_at ON covered(covered_at);
+CREATE TABLE IF NOT EXISTS covered_band (
+    band INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    covered_id INTEGER NOT NULL REFERENCES covered(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_covered_band ON covered_band(band, value);
+CREATE INDEX IF NOT EXISTS idx_covered_band_id ON covered_band(covered_id);
+"""
+
+
+def _to_signed(value: int) -> int:
+    """SQLite INTEGER(부호 있는 64비트)에 맞게 변환"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _article_url(article: Dict) -> str:
+    # RSS/HN 기사는 link, Perplexity 결과는 url
+    return canonicalize_url(article.get('link') or article.get('url') or '')
+
+
+def _article_fingerprint(article: Dict) -> Optional[int]:
+    title = article.get('title', '')
+    return simhash(title) if title.strip() else None
+
+
+class CoveredStore:
+    """이전 포스트에서 이미 다룬 기사(URL, 제목 SimHash)를 기록하는 SQLite 저장소"""
+
+    def __init__(self, path: str = HISTORY_DB_PATH,
+                 retention_days: int = HISTORY_RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 연결을 만든 스레드에서만 사용 (통합 파이프라인의 수집 스레드는 이력을 건드리지 않음)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(_SCHEMA)
+
+    def is_covered(self, article: Dict) -> bool:
+        """URL이 같거나 제목 SimHash가 가까운 기사를 이미 다뤘는지 확인"""
+        url = _article_url(article)
+        if url and self.conn.execute(
+                'SELECT 1 FROM covered WHERE url = ? LIMIT 1', (url,)).fetchone():
+            return True
+
+        fingerprint = _article_fingerprint(article)
+        if fingerprint is None:
+            return False
+        # 같은 밴드 값을 가진 후보만 인덱스로 조회한 뒤 해밍 거리 비교
+        clauses = ' OR '.join(['(b.band = ? AND b.value = ?)'] * SIMHASH_BANDS)
+        params = [v for key in band_keys(fingerprint) for v in key]
+        rows = self.conn.execute(
+            f'SELECT DISTINCT c.fingerprint FROM covered_band b '
+            f'JOIN covered c ON c.id = b.covered_id WHERE {clauses}', params)
+        return any(
+            hamming_distance(fingerprint, _to_unsigned(row[0])) <= SIMHASH_MAX_DISTANCE
+            for row in rows
+        )
+
+    def filter_new(self, articles: List[Dict]) -> List[Dict]:
+        """이미 다룬 기사를 제외"""
+        started = time.perf_counter()
+        new_articles = [a for a in articles if not self.is_covered(a)]
+        print(f"이전 포스트와 중복 제외: {len(articles)}개 → {len(new_articles)}개 "
+              f"({(time.perf_counter() - started) * 1000:.1f}ms)")
+        return new_articles
+
+    def mark_covered(self, articles: List[Dict]):
+        """포스트에 사용한 기사 기록"""
+        now = time.time()
+        with self.conn:
+            for article in articles:
+                fingerprint = _article_fingerprint(article)
+                cur = self.conn.execute(
+                    'INSERT INTO covered (url, title, fingerprint, covered_at) VALUES (?, ?, ?, ?)',
+                    (_article_url(article) or None, article.get('title', ''),
+                     _to_signed(fingerprint) if fingerprint is not None else None, now))
+                if fingerprint is not None:
+                    self.conn.executemany(
+                        'INSERT INTO covered_band (band, value, covered_id) VALUES (?, ?, ?)',
+                        [(band, value, cur.lastrowid) for band, value in band_keys(fingerprint)])
+        self.prune()
+
+    def prune(self):
+        """보관 기간이 지난 이력 삭제"""
+        cutoff = time.time() - self.retention_days * 86400
+        with self.conn:
+            self.conn.execute('DELETE FROM covered WHERE covered_at < ?', (cutoff,))
+
+    def close(self):
+        self.conn.close()
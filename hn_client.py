@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import resilience
+from feed_cache import CACHE_DIR
+from metrics import current as current_metrics
+
+# Hacker News API 설정
+HN_API_BASE = 'https://hacker-news.firebaseio.com/v0'
+HN_TOP_N = 10                     # 가져올 상위 스토리 수
+HN_MAX_WORKERS = 16               # 동시 요청 수 (= 커넥션 풀 크기)
+HN_TIMEOUT = 5                    # 요청당 타임아웃 (초)
+HN_ITEM_CACHE_PATH = os.path.join(CACHE_DIR, 'hn_items.json')
+HN_ITEM_CACHE_TTL = 15 * 60       # 아이템 캐시 유효 시간 (초)
+
+
+class HackerNewsClient:
+    """keep-alive 세션 + 스레드 풀로 HN 아이템을 동시에 가져오는 클라이언트"""
+
+    def __init__(self, max_workers: int = HN_MAX_WORKERS,
+                 timeout: float = HN_TIMEOUT,
+                 cache_path: Optional[str] = HN_ITEM_CACHE_PATH,
+                 cache_ttl: float = HN_ITEM_CACHE_TTL):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.stats = {'hit': 0, 'miss': 0}
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict] = self._load_cache()
+
+        # 워커 수만큼 커넥션을 재사용하도록 풀 크기 지정
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        now = time.time()
+        with self._lock:
+            # 만료된 아이템은 저장하지 않음
+            self._cache = {
+                item_id: e for item_id, e in self._cache.items()
+                if now - e['fetched_at'] <= self.cache_ttl
+            }
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f)
+            os.replace(tmp_path, self.cache_path)
+
+    def _get_json(self, path: str):
+        """재시도/브레이커를 거쳐 GET, 느린 응답은 hedge 요청으로 꼬리 지연을 줄임"""
+        def get():
+            resp = self.session.get(f"{HN_API_BASE}/{path}", timeout=self.timeout)
+            resp.raise_for_status()
+            current_metrics().count('fetch', bytes=len(resp.content))
+            return resp.json()
+        return resilience.call('hn', get, hedge=True)
+
+    def top_story_ids(self, top_n: int = HN_TOP_N) -> List[int]:
+        """topstories.json에서 상위 N개 ID"""
+        return self._get_json('topstories.json')[:top_n]
+
+    def get_item(self, item_id: int) -> Optional[Dict]:
+        """아이템 하나 조회 (TTL 안이면 디스크 캐시 사용)"""
+        key = str(item_id)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and time.time() - entry['fetched_at'] <= self.cache_ttl:
+                self.stats['hit'] += 1
+                return entry['item']
+
+        item = self._get_json(f'item/{item_id}.json')
+        with self._lock:
+            self._cache[key] = {'fetched_at': time.time(), 'item': item}
+            self.stats['miss'] += 1
+        return item
+
+    def get_items(self, item_ids: List[int]) -> List[Dict]:
+        """여러 아이템을 동시에 조회 (실패한 아이템은 건너뛰고 순서 유지)"""
+        def safe_get(item_id):
+            try:
+                return self.get_item(item_id)
+            except Exception as e:
+                print(f"Error fetching HN item {item_id}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            items = list(executor.map(safe_get, item_ids))
+        self._save_cache()
+        return [item for item in items if item]
+
+    def top_stories(self, top_n: int = HN_TOP_N) -> List[Dict]:
+        """상위 N개 스토리 아이템 (순위 순)"""
+        started = time.perf_counter()
+        items = self.get_items(self.top_story_ids(top_n))
+        print(f"HN 수집 완료: {len(items)}개, {time.perf_counter() - started:.2f}s "
+              f"(캐시 hit {self.stats['hit']} / miss {self.stats['miss']})")
+        return [item for item in items if item.get('type') == 'story']
@@ -0,0 +1,152 @@
+import os
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from article_extractor import ArticleExtractor
+from article_store import ArticleStore
+from blog import ITTrendAnalyzer, run_daily_analysis
+from ranking import rank_articles
+
+# 소스별 수집 주기 (초) - Perplexity는 호출 비용이 있어 드물게
+INGEST_INTERVALS = {
+    'rss': 15 * 60,
+    'hn': 10 * 60,
+    'perplexity': 4 * 3600,
+}
+SEND_AT = os.getenv('SEND_AT', '09:00')     # 매일 포스트를 생성/발송할 시각
+PREWARM_TOP_K = 10                          # 수집 때마다 본문을 미리 받아 둘 상위 기사 수
+ERROR_BACKOFF = 60                          # 작업이 예외로 끝나면 다음 작업 전 대기 (초)
+
+
+def _perplexity_articles() -> List[Dict]:
+    from main import AITrendAnalyzer
+    from pipeline import _perplexity_to_articles
+    analyzer = AITrendAnalyzer()
+    try:
+        return _perplexity_to_articles(analyzer.search_news_with_perplexity())
+    finally:
+        analyzer.history.close()
+
+
+class IngestDaemon:
+    """하루 동안 RSS/HN/Perplexity를 조금씩 수집해 ArticleStore에 쌓고, SEND_AT에는 생성/발송만 수행
+
+    다음 이벤트 시각까지 잠들었다가 깨어나며(폴링 없음), SIGTERM/SIGINT를 받으면
+    진행 중인 작업을 마친 뒤 종료. 마지막 수집/발송 시각은 저장소 state에 남아
+    재시작해도 이어서 동작함.
+    """
+
+    def __init__(self, store: ArticleStore = None,
+                 intervals: Dict[str, float] = None,
+                 send_at: str = SEND_AT):
+        self.store = store or ArticleStore()
+        self.intervals = intervals or INGEST_INTERVALS
+        self.send_at = send_at
+        self.feeds = ITTrendAnalyzer()
+        self.sources: Dict[str, Callable[[], List[Dict]]] = {
+            'rss': self.feeds.fetch_rss_feeds,
+            'hn': self.feeds.fetch_hacker_news,
+            'perplexity': _perplexity_articles,
+        }
+        self._stop = threading.Event()
+
+    # -----------------------------
+    # 일정
+    # -----------------------------
+    def _send_time(self, day: datetime) -> datetime:
+        hour, minute = map(int, self.send_at.split(':'))
+        return day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    def next_send(self, now: datetime) -> datetime:
+        """다음 발송 시각 (오늘 발송 시각을 놓쳤고 아직 안 보냈으면 지금)"""
+        today = self._send_time(now)
+        last_send = self.store.get_state('last_send')
+        if last_send and datetime.fromisoformat(last_send) >= today:
+            return today + timedelta(days=1)
+        if now >= today:
+            # 처음 시작했다면 내일부터, 재시작으로 놓친 발송이면 바로 실행
+            return now if last_send else today + timedelta(days=1)
+        return today
+
+    def next_events(self) -> List[Tuple[float, str]]:
+        """(실행 시각 timestamp, 이벤트 이름) 목록"""
+        now = time.time()
+        events = []
+        for name, interval in self.intervals.items():
+            last_run = float(self.store.get_state(f'last_run:{name}', '0'))
+            events.append((max(now, last_run + interval), name))
+        events.append((self.next_send(datetime.now()).timestamp(), 'send'))
+        return sorted(events)
+
+    # -----------------------------
+    # 이벤트
+    # -----------------------------
+    def ingest(self, name: str):
+        started = time.perf_counter()
+        # 실패해도 수집 시각은 남겨 다음 주기까지 같은 소스를 다시 부르지 않음
+        self.store.set_state(f'last_run:{name}', str(time.time()))
+        try:
+            articles = self.sources[name]()
+        except Exception as e:
+            print(f"[{name}] 수집 실패: {e}")
+            articles = []
+        added, merged = self.store.add_articles(articles)
+        print(f"[{name}] {len(articles)}개 수집 → 새 기사 {added}개, 병합 {merged}개 "
+              f"(보관 {len(self.store.index.articles)}개, {time.perf_counter() - started:.2f}s)")
+        if added:
+            self.prewarm()
+
+    def prewarm(self):
+        """현재 상위 기사의 본문을 미리 추출해 두어 발송 때는 캐시만 읽게 함"""
+        top = rank_articles(self.store.articles(), k=PREWARM_TOP_K, max_age_hours=24)
+        if top:
+            ArticleExtractor().enrich(top)
+
+    def send(self):
+        try:
+            run_daily_analysis(store=self.store)
+        finally:
+            self.store.set_state('last_send', datetime.now().isoformat(timespec='seconds'))
+        self.store.prune()
+
+    # -----------------------------
+    # 실행 루프
+    # -----------------------------
+    def stop(self, *args):
+        if not self._stop.is_set():
+            print("종료 요청 - 진행 중인 작업을 마친 뒤 종료합니다.")
+        self._stop.set()
+
+    def run(self):
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+        print(f"수집 데몬 시작 (발송 {self.send_at}, 보관 기사 {len(self.store.index.articles)}개)")
+        try:
+            while not self._stop.is_set():
+                when, name = self.next_events()[0]
+                delay = when - time.time()
+                if delay > 0:
+                    print(f"다음 작업: {name} @ {datetime.fromtimestamp(when):%H:%M:%S} ({delay:.0f}s 대기)")
+                    # 다음 이벤트까지 잠들되 종료 요청이 오면 바로 깨어남
+                    if self._stop.wait(delay):
+                        break
+                try:
+                    if name == 'send':
+                        self.send()
+                    else:
+                        self.ingest(name)
+                except Exception as e:
+                    # 한 작업의 실패로 데몬이 멈추지 않게 기록만 하고 잠시 쉰 뒤 계속
+                    print(f"[{name}] 작업 실패: {type(e).__name__}: {e} ({ERROR_BACKOFF}s 후 계속)")
+                    self._stop.wait(ERROR_BACKOFF)
+        finally:
+            self.store.close()
+            print("수집 데몬 종료")
+
+
+if __name__ == "__main__":
+    IngestDaemon().run()
@@ -0,0 +1,105 @@
+import json
+from typing import Dict, List, Sequence
+
+
+class JSONArrayStreamParser:
+    """조각 단위로 들어오는 JSON 배열에서 객체가 닫히는 즉시 꺼내는 파서
+
+    feed()에 텍스트 조각을 넣으면 이번 조각에서 완성된 객체 목록을 돌려줌.
+    배열 앞의 코드펜스/설명 문장은 무시하고, 깨진 객체(JSON 오류, 필수 필드 누락)나
+    배열이 닫히기 전에 끊긴 마지막 객체는 예외 없이 건너뛰고 skipped로만 셈.
+    바로 뒤(공백 제외)에 {가 오는 [만 배열 시작으로 보므로 설명 문장의 "[as of today]"는
+    무시하고, 배열 안에서는 괄호 깊이를 세어 객체 사이의 "[1]" 같은 인용 번호는 건너뜀.
+    배열을 닫는 괄호(])를 만나면 done이 되고 이후 내용은 읽지 않음.
+    """
+
+    def __init__(self, required: Sequence[str] = ()):
+        self.required = tuple(required)
+        self.items: List[Dict] = []
+        self.skipped = 0
+        self.done = False
+        self._buffer: List[str] = []     # 현재 읽는 객체의 텍스트
+        self._depth = 0                  # 현재 객체 안의 {} 깊이 (0이면 객체 밖)
+        self._in_string = False
+        self._escape = False
+        self._brackets = 0               # 객체 밖의 [] 깊이 (0이면 아직 배열 시작 전)
+        self._pending = False            # 배열 시작일 수 있는 [ 를 보고 다음 글자를 기다리는 중
+
+    def feed(self, text: str) -> List[Dict]:
+        completed = []
+        if self.done:
+            return completed
+        start = 0 if self._depth else None
+        for i, char in enumerate(text):
+            if self._depth == 0:
+                # 객체 밖: 배열 괄호와 객체 시작만 봄 (쉼표/공백/코드펜스/설명은 무시)
+                if self._pending:
+                    if char.isspace():
+                        continue
+                    self._pending = False
+                    if char == '{':
+                        self._brackets = 1
+                if char == '{':
+                    self._depth, start = 1, i
+                elif char == '[':
+                    if self._brackets:
+                        self._brackets += 1
+                    else:
+                        self._pending = True
+                elif char == ']' and self._brackets:
+                    self._brackets -= 1
+                    if self._brackets == 0:
+                        self.done = True
+                        break
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(text[start:i + 1])
+                    item = self._decode(''.join(self._buffer))
+                    self._buffer = []
+                    start = None
+                    if item is not None:
+                        completed.append(item)
+        if self._depth and start is not None:
+            self._buffer.append(text[start:])
+        self.items.extend(completed)
+        return completed
+
+    def _decode(self, raw: str):
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            self.skipped += 1
+            return None
+        if not isinstance(item, dict) or any(not item.get(key) for key in self.required):
+            self.skipped += 1
+            return None
+        return item
+
+    def close(self) -> List[Dict]:
+        """입력 끝 - 닫히지 않은 객체는 버리고 지금까지 꺼낸 전체 객체 반환"""
+        if self._depth:
+            self.skipped += 1
+            self._buffer, self._depth = [], 0
+            self._in_string = self._escape = False
+        self.done = True
+        return self.items
+
+
+def parse_json_objects(text: str, required: Sequence[str] = ()) -> List[Dict]:
+    """응답 전체 텍스트에서 JSON 배열의 객체들을 관대하게 파싱 (깨진 객체는 건너뜀)"""
+    parser = JSONArrayStreamParser(required)
+    parser.feed(text)
+    return parser.close()
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from feed_cache import CACHE_DIR
+
+# LLM 응답 캐시 설정
+LLM_CACHE_DIR = os.path.join(CACHE_DIR, 'llm')
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024      # 캐시 전체 최대 크기
+LLM_CACHE_BYPASS = os.getenv('LLM_CACHE_BYPASS', '').lower() in ('1', 'true', 'yes')
+
+
+class ResponseCache:
+    """모델/파라미터/프롬프트 해시를 키로 하는 LLM 응답 디스크 캐시 (LRU 삭제)"""
+
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 bypass: bool = LLM_CACHE_BYPASS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def make_key(**request) -> str:
+        """요청 전체(model, messages, temperature 등)의 SHA-256"""
+        raw = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        # bypass면 읽기만 건너뛰고, 새 응답은 그대로 저장해 캐시를 갱신
+        if self.bypass:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # LRU: 사용 시각 갱신
+        except (OSError, ValueError):
+            # 다른 프로세스의 정리로 읽는 사이 파일이 사라진 경우도 miss
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return value
+
+    def put(self, key: str, value: Dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        """전체 크기가 max_bytes를 넘으면 가장 오래 쓰이지 않은 항목부터 삭제"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                try:
+                    st = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:     # 동시에 정리 중인 다른 프로세스가 먼저 삭제
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+            total -= size
+
+    def hit_rate(self) -> Dict:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {**self.stats, 'hit_rate': self.stats['hits'] / lookups if lookups else 0.0}
+
+
+def usage_to_dict(usage) -> Dict:
+    """SDK usage 객체 → dict (cached_tokens: 제공자 측 프롬프트 캐시에서 읽은 입력 토큰)"""
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return {
+        'prompt_tokens': usage.prompt_tokens,
+        'completion_tokens': usage.completion_tokens,
+        'total_tokens': usage.total_tokens,
+        'cached_tokens': getattr(details, 'cached_tokens', None) or 0,
+    }
+
+
+def cached_chat_completion(client, cache: ResponseCache, **request) -> Tuple[str, Dict, bool]:
+    """chat.completions.create를 캐시를 거쳐 호출 → (본문, usage, 캐시 사용 여부)"""
+    key = cache.make_key(**request)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached['content'], cached['usage'], True
+
+    started = time.perf_counter()
+    resp = client.chat.completions.create(**request)
+    content = resp.choices[0].message.content
+    usage = usage_to_dict(resp.usage)
+    cache.put(key, {
+        'content': content,
+        'usage': usage,
+        'model': request.get('model'),
+        'created_at': time.time(),
+        'elapsed': time.perf_counter() - started,
+    })
+    return content, usage, False
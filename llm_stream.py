@@ -0,0 +1,166 @@
+import os
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import resilience
+from llm_cache import ResponseCache, cached_chat_completion, usage_to_dict
+from markdown_render import IncrementalRenderer
+
+# 스트리밍 생성 설정
+OPENAI_STREAM = os.getenv('OPENAI_STREAM', '').lower() in ('1', 'true', 'yes')
+STREAM_OUTPUT_DIR = os.getenv('STREAM_OUTPUT_DIR', '')   # 비어 있으면 파일로 쓰지 않음
+PERPLEXITY_BASE_URL = 'https://api.perplexity.ai'         # 생성 대체 제공자
+OPENAI_TIMEOUT = 120
+
+
+class StreamingPostWriter:
+    """토큰 조각을 받아 마크다운 원문과 렌더링된 HTML 본문을 점진적으로 만드는 writer
+
+    md_path/html_path가 주어지면 블록이 완성될 때마다 파일에 이어 씀.
+    """
+
+    def __init__(self, md_path: Optional[str] = None, html_path: Optional[str] = None):
+        self.renderer = IncrementalRenderer()
+        self.md_parts = []
+        self.html_parts = []
+        self._md_file = open(md_path, 'w', encoding='utf-8') if md_path else None
+        self._html_file = open(html_path, 'w', encoding='utf-8') if html_path else None
+
+    def write(self, delta: str):
+        self.md_parts.append(delta)
+        if self._md_file:
+            self._md_file.write(delta)
+            self._md_file.flush()
+        fragment = self.renderer.feed(delta)
+        if fragment:
+            self.html_parts.append(fragment)
+            if self._html_file:
+                self._html_file.write(fragment)
+                self._html_file.flush()
+
+    def close(self) -> str:
+        """남은 블록을 마무리하고 HTML 본문 전체 반환"""
+        fragment = self.renderer.close()
+        if fragment:
+            self.html_parts.append(fragment)
+            if self._html_file:
+                self._html_file.write(fragment)
+        for f in (self._md_file, self._html_file):
+            if f:
+                f.close()
+        return self.html
+
+    @property
+    def html(self) -> str:
+        return ''.join(self.html_parts)
+
+    @property
+    def markdown(self) -> str:
+        return ''.join(self.md_parts)
+
+
+def stream_chat_completion(client, cache: ResponseCache, writer: StreamingPostWriter,
+                           **request) -> Tuple[str, Dict, bool, Dict]:
+    """스트리밍으로 생성하며 writer에 조각을 전달 → (본문, usage, 캐시 사용 여부, 지표)
+
+    끝나면 writer를 닫으므로 HTML 본문은 writer.html로 바로 사용 가능.
+    지표: ttft(첫 토큰까지 초), tokens_per_sec, render_tail_ms(마지막 토큰 후 렌더링 마무리 시간)
+    """
+    key = cache.make_key(**request)
+    cached = cache.get(key)
+    if cached is not None:
+        writer.write(cached['content'])
+        writer.close()
+        return cached['content'], cached['usage'], True, {}
+
+    started = time.perf_counter()
+    first_token_at = None
+    usage = {}
+    chunks = 0
+    stream = client.chat.completions.create(
+        stream=True, stream_options={'include_usage': True}, **request)
+    for chunk in stream:
+        if chunk.usage:
+            usage = usage_to_dict(chunk.usage)
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            chunks += 1
+            writer.write(delta)
+    last_token_at = time.perf_counter()
+    writer.close()
+    render_tail = time.perf_counter() - last_token_at
+
+    content = writer.markdown
+    completion_tokens = usage.get('completion_tokens', chunks)
+    generation_time = last_token_at - (first_token_at or started)
+    metrics = {
+        'ttft': round((first_token_at or last_token_at) - started, 3),
+        'tokens_per_sec': round(completion_tokens / generation_time, 1) if generation_time > 0 else 0.0,
+        'total_time': round(last_token_at - started, 3),
+        'render_tail_ms': round(render_tail * 1000, 2),
+    }
+    cache.put(key, {
+        'content': content,
+        'usage': usage,
+        'model': request.get('model'),
+        'created_at': time.time(),
+        'elapsed': metrics['total_time'],
+    })
+    return content, usage, False, metrics
+
+
+@lru_cache(maxsize=None)
+def openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None,
+                  timeout: float = OPENAI_TIMEOUT):
+    """OpenAI 호환 클라이언트 (openai는 생성 단계에서 처음 쓸 때 import, 설정별로 재사용)
+
+    재시도는 resilience에서 처리하므로 SDK 자체 재시도는 끔.
+    """
+    import openai
+    return openai.OpenAI(api_key=api_key or os.getenv('OPENAI_API_KEY'), base_url=base_url,
+                         timeout=timeout, max_retries=0)
+
+
+def fallback_candidates(client, model: str, fallback_model: str) -> List[Tuple[object, str]]:
+    """생성 시도 순서: 기본 모델 → 대체 모델 → (PERPLEXITY_API_KEY가 있으면) Perplexity sonar"""
+    candidates = [(client, model)]
+    if fallback_model and fallback_model != model:
+        candidates.append((client, fallback_model))
+    if os.getenv('PERPLEXITY_API_KEY'):
+        # Perplexity는 OpenAI 호환 API라 같은 SDK로 호출 가능
+        perplexity = openai_client(os.getenv('PERPLEXITY_API_KEY'), PERPLEXITY_BASE_URL)
+        candidates.append((perplexity, 'sonar'))
+    return candidates
+
+
+def complete_with_fallback(candidates: List[Tuple[object, str]], cache: ResponseCache,
+                           stream: bool = False,
+                           make_writer: Callable[[], StreamingPostWriter] = StreamingPostWriter,
+                           **request) -> Tuple[str, Dict, bool, str, Dict, str]:
+    """후보 (client, model)을 순서대로 재시도/브레이커를 거쳐 호출
+    → (본문, usage, 캐시 사용 여부, 스트리밍 HTML 본문, 스트리밍 지표, 실제 사용한 모델)
+    """
+    def attempt(client, model):
+        def run():
+            req = dict(request, model=model)
+            if not stream:
+                content, usage, cached = cached_chat_completion(client, cache, **req)
+                return content, usage, cached, '', {}
+            # 시도마다 새 writer를 써서 실패한 시도의 조각이 섞이지 않게 함
+            writer = make_writer()
+            try:
+                content, usage, cached, metrics = stream_chat_completion(client, cache, writer, **req)
+            except Exception:
+                writer.close()
+                raise
+            return content, usage, cached, writer.html, metrics
+        return run
+
+    result, used = resilience.call_with_fallback(
+        [(f"llm:{model}", attempt(client, model)) for client, model in candidates], stage='generate')
+    return (*result, used.split(':', 1)[1])
@@ -0,0 +1,265 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional
+
+import resilience
+from metrics import current as current_metrics
+
+# 대량 발송 설정
+RECIPIENTS_FILE = os.getenv('RECIPIENTS_FILE', '')      # 한 줄에 한 명 (# 주석 허용)
+OUTBOX_DB_PATH = os.getenv('OUTBOX_DB_PATH', os.path.join('data', 'outbox.db'))
+EMAIL_BATCH_SIZE = 100          # Resend batch API 한 번에 보낼 수 있는 최대 메일 수
+EMAIL_MAX_PARALLEL = 2          # 동시에 진행할 batch 요청 수
+EMAIL_RATE_LIMIT = 2.0          # 초당 최대 요청 수 (Resend 기본 제한)
+EMAIL_MAX_ATTEMPTS = 5          # 수신자별 최대 시도 횟수
+EMAIL_TIMEOUT = (5, 30)         # batch 요청 (연결, 읽기) 타임아웃 (초)
+RESEND_BATCH_URL = os.getenv('RESEND_API_URL', 'https://api.resend.com').rstrip('/') + '/emails/batch'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    sender TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    html TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    post_id INTEGER NOT NULL REFERENCES posts(id),
+    recipient TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',     -- pending / sent / failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    message_id TEXT,
+    last_error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (post_id, recipient)
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, attempts);
+"""
+
+
+def load_recipients(default: str = '') -> List[str]:
+    """수신자 목록: RECIPIENTS_FILE → EMAIL_TO(쉼표 구분) → default 순으로 사용"""
+    if RECIPIENTS_FILE:
+        with open(RECIPIENTS_FILE, 'r', encoding='utf-8') as f:
+            raw = [line.split('#', 1)[0] for line in f]
+    else:
+        raw = (os.getenv('EMAIL_TO') or default).split(',')
+    recipients = []
+    seen = set()
+    for address in raw:
+        address = address.strip()
+        if address and address.lower() not in seen:
+            seen.add(address.lower())
+            recipients.append(address)
+    return recipients
+
+
+class RateLimiter:
+    """초당 요청 수를 제한하는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Outbox:
+    """발송할 포스트와 수신자별 상태를 보관하는 SQLite outbox
+
+    실패하거나 보내지 못한 수신자는 포스트를 다시 만들지 않고 재시도할 수 있음.
+    """
+
+    def __init__(self, path: str = OUTBOX_DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    def create_post(self, sender: str, subject: str, html: str, text: str,
+                    recipients: List[str]) -> int:
+        now = time.time()
+        with self.conn:
+            cur = self.conn.execute(
+                'INSERT INTO posts (sender, subject, html, text, created_at) VALUES (?, ?, ?, ?, ?)',
+                (sender, subject, html, text, now))
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO outbox (post_id, recipient, updated_at) VALUES (?, ?, ?)',
+                [(cur.lastrowid, r, now) for r in recipients])
+        return cur.lastrowid
+
+    def get_post(self, post_id: int) -> sqlite3.Row:
+        return self.conn.execute('SELECT * FROM posts WHERE id = ?', (post_id,)).fetchone()
+
+    def pending(self, post_id: Optional[int] = None,
+                max_attempts: int = EMAIL_MAX_ATTEMPTS) -> Dict[int, List[str]]:
+        """아직 보내지 못한 수신자 → {post_id: [수신자, ...]}"""
+        sql = "SELECT post_id, recipient FROM outbox WHERE status != 'sent' AND attempts < ?"
+        params: list = [max_attempts]
+        if post_id is not None:
+            sql += ' AND post_id = ?'
+            params.append(post_id)
+        result: Dict[int, List[str]] = {}
+        for row in self.conn.execute(sql + ' ORDER BY post_id, recipient', params):
+            result.setdefault(row['post_id'], []).append(row['recipient'])
+        return result
+
+    def retry_count(self, post_id: Optional[int] = None,
+                    max_attempts: int = EMAIL_MAX_ATTEMPTS) -> int:
+        """이번 발송에서 재시도하게 될 수신자 수 (이미 한 번 이상 시도한 미발송 수신자)"""
+        sql = "SELECT COUNT(*) FROM outbox WHERE status = 'failed' AND attempts < ?"
+        params: list = [max_attempts]
+        if post_id is not None:
+            sql += ' AND post_id = ?'
+            params.append(post_id)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def mark_sent(self, post_id: int, recipients: List[str], message_ids: List[str]):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE outbox SET status = 'sent', attempts = attempts + 1, message_id = ?, "
+                "last_error = NULL, updated_at = ? WHERE post_id = ? AND recipient = ?",
+                [(mid, now, post_id, r) for r, mid in zip(recipients, message_ids)])
+
+    def mark_failed(self, post_id: int, recipients: List[str], error: str):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ?, "
+                "updated_at = ? WHERE post_id = ? AND recipient = ?",
+                [(error, now, post_id, r) for r in recipients])
+
+    def summary(self, post_id: int) -> Dict[str, int]:
+        rows = self.conn.execute(
+            'SELECT status, COUNT(*) FROM outbox WHERE post_id = ? GROUP BY status', (post_id,))
+        return {status: count for status, count in rows}
+
+    def close(self):
+        self.conn.close()
+
+
+class BatchMailer:
+    """수신자를 batch로 나눠 속도 제한 아래 병렬 발송하고 결과를 outbox에 기록
+
+    outbox를 주지 않으면 직접 열고 close()(또는 with 블록 종료) 때 닫음.
+    """
+
+    def __init__(self, outbox: Optional[Outbox] = None,
+                 batch_size: int = EMAIL_BATCH_SIZE,
+                 max_parallel: int = EMAIL_MAX_PARALLEL,
+                 rate_limit: float = EMAIL_RATE_LIMIT):
+        self._owns_outbox = outbox is None
+        self.outbox = outbox or Outbox()
+        self.batch_size = batch_size
+        self.max_parallel = max_parallel
+        self.limiter = RateLimiter(rate_limit)
+
+    def close(self):
+        """직접 연 outbox만 닫음 (넘겨받은 outbox는 호출한 쪽에서 관리)"""
+        if self._owns_outbox:
+            self.outbox.close()
+
+    def __enter__(self) -> 'BatchMailer':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def send(self, sender: str, subject: str, html: str, text: str,
+             recipients: List[str]) -> Dict[str, int]:
+        """포스트를 outbox에 저장한 뒤 발송 → {post_id, sent, failed, retried}
+
+        수신자별 실패는 예외 없이 failed로 집계되므로, 실제로 전달됐는지는 sent로 확인.
+        """
+        post_id = self.outbox.create_post(sender, subject, html, text, recipients)
+        return dict(self.deliver(post_id), post_id=post_id)
+
+    def _send_chunk(self, post: sqlite3.Row, recipients: List[str]) -> List[str]:
+        """수신자 한 묶음을 Resend batch API로 발송 → 수신자별 message id
+
+        일시적 장애는 resilience에서 재시도하며, 재시도에는 같은 Idempotency-Key를 써서
+        첫 요청이 실제로는 처리된 경우에도 중복 발송되지 않게 함.
+        응답에 data가 없으면(상태 코드와 무관하게) 실패로 보고 예외를 발생시켜 outbox에 failed로 남김.
+        """
+        import requests   # 발송 단계에서만 필요
+        # 수신자끼리 주소가 보이지 않도록 한 명당 메일 하나씩 batch로 묶어 전송
+        payload = [{
+            "from": post['sender'],
+            "to": [recipient],
+            "subject": post['subject'],
+            "html": post['html'],
+            "text": post['text'],
+        } for recipient in recipients]
+        headers = {
+            'Authorization': f"Bearer {os.getenv('RESEND_API_KEY', '')}",
+            'Idempotency-Key': f"post-{post['id']}-{uuid.uuid4().hex}",
+        }
+
+        def post_batch():
+            self.limiter.acquire()
+            resp = requests.post(RESEND_BATCH_URL, json=payload, headers=headers, timeout=EMAIL_TIMEOUT)
+            resp.raise_for_status()
+            return resp
+
+        resp = resilience.call('resend', post_batch, stage='send')
+        try:
+            data = resp.json().get('data')
+        except (ValueError, AttributeError):
+            data = None
+        if not isinstance(data, list):
+            raise RuntimeError(f"Resend 응답에 data 없음 (HTTP {resp.status_code}): {resp.text[:200]}")
+        return [item.get('id', '') for item in data] + [''] * (len(recipients) - len(data))
+
+    def deliver(self, post_id: Optional[int] = None) -> Dict[str, int]:
+        """outbox에서 미발송 수신자를 찾아 발송 (post_id가 없으면 전체 재시도)"""
+        with current_metrics().stage('send'):
+            totals = self._deliver(post_id)
+        current_metrics().count('send', items_out=totals['sent'], retries=totals['retried'])
+        return totals
+
+    def _deliver(self, post_id: Optional[int]) -> Dict[str, int]:
+        totals = {'sent': 0, 'failed': 0, 'retried': self.outbox.retry_count(post_id)}
+        for pid, recipients in self.outbox.pending(post_id).items():
+            post = self.outbox.get_post(pid)
+            chunks = [recipients[i:i + self.batch_size]
+                      for i in range(0, len(recipients), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+                futures = {executor.submit(self._send_chunk, post, chunk): chunk for chunk in chunks}
+                # DB 기록은 메인 스레드에서만 수행
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    try:
+                        self.outbox.mark_sent(pid, chunk, future.result())
+                        totals['sent'] += len(chunk)
+                    except Exception as e:
+                        self.outbox.mark_failed(pid, chunk, str(e))
+                        totals['failed'] += len(chunk)
+                        print(f"❌ 발송 실패 ({len(chunk)}명): {e}")
+            print(f"📬 포스트 #{pid} 발송 현황: {self.outbox.summary(pid)}")
+        return totals
+
+
+if __name__ == "__main__":
+    # 실패/미발송 수신자 재시도
+    with BatchMailer() as mailer:
+        print(mailer.deliver())
@@ -2,24 +2,30 @@ import os
 import json
 import requests
 from datetime import datetime
-from typing import List, Dict
-import resend
-import openai
+from typing import Callable, List, Dict, Optional
 from dotenv import load_dotenv
 
+import resilience
+from editions import EDITIONS
+from history_store import CoveredStore
+from json_stream import JSONArrayStreamParser
+from llm_cache import ResponseCache
+from llm_stream import OPENAI_STREAM, STREAM_OUTPUT_DIR, StreamingPostWriter, openai_client
+from metrics import current as current_metrics
+
 # 환경 변수 로드
 load_dotenv()
 
 # API 키 및 이메일 설정
 PERPLEXITY_API_KEY = os.getenv('PERPLEXITY_API_KEY')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-RESEND_API_KEY = os.getenv('RESEND_API_KEY')
-EMAIL_FROM = os.getenv('EMAIL_FROM', 'ai-trends@yourdomain.com')
-EMAIL_TO = os.getenv('EMAIL_TO', 'gyu3637@gmail.com')
-# EMAIL_TO = 'gyu3637@gmail.com'
 
-# Resend 초기화
-resend.api_key = RESEND_API_KEY
+# 외부 API 타임아웃 (연결, 읽기) - 모델/대체 모델/수신자는 editions의 'trend' 에디션에서 설정
+PERPLEXITY_TIMEOUT = (5, 30)
+OPENAI_TIMEOUT = 120
+# Perplexity 응답을 SSE로 받아 뉴스 객체가 닫히는 대로 넘길지 여부
+PERPLEXITY_STREAM = os.getenv('PERPLEXITY_STREAM', '').lower() in ('1', 'true', 'yes')
+NEWS_REQUIRED_FIELDS = ('title', 'url')
 
 
 class AITrendAnalyzer:
@@ -29,13 +35,29 @@ class AITrendAnalyzer:
         self.news_items: List[Dict] = []  # Perplexity JSON
         self.sources: List[str] = []      # URL 리스트
         self.final_post: str = ''         # Claude 결과 (Markdown)
+        self.rendered_body: str = ''      # 스트리밍 중 미리 렌더링된 HTML 본문
+        self.html_body: str = ''          # 발송한 메일 HTML
+        self.post: Dict = {}              # 생성 결과 (프롬프트, 사용량 등 - 실행 기록용)
+        self.post_id = None               # outbox 포스트 번호
+        self.used_items: List[Dict] = []  # 프롬프트에 실제로 들어간 뉴스
         self.debug_info: Dict = {}
+        self.history = CoveredStore()     # 이미 다룬 뉴스 이력
+        self.llm_cache = ResponseCache()  # 같은 입력 재실행 시 OpenAI 응답 재사용
 
     # -----------------------------
     # 1) Perplexity: 오늘의 뉴스 검색
     # -----------------------------
-    def search_news_with_perplexity(self) -> List[Dict]:
-        """Perplexity API로 오늘의 AI/Tech 뉴스 5개를 JSON 배열로 수집"""
+    def search_news_with_perplexity(self, stream: bool = PERPLEXITY_STREAM,
+                                    on_item: Optional[Callable[[Dict], None]] = None,
+                                    skip_covered: bool = True) -> List[Dict]:
+        """Perplexity API로 오늘의 AI/Tech 뉴스 5개를 JSON 배열로 수집
+
+        stream=True면 SSE로 받으며 객체가 닫히는 즉시 on_item(새 뉴스)을 호출해
+        본문 추출 등 다음 단계가 나머지 응답을 기다리지 않고 시작할 수 있음.
+        깨진 객체나 중간에 끊긴 뒷부분은 건너뛰고 그때까지 받은 뉴스로 진행함.
+        skip_covered=False면 이력(self.history)을 건드리지 않고 받은 뉴스를 그대로 돌려줌
+        (다른 스레드에서 호출할 때 - 이력 필터는 호출한 쪽에서).
+        """
         headers = {
             'Authorization': f'Bearer {PERPLEXITY_API_KEY}',
             'Content-Type': 'application/json'
@@ -55,253 +77,173 @@ class AITrendAnalyzer:
             "temperature": 0.2,
             "max_tokens": 2000
         }
+        if stream:
+            payload['stream'] = True
 
-        try:
+        def post():
             resp = requests.post(
                 'https://api.perplexity.ai/chat/completions',
                 headers=headers,
                 json=payload,
-                timeout=30
+                timeout=PERPLEXITY_TIMEOUT,
+                stream=stream
             )
             resp.raise_for_status()
-            content = resp.json()['choices'][0]['message']['content'].strip()
+            return resp
 
-            # 코드펜스 제거
-            if content.startswith('```'):
-                content = content.split('\n', 1)[1].rsplit('```', 1)[0].strip()
+        parser = JSONArrayStreamParser(NEWS_REQUIRED_FIELDS)
+        self.news_items = []
 
-            self.news_items = json.loads(content)
-            self.sources = [item['url'] for item in self.news_items]
-            self.debug_info['news_count'] = len(self.news_items)
-            return self.news_items
+        def accept(items: List[Dict]):
+            # 이전 포스트에서 이미 다룬 뉴스 제외 (도착하는 대로 하나씩 확인)
+            for item in items:
+                if skip_covered and self.history.is_covered(item):
+                    continue
+                self.news_items.append(item)
+                if on_item:
+                    on_item(item)
+
+        try:
+            # 일시적 장애(타임아웃/429/5xx)는 백오프 후 재시도 (연결/상태 코드까지만)
+            resp = resilience.call('perplexity', post)
+            if stream and 'text/event-stream' in resp.headers.get('Content-Type', ''):
+                self._read_perplexity_stream(resp, parser, accept, payload['model'])
+            else:
+                data = resp.json()
+                current_metrics().count('fetch', bytes=len(resp.content))
+                current_metrics().record_usage('fetch', payload['model'], data.get('usage', {}))
+                accept(parser.feed(data['choices'][0]['message']['content']))
+            parser.close()
+            if not parser.items:
+                raise ValueError(f"응답에서 뉴스를 하나도 파싱하지 못함 (깨진 항목 {parser.skipped}개)")
         except Exception as e:
             print(f"❌ Perplexity 오류: {e}")
             raise
 
+        if skip_covered:
+            print(f"이전 포스트와 중복 제외: {len(parser.items)}개 → {len(self.news_items)}개")
+        if parser.skipped:
+            print(f"⚠️  Perplexity 응답에서 깨진 항목 {parser.skipped}개 건너뜀")
+        current_metrics().count('fetch', items_out=len(parser.items))
+        self.sources = [item['url'] for item in self.news_items]
+        self.debug_info['news_count'] = len(self.news_items)
+        return self.news_items
+
+    def _read_perplexity_stream(self, resp, parser: JSONArrayStreamParser,
+                                accept: Callable[[List[Dict]], None], model: str):
+        """SSE(data: {...}) 조각의 delta를 파서에 넣고 완성된 뉴스를 바로 accept로 넘김
+
+        받은 뉴스가 있으면 중간에 연결이 끊겨도 그때까지의 결과로 진행함.
+        """
+        received = 0
+        usage = {}
+        try:
+            for line in resp.iter_lines():
+                received += len(line) + 1
+                if not line.startswith(b'data:'):
+                    continue
+                data = line[len(b'data:'):].strip()
+                if data == b'[DONE]':
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    continue
+                usage = chunk.get('usage') or usage
+                for choice in chunk.get('choices', []):
+                    delta = (choice.get('delta') or {}).get('content')
+                    if delta and not parser.done:
+                        accept(parser.feed(delta))
+        except Exception as e:
+            if not parser.items:
+                raise
+            print(f"⚠️  Perplexity 스트림 중단, 받은 {len(parser.items)}개로 진행: {e}")
+        finally:
+            resp.close()
+            current_metrics().count('fetch', bytes=received)
+            current_metrics().record_usage('fetch', model, usage)
+
     # -----------------------------
     # 2) OpenAI: 블로그 포스트 생성 (개선된 프롬프트)
     # -----------------------------
-    def generate_with_openai(self) -> str:
-        """GPT-4.1로 최종 Markdown 포스트 작성"""
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-
-        prompt = f"""당신은 스타트업 창업자와 개발자들을 위한 AI 트렌드 분석 전문가입니다.
-아래 뉴스들을 바탕으로 한국어로 심도 있는 블로그 포스트를 작성해주세요.
-
-입력 데이터:
-{json.dumps(self.news_items, ensure_ascii=False, indent=2)}
-
-작성 가이드라인:
-- 전체 분량: 2500자 - 4000자 (공백 포함)
-- 독자: 한국의 스타트업 창업자, CTO, 개발자, 프로덕트 매니저
-- "뉴닉 스타일 + 스레드(Thread) 감성"
-
-1. **반말 톤**으로 말 걸듯 써줘  
-2. **제목은 자극적이고 후킹되게**, 말맛 있게 쓸 것  
-   (예: “AI가 책 읽고 공부했는데… 법원은 OK했대?”)  
-
-3. 본문 구성은 이 순서로 이모지 포함해서 :
-- :boom: 첫 문단: 요즘 유행하는 사례(혹은 밈)나 공감가는 상황에서 시작  
-- :round_pushpin: 중간 요약: 사건 or 이슈가 뭐였는지 맥락 정리  
-- :eyes: 실무자 시선: “그럼 이걸 우리는 어떻게 받아들여야 할까?” 꼭 포함  
-- :white_check_mark: 마지막 한 줄 요약: 캐주얼하지만 정리되는 문장
-
-4. **친절하지만 가볍게**, “설명해주듯” 말투로  
-5. 너무 설명하거나 교과서처럼 쓰지 말고, **카톡하듯** 쓸 것
-"""
-
-        resp = client.chat.completions.create(
-            model="gpt-4.1-nano-2025-04-14",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=8192,
-            temperature=0.3
-        )
-
-        self.final_post = resp.choices[0].message.content
-        self.debug_info['openai_usage'] = {
-            'prompt_tokens': resp.usage.prompt_tokens,
-            'completion_tokens': resp.usage.completion_tokens,
-            'total_tokens': resp.usage.total_tokens,
-        }
+    def generate_with_openai(self, stream: bool = OPENAI_STREAM) -> str:
+        """GPT-4.1로 최종 Markdown 포스트 작성
+
+        stream=True면 토큰이 오는 대로 HTML 본문을 렌더링해 생성과 후처리를 겹침.
+        """
+        # 재시도는 resilience에서 처리하므로 SDK 자체 재시도는 끔
+        client = openai_client(OPENAI_API_KEY, timeout=OPENAI_TIMEOUT)
+
+        edition = EDITIONS['trend']
+
+        def make_writer():
+            md_path = html_path = None
+            if STREAM_OUTPUT_DIR:
+                os.makedirs(STREAM_OUTPUT_DIR, exist_ok=True)
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M')
+                md_path = os.path.join(STREAM_OUTPUT_DIR, f"blog_post_{timestamp}.md")
+                html_path = os.path.join(STREAM_OUTPUT_DIR, f"blog_post_{timestamp}.html")
+            return StreamingPostWriter(md_path, html_path)
+
+        # 입력 토큰 예산 안에서 뉴스 필드를 압축 직렬화해 최대한 채우고,
+        # stream=True면 토큰이 오는 대로 HTML 본문을 렌더링, 실패 시 재시도 후 대체 모델 사용
+        self.post = post = edition.generate(self.news_items, client, self.llm_cache, stream, make_writer)
+        self.final_post, self.rendered_body = post['content'], post['html']
+        usage, cached, metrics = post['usage'], post['cached'], post['metrics']
+        self.used_items = post['used']
+        self.debug_info['packed_prompt'] = {'items': len(self.used_items), 'tokens': post['prompt_tokens']}
+        print(f"🧮 프롬프트: 뉴스 {len(self.used_items)}/{len(self.news_items)}개, 입력 {post['prompt_tokens']} 토큰")
+        if metrics:
+            self.debug_info['stream_metrics'] = metrics
+            print(f"⚡ TTFT {metrics['ttft']}s · {metrics['tokens_per_sec']} tok/s · "
+                  f"렌더링 마무리 {metrics['render_tail_ms']}ms")
+        self.debug_info['openai_usage'] = usage
+        self.debug_info['llm_cache'] = self.llm_cache.hit_rate()
+        if cached:
+            print("♻️  캐시된 OpenAI 응답 사용")
         return self.final_post
 
     # -----------------------------
-    # 3) 파일 저장
-    # -----------------------------
-    def save_to_file(self):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-        md_name = f"blog_post_{timestamp}.md"
-        with open(md_name, 'w', encoding='utf-8') as f:
-            f.write(self.final_post)
-
-        meta_name = f"metadata_{timestamp}.json"
-        with open(meta_name, 'w', encoding='utf-8') as f:
-            json.dump({
-                'timestamp': timestamp,
-                'news_count': len(self.news_items),
-                'final_length': len(self.final_post),
-                'openai_usage': self.debug_info.get('openai_usage', {})
-            }, f, ensure_ascii=False, indent=2)
-
-        print(f"📄 {md_name} & {meta_name} 저장 완료")
-
-    # -----------------------------
-    # 4) Markdown → HTML (푸터에 출처 포함)
+    # 3) Markdown → HTML (푸터에 출처 포함)
     # -----------------------------
-    def _markdown_to_html(self, md: str, sources: List[str]) -> str:
-        import re
-
-        # 기본 Markdown 변환 (단순 정규식)
-        html = md
-        html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-        html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-        html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-        html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)  # 인라인 코드
-        html = re.sub(r'^- (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-        html = re.sub(r'(<li>.*?</li>)', r'<ul>\1</ul>', html, flags=re.DOTALL)
-        
-        # 체크박스 처리
-        html = re.sub(r'- \[ \] (.+)$', r'<li><input type="checkbox" disabled> \1</li>', html, flags=re.MULTILINE)
-        html = re.sub(r'- \[x\] (.+)$', r'<li><input type="checkbox" checked disabled> \1</li>', html, flags=re.MULTILINE)
-
-        # 문단 래핑
-        paragraphs = [p.strip() for p in html.split('\n\n') if p.strip()]
-        html = '\n'.join(
-            p if p.startswith('<') else f'<p>{p}</p>'
-            for p in paragraphs
-        )
-
-        # 출처 섹션
-        src_html = '<h3>참고 자료</h3><ol>' + ''.join(
-            f'<li><a href="{u}" target="_blank">{u}</a></li>' for u in sources
-        ) + '</ol>'
-
-        # 스타일 적용 (개선된 디자인)
-        styled = f"""
-        <!DOCTYPE html>
-        <html lang=ko>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body{{
-                    font-family: 'Pretendard', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-                    line-height: 1.8;
-                    color: #2c3e50;
-                    max-width: 750px;
-                    margin: 0 auto;
-                    padding: 40px 20px;
-                    background: #f8f9fa;
-                }}
-                h1{{
-                    color: #1a202c;
-                    border-bottom: 3px solid #4299e1;
-                    padding-bottom: 15px;
-                    margin-bottom: 30px;
-                    font-size: 32px;
-                    font-weight: 700;
-                }}
-                h2{{
-                    color: #2d3748;
-                    margin-top: 45px;
-                    margin-bottom: 25px;
-                    font-size: 26px;
-                    font-weight: 600;
-                }}
-                h3{{
-                    color: #4a5568;
-                    margin-top: 30px;
-                    margin-bottom: 20px;
-                    font-size: 20px;
-                    font-weight: 600;
-                }}
-                strong{{
-                    color: #e53e3e;
-                    font-weight: 600;
-                }}
-                code{{
-                    background: #e2e8f0;
-                    padding: 2px 6px;
-                    border-radius: 3px;
-                    font-family: 'Consolas', 'Monaco', monospace;
-                    font-size: 0.9em;
-                }}
-                p{{
-                    margin: 20px 0;
-                    text-align: justify;
-                }}
-                ul{{
-                    margin: 20px 0;
-                    padding-left: 30px;
-                }}
-                li{{
-                    margin: 10px 0;
-                }}
-                a{{
-                    color: #4299e1;
-                    text-decoration: none;
-                }}
-                a:hover{{
-                    text-decoration: underline;
-                }}
-                input[type="checkbox"]{{
-                    margin-right: 8px;
-                }}
-                .footer{{
-                    margin-top: 60px;
-                    padding-top: 30px;
-                    border-top: 1px solid #e2e8f0;
-                    font-size: 14px;
-                    color: #718096;
-                    text-align: center;
-                }}
-            </style>
-        </head>
-        <body>
-            <h1>AI 트렌드 인사이트</h1>
-            {html}
-            {src_html}
-            <div class="footer">
-                Generated by AI Trend Analyzer • {datetime.now().strftime('%Y년 %m월 %d일 %H:%M')}
-            </div>
-        </body>
-        </html>"""
-        return styled
+    def _markdown_to_html(self, md: str, sources: List[str], body_html: str = '') -> str:
+        # 스트리밍 중 이미 렌더링된 본문이 있으면 재사용, 스타일/뼈대는 에디션 테마 셸 사용
+        return EDITIONS['trend'].render(md, body_html, sources)
 
     # -----------------------------
-    # 5) 이메일 발송
+    # 4) 이메일 발송
     # -----------------------------
     def send_email(self):
         if not self.final_post:
             print("⚠️  최종 포스트가 비어 있습니다. 이메일 취소")
             return
 
-        html_body = self._markdown_to_html(self.final_post, self.sources)
-        subject = f"[AI 트렌드] {datetime.now().strftime('%m/%d')} 실무 인사이트"
-
         try:
-            result = resend.Emails.send({
-                "from": EMAIL_FROM,
-                "to": EMAIL_TO,
-                "subject": subject,
-                "html": html_body,
-                "text": self.final_post
-            })
-            print(f"✅ 이메일 발송 완료: {result}")
+            # 수신자 목록을 batch로 나눠 발송, 실패한 수신자는 outbox에 남아 재시도 가능
+            edition = EDITIONS['trend']
+            recipients = edition.recipients()
+            self.html_body = self._markdown_to_html(self.final_post, self.sources, self.rendered_body)
+            delivery = edition.mail(self.html_body, self.final_post, recipients)
+            self.post_id = delivery['post_id']
+            if delivery['sent']:
+                print(f"✅ 이메일 발송 완료: 포스트 #{self.post_id}, 수신자 {len(recipients)}명 중 {delivery['sent']}명")
+            else:
+                print(f"❌ 이메일 발송 실패: 포스트 #{self.post_id}, 전달된 수신자 없음 (outbox에서 재시도 가능)")
         except Exception as e:
             print(f"❌ 이메일 발송 실패: {e}")
 
     # -----------------------------
     # 파이프라인 실행
     # -----------------------------
-    def run(self):
+    def run(self) -> int:
+        """python cli.py run --preset trend 와 같음 (수집/필터/생성/발송/이력 기록은 cli.run_stages)"""
+        from cli import run_preset
         print("🚀 AI 트렌드 분석 시작!")
-        self.search_news_with_perplexity()
-        self.generate_with_openai()
-        # self.save_to_file()
-        self.send_email()
-        print("🎉 모든 작업 완료!")
+        return run_preset('trend')
 
 
 if __name__ == "__main__":
-    AITrendAnalyzer().run()
\ No newline at end of file
+    # python main.py == python cli.py run --preset trend (추가 인자는 그대로 전달)
+    import sys
+    from cli import main
+    sys.exit(main(['run', '--preset', 'trend'] + sys.argv[1:]))
\ No newline at end of file
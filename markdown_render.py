@@ -0,0 +1,398 @@
+import html
+import re
+from typing import List
+
+# 블록 단위 패턴 (줄 하나에 대해 한 번만 매칭)
+_HEADING = re.compile(r'^(#{1,4}) +(.+?)(?: +#+)?$')     # 닫는 #은 앞에 공백이 있을 때만 제거 (C# 유지)
+_CHECKBOX = re.compile(r'^[-*] \[([ xX])\] +(.*)$')
+_BULLET = re.compile(r'^[-*] +(.*)$')
+_ORDERED = re.compile(r'^\d+[.)] +(.*)$')
+_HR = re.compile(r'^(?:-{3,}|\*{3,}|_{3,})$')
+
+# 인라인 패턴: 코드 / 굵게 / 링크를 하나의 정규식으로 한 번에 처리
+_INLINE = re.compile(
+    r'`([^`]+)`'
+    r'|\*\*(.+?)\*\*'
+    r'|\[([^\]]+)\]\(([^)\s]+)\)'
+)
+_INLINE_MARKERS = re.compile(r'[`*\[]')     # 이 글자가 없는 줄은 인라인 변환 생략
+LINK_SCHEMES = ('http://', 'https://', 'mailto:')   # 메일 HTML에 링크로 남길 스킴 (그 외는 텍스트만)
+
+
+def _inline_sub(match) -> str:
+    code, bold, label, url = match.groups()
+    if code is not None:
+        return f'<code>{code}</code>'
+    if bold is not None:
+        return f'<strong>{_INLINE.sub(_inline_sub, bold)}</strong>'
+    label = _INLINE.sub(_inline_sub, label)
+    if not url.lower().startswith(LINK_SCHEMES):
+        return label
+    url = url.replace('"', '&quot;')
+    return f'<a href="{url}" target="_blank">{label}</a>'
+
+
+def _escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def render_inline(text: str) -> str:
+    """HTML 이스케이프 후 인라인 마크다운 변환"""
+    # 이스케이프는 한 번만 하고, 중첩(굵게 안의 링크 등)은 이스케이프된 텍스트에 재귀 적용
+    text = _escape(text)
+    if _INLINE_MARKERS.search(text) is None:
+        return text
+    return _INLINE.sub(_inline_sub, text)
+
+
+class IncrementalRenderer:
+    """마크다운을 조각 단위로 받아 완성된 블록부터 HTML로 내보내는 렌더러
+
+    feed()는 줄바꿈까지 들어온 줄만 처리하고, 닫힌 블록의 HTML을 반환.
+    close()는 남은 줄과 열린 블록을 마무리. 한 번에 전체를 넣어도 결과는 같음.
+    """
+
+    def __init__(self):
+        self._pending = ''            # 아직 줄바꿈이 오지 않은 텍스트
+        self._paragraph: List[str] = []
+        self._list_tag = ''           # 열린 목록 태그 ('ul' / 'ol')
+        self._in_code = False
+
+    def feed(self, text: str) -> str:
+        self._pending += text
+        if '\n' not in self._pending:
+            return ''
+        *lines, self._pending = self._pending.split('\n')
+        out: List[str] = []
+        for line in lines:
+            self._line(line.rstrip('\r'), out)
+        return ''.join(out)
+
+    def close(self) -> str:
+        out: List[str] = []
+        if self._pending:
+            self._line(self._pending, out)
+            self._pending = ''
+        self._close_blocks(out)
+        if self._in_code:
+            out.append('</code></pre>\n')
+            self._in_code = False
+        return ''.join(out)
+
+    def _close_blocks(self, out: List[str]):
+        if self._paragraph:
+            out.append(f"<p>{'<br>'.join(self._paragraph)}</p>\n")
+            self._paragraph = []
+        if self._list_tag:
+            out.append(f'</{self._list_tag}>\n')
+            self._list_tag = ''
+
+    def _open_list(self, tag: str, out: List[str]):
+        if self._list_tag != tag:
+            self._close_blocks(out)
+            out.append(f'<{tag}>\n')
+            self._list_tag = tag
+
+    def _line(self, line: str, out: List[str]):
+        stripped = line.strip()
+        if self._in_code:
+            if stripped.startswith('```'):
+                out.append('</code></pre>\n')
+                self._in_code = False
+            else:
+                out.append(html.escape(line, quote=False) + '\n')
+            return
+        if stripped.startswith('```'):
+            self._close_blocks(out)
+            out.append('<pre><code>')
+            self._in_code = True
+            return
+        if not stripped:
+            self._close_blocks(out)
+            return
+
+        # 첫 글자로 분기해 대부분의 문단 줄은 블록 패턴 매칭 없이 통과
+        first = stripped[0]
+        if first == '#':
+            m = _HEADING.match(stripped)
+            if m:
+                self._close_blocks(out)
+                level = len(m.group(1))
+                out.append(f'<h{level}>{render_inline(m.group(2))}</h{level}>\n')
+                return
+        elif first in '-*_':
+            if _HR.match(stripped):
+                self._close_blocks(out)
+                out.append('<hr>\n')
+                return
+            m = _CHECKBOX.match(stripped)
+            if m:
+                self._open_list('ul', out)
+                checked = ' checked' if m.group(1) in 'xX' else ''
+                out.append(f'<li><input type="checkbox"{checked} disabled> {render_inline(m.group(2))}</li>\n')
+                return
+            m = _BULLET.match(stripped)
+            if m:
+                self._open_list('ul', out)
+                out.append(f'<li>{render_inline(m.group(1))}</li>\n')
+                return
+        elif first.isdigit():
+            m = _ORDERED.match(stripped)
+            if m:
+                self._open_list('ol', out)
+                out.append(f'<li>{render_inline(m.group(1))}</li>\n')
+                return
+        elif first == '>':
+            self._close_blocks(out)
+            out.append(f'<blockquote>{render_inline(stripped.lstrip("> "))}</blockquote>\n')
+            return
+
+        # 일반 텍스트: 목록 직후면 목록을 닫고 문단 시작
+        if self._list_tag:
+            self._close_blocks(out)
+        self._paragraph.append(render_inline(stripped))
+
+
+def render_markdown(md: str) -> str:
+    """마크다운 전체를 HTML 본문으로 변환"""
+    renderer = IncrementalRenderer()
+    return renderer.feed(md) + renderer.close()
+
+
+# -----------------------------
+# 페이지 셸 (CSS/HTML 뼈대는 import 시 한 번만 만들어 둠)
+# -----------------------------
+_BASE_CSS = """
+pre{
+    background: #f1f3f5;
+    padding: 16px;
+    border-radius: 5px;
+    overflow-x: auto;
+}
+blockquote{
+    margin: 20px 0;
+    padding-left: 16px;
+    border-left: 4px solid #cbd5e0;
+    color: #555;
+}
+hr{
+    border: none;
+    border-top: 1px solid #e2e8f0;
+    margin: 40px 0;
+}
+"""
+
+# main.py (AITrendAnalyzer) 디자인
+_TREND_CSS = """
+body{
+    font-family: 'Pretendard', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+    line-height: 1.8;
+    color: #2c3e50;
+    max-width: 750px;
+    margin: 0 auto;
+    padding: 40px 20px;
+    background: #f8f9fa;
+}
+h1{
+    color: #1a202c;
+    border-bottom: 3px solid #4299e1;
+    padding-bottom: 15px;
+    margin-bottom: 30px;
+    font-size: 32px;
+    font-weight: 700;
+}
+h2{
+    color: #2d3748;
+    margin-top: 45px;
+    margin-bottom: 25px;
+    font-size: 26px;
+    font-weight: 600;
+}
+h3{
+    color: #4a5568;
+    margin-top: 30px;
+    margin-bottom: 20px;
+    font-size: 20px;
+    font-weight: 600;
+}
+strong{
+    color: #e53e3e;
+    font-weight: 600;
+}
+code{
+    background: #e2e8f0;
+    padding: 2px 6px;
+    border-radius: 3px;
+    font-family: 'Consolas', 'Monaco', monospace;
+    font-size: 0.9em;
+}
+p{
+    margin: 20px 0;
+    text-align: justify;
+}
+ul{
+    margin: 20px 0;
+    padding-left: 30px;
+}
+li{
+    margin: 10px 0;
+}
+a{
+    color: #4299e1;
+    text-decoration: none;
+}
+a:hover{
+    text-decoration: underline;
+}
+input[type="checkbox"]{
+    margin-right: 8px;
+}
+.footer{
+    margin-top: 60px;
+    padding-top: 30px;
+    border-top: 1px solid #e2e8f0;
+    font-size: 14px;
+    color: #718096;
+    text-align: center;
+}
+"""
+
+# blog.py (EmailSender) 디자인
+_REPORT_CSS = """
+body {
+    font-family: 'Noto Sans KR', -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
+    line-height: 1.8;
+    color: #333;
+    background-color: #f5f5f5;
+}
+.container {
+    max-width: 800px;
+    margin: 0 auto;
+    padding: 50px 30px;
+    background-color: white;
+    box-shadow: 0 2px 20px rgba(0,0,0,0.1);
+}
+h1, h2, h3, h4 {
+    color: #2c3e50;
+    margin-top: 30px;
+    font-weight: 700;
+}
+h1 {
+    border-bottom: 3px solid #3498db;
+    padding-bottom: 20px;
+    font-size: 36px;
+    text-align: center;
+}
+h2 {
+    font-size: 28px;
+    color: #34495e;
+    margin-top: 50px;
+}
+h3 {
+    font-size: 24px;
+    color: #2c3e50;
+    border-left: 4px solid #3498db;
+    padding-left: 15px;
+    margin-top: 40px;
+}
+h4 {
+    font-size: 20px;
+    color: #34495e;
+    margin-top: 30px;
+}
+p {
+    margin: 20px 0;
+    text-align: justify;
+    font-size: 16px;
+    color: #444;
+}
+strong {
+    color: #e74c3c;
+    font-weight: 600;
+}
+a {
+    color: #3498db !important;
+    text-decoration: none;
+    border-bottom: 1px dotted #3498db;
+    transition: all 0.3s ease;
+}
+a:hover {
+    color: #2980b9 !important;
+    border-bottom-style: solid;
+}
+.reference-section {
+    margin-top: 60px;
+    padding: 30px;
+    background-color: #f8f9fa;
+    border-left: 4px solid #3498db;
+    border-radius: 5px;
+}
+.reference-section h3 {
+    margin-top: 0;
+    border: none;
+    padding: 0;
+}
+.reference-section ul {
+    list-style-type: none;
+    padding: 0;
+}
+.reference-section li {
+    margin: 15px 0;
+    padding: 12px 0;
+    border-bottom: 1px solid #e9ecef;
+}
+.footer {
+    margin-top: 70px;
+    padding-top: 30px;
+    border-top: 2px solid #ecf0f1;
+    font-size: 14px;
+    color: #95a5a6;
+    text-align: center;
+}
+.footer p {
+    text-align: center;
+}
+.highlight-box {
+    background-color: #f0f7ff;
+    border-left: 4px solid #3498db;
+    padding: 20px;
+    margin: 30px 0;
+    border-radius: 5px;
+}
+"""
+
+_CSS_SPACE = re.compile(r'\s*([{};:,])\s*')
+
+
+def _compact_css(css: str) -> str:
+    """불필요한 공백 제거"""
+    return _CSS_SPACE.sub(r'\1', ' '.join(css.split()))
+
+
+def _build_shell(css: str, lang: str, wrapper: str = '') -> tuple:
+    head = (
+        f'<!DOCTYPE html>\n<html lang="{lang}">\n<head>\n<meta charset="UTF-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+        f'<style>{_compact_css(_BASE_CSS + css)}</style>\n</head>\n<body>\n'
+    )
+    if wrapper:
+        return head + f'<div class="{wrapper}">\n', '</div>\n</body>\n</html>'
+    return head, '</body>\n</html>'
+
+
+# 테마별 전체 스타일시트 (메일 발송 전 email_payload가 인라인 스타일로 옮김)
+THEME_CSS = {
+    'trend': _BASE_CSS + _TREND_CSS,
+    'report': _BASE_CSS + _REPORT_CSS,
+}
+
+PAGE_THEMES = {
+    'trend': _build_shell(_TREND_CSS, 'ko'),
+    'report': _build_shell(_REPORT_CSS, 'ko', wrapper='container'),
+}
+
+
+def render_page(body_html: str, theme: str = 'trend') -> str:
+    """미리 만들어 둔 셸에 본문을 끼워 완성된 HTML 문서 반환"""
+    head, tail = PAGE_THEMES[theme]
+    return head + body_html + tail
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+# 실행 지표 저장 위치
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join('data', 'metrics'))
+
+# 모델별 1K 토큰당 가격 (USD, 입력/출력)
+MODEL_PRICES = {
+    'gpt-3.5-turbo-16k': (0.001, 0.002),
+    'gpt-4.1-nano-2025-04-14': (0.0001, 0.0004),
+    'sonar': (0.001, 0.001),
+}
+
+COUNTERS = ('calls', 'bytes', 'items_in', 'items_out', 'retries',
+            'prompt_tokens', 'completion_tokens', 'cached_tokens')
+
+
+def estimate_cost(model: str, usage: Dict) -> float:
+    """usage(prompt_tokens, completion_tokens)로 실제 비용 계산"""
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (usage.get('prompt_tokens', 0) * input_price
+            + usage.get('completion_tokens', 0) * output_price) / 1000
+
+
+class RunMetrics:
+    """단계(fetch, filter, generate, render, send)별 시간/바이트/건수/토큰/비용 기록
+
+    카운터 갱신은 dict 덧셈뿐이라 운영 중에도 켜 둘 수 있음. 여러 스레드에서 호출해도 안전.
+    """
+
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.started_at = time.time()
+        self.stages: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, name: str) -> Dict:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {'seconds': 0.0, 'cost_usd': 0.0, **{c: 0 for c in COUNTERS}}
+        return stage
+
+    @contextmanager
+    def stage(self, name: str):
+        """with metrics.stage('fetch'): ... 구간의 실행 시간을 누적"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stage = self._stage(name)
+                stage['seconds'] += elapsed
+                stage['calls'] += 1
+
+    def count(self, name: str, **counters):
+        """bytes / items_in / items_out / retries 등을 더함"""
+        with self._lock:
+            stage = self._stage(name)
+            for key, value in counters.items():
+                stage[key] += value
+
+    def record_usage(self, name: str, model: str, usage: Dict):
+        """LLM 호출의 실제 토큰 사용량과 비용 기록"""
+        with self._lock:
+            stage = self._stage(name)
+            stage['prompt_tokens'] += usage.get('prompt_tokens', 0)
+            stage['completion_tokens'] += usage.get('completion_tokens', 0)
+            stage['cached_tokens'] += usage.get('cached_tokens', 0)
+            stage['cost_usd'] += estimate_cost(model, usage)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'pipeline': self.pipeline,
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'total_seconds': round(time.time() - self.started_at, 3),
+                'stages': {name: dict(stage) for name, stage in self.stages.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """node_exporter textfile collector 형식"""
+        data = self.to_dict()
+        label = f'pipeline="{self.pipeline}"'
+        lines = [
+            '# TYPE ai_trends_run_seconds gauge',
+            f'ai_trends_run_seconds{{{label}}} {data["total_seconds"]}',
+            '# TYPE ai_trends_run_timestamp_seconds gauge',
+            f'ai_trends_run_timestamp_seconds{{{label}}} {int(self.started_at)}',
+        ]
+        for metric in ('seconds', 'cost_usd') + COUNTERS:
+            lines.append(f'# TYPE ai_trends_stage_{metric} gauge')
+            for name, stage in data['stages'].items():
+                lines.append(f'ai_trends_stage_{metric}{{{label},stage="{name}"}} {stage[metric]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: str = METRICS_DIR) -> str:
+        """run_<pipeline>_<시각>.json 과 <pipeline>.prom 저장 → JSON 경로"""
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.fromtimestamp(self.started_at).strftime('%Y%m%d_%H%M%S')
+        json_path = os.path.join(directory, f"run_{self.pipeline}_{timestamp}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        # textfile collector가 쓰다 만 파일을 읽지 않도록 임시 파일 → 교체
+        prom_path = os.path.join(directory, f"{self.pipeline}.prom")
+        with open(f"{prom_path}.tmp", 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(f"{prom_path}.tmp", prom_path)
+        return json_path
+
+    def summary(self) -> str:
+        parts = []
+        for name, stage in self.stages.items():
+            part = f"{name} {stage['seconds']:.2f}s"
+            if stage['cost_usd']:
+                part += f" (${stage['cost_usd']:.4f})"
+            parts.append(part)
+        return ' | '.join(parts)
+
+
+_current: Optional[RunMetrics] = None
+
+
+def start_run(pipeline: str) -> RunMetrics:
+    """새 실행 지표를 시작하고 current()로 접근 가능하게 등록"""
+    global _current
+    _current = RunMetrics(pipeline)
+    return _current
+
+
+def current() -> RunMetrics:
+    """진행 중인 실행 지표 (start_run 전이면 기본 인스턴스)"""
+    global _current
+    if _current is None:
+        _current = RunMetrics('default')
+    return _current
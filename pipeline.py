@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import List, Dict, Callable, Optional
+
+from article import Article
+from article_extractor import ArticleExtractor
+from blog import ITTrendAnalyzer
+from dedup import dedupe_articles
+from editions import Edition
+from main import AITrendAnalyzer
+from metrics import current as current_metrics
+
+# 소스별 타임아웃 (초) - 늦은 소스는 버리고 나머지로 진행
+SOURCE_TIMEOUTS = {
+    'perplexity': 40,
+    'rss': 25,
+    'hn': 15,
+}
+MAX_CANDIDATES = 10               # 생성 프롬프트에 넣을 최대 기사 수
+
+
+def _perplexity_to_articles(items: List[Dict]) -> List[Article]:
+    """Perplexity 결과 {title, summary, implications, url} → 공통 기사 dict
+
+    Perplexity가 써 준 요약은 curated로 표시해 본문 추출/중복 병합에서 덮어쓰지 않고,
+    시사점은 implications 필드로 그대로 넘김.
+    """
+    now = datetime.now()
+    return [Article(
+        title=item.get('title', ''),
+        link=item.get('url', ''),
+        summary=item.get('summary', ''),
+        published=now,
+        source='Perplexity',
+        implications=item.get('implications', ''),
+        curated=bool(item.get('summary')),
+    ) for item in items]
+
+
+class UnifiedPipeline:
+    """Perplexity / RSS / HN (sources로 선택) 수집을 동시에 돌려 하나의 후보 풀로 합친 뒤 에디션별 포스트를 생성
+
+    전체 수집 시간은 소스 시간의 합이 아니라 가장 느린 소스(최대 타임아웃)로 제한되고,
+    수집은 한 번만 하므로 에디션(editions.EDITIONS)을 늘려도 생성 비용만 늘어남.
+    """
+
+    def __init__(self, timeouts: Dict[str, float] = None, sources: Optional[List[str]] = None):
+        self.timeouts = timeouts or SOURCE_TIMEOUTS
+        self.sources = sources or list(self.timeouts)    # 수집할 소스 (기본: 전체)
+        self.trend = AITrendAnalyzer()      # Perplexity 검색, 이력
+        self.feeds = ITTrendAnalyzer()      # RSS, HN 수집 및 필터
+        self.extractor = ArticleExtractor()
+        self.timings: Dict[str, float] = {}
+        self._prefetch: Dict[str, Future] = {}   # 스트리밍 중 미리 시작한 본문 추출 (URL별)
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        # 타임아웃 난 소스의 스레드는 collect가 끝난 뒤에도 돌 수 있으므로 풀 제출/종료를 잠금으로 묶음
+        self._prefetch_lock = threading.Lock()
+
+    async def _run_source(self, loop, executor, name: str, func: Callable[[], List[Dict]]) -> List[Dict]:
+        started = time.perf_counter()
+        try:
+            articles = await asyncio.wait_for(
+                loop.run_in_executor(executor, func), timeout=self.timeouts[name])
+            self.timings[name] = time.perf_counter() - started
+            print(f"  [{self.timings[name]:5.2f}s] {name} → {len(articles)}개")
+            return articles
+        except asyncio.TimeoutError:
+            print(f"  [timeout] {name} ({self.timeouts[name]}s 초과, 건너뜀)")
+        except Exception as e:
+            print(f"  [error] {name}: {e}")
+        return []
+
+    def _prefetch_article(self, item: Dict):
+        """Perplexity 스트림에서 뉴스가 도착하는 즉시 본문 추출 시작 (결과는 extractor 캐시에 남음)
+
+        요약이 있는 뉴스는 그 요약을 쓰므로 본문을 받지 않음.
+        """
+        url = item.get('url', '')
+        if not url or item.get('summary'):
+            return
+        with self._prefetch_lock:
+            # collect가 끝나 풀이 닫혔으면 (타임아웃 후 늦게 도착한 뉴스) 제출하지 않음
+            if url not in self._prefetch and self._prefetch_pool is not None:
+                self._prefetch[url] = self._prefetch_pool.submit(self.extractor.extract, url)
+
+    async def ingest(self) -> List[Dict]:
+        """선택한 소스를 동시에 수집해 하나의 리스트로 합침 (Perplexity → RSS → HN 순)
+
+        소스는 받은 기사만 돌려주고 이력(sqlite) 필터는 collect에서 호출한 스레드가 수행함
+        (타임아웃 난 소스의 스레드가 계속 돌아도 이력 연결을 건드리지 않게).
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=len(self.sources))
+        sources = {
+            'perplexity': lambda: _perplexity_to_articles(self.trend.search_news_with_perplexity(
+                on_item=self._prefetch_article, skip_covered=False)),
+            'rss': self.feeds.fetch_rss_feeds,
+            'hn': self.feeds.fetch_hacker_news,
+        }
+        sources = {name: func for name, func in sources.items() if name in self.sources}
+        try:
+            results = await asyncio.gather(*(
+                self._run_source(loop, executor, name, func) for name, func in sources.items()
+            ))
+        finally:
+            # 타임아웃 난 작업의 스레드는 기다리지 않음
+            executor.shutdown(wait=False)
+        return [article for articles in results for article in articles]
+
+    def collect(self, pool: Optional[List[Dict]] = None) -> List[Dict]:
+        """수집 → 중복/이력 제외 → 랭킹 → 본문 추출까지 마친 후보 기사
+
+        pool이 주어지면 (데몬이 미리 모아 둔 기사) 소스를 호출하지 않고 필터부터 진행.
+        """
+        run_metrics = current_metrics()
+        started = time.perf_counter()
+        with self._prefetch_lock:
+            self._prefetch = {}
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=self.extractor.max_workers)
+        try:
+            with run_metrics.stage('fetch'):
+                pool = asyncio.run(self.ingest()) if pool is None else pool
+            print(f"📥 수집 완료: {len(pool)}개, {time.perf_counter() - started:.2f}s")
+
+            with run_metrics.stage('filter'):
+                candidates = dedupe_articles(pool)
+                candidates = self.trend.history.filter_new(candidates)
+                candidates = self.feeds.filter_recent_articles(candidates, top_n=MAX_CANDIDATES)
+            run_metrics.count('filter', items_in=len(pool), items_out=len(candidates))
+            if not candidates:
+                return []
+
+            with run_metrics.stage('extract'):
+                # 스트리밍 중 이미 시작한 추출은 끝나길 기다렸다가 캐시로 재사용
+                with self._prefetch_lock:
+                    started_urls = dict(self._prefetch)
+                wait([started_urls[a['link']] for a in candidates if a.get('link') in started_urls])
+                return self.extractor.enrich(candidates)
+        finally:
+            # 후보에서 빠진 기사의 미리 받기는 기다리지 않음
+            with self._prefetch_lock:
+                for future in self._prefetch.values():
+                    future.cancel()
+                self._prefetch_pool.shutdown(wait=False)
+                self._prefetch_pool = None
+
+    def run(self, editions: Optional[List[Edition]] = None) -> int:
+        """이 파이프라인으로 수집해 에디션 전체를 생성/발송 (python cli.py run 과 같음)"""
+        from cli import run_preset
+        print("🚀 통합 파이프라인 시작!")
+        return run_preset('all', [e.name for e in editions] if editions is not None else None,
+                          collector=self)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(UnifiedPipeline().run())
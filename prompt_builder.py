@@ -0,0 +1,118 @@
+import html
+import json
+import os
+import re
+from functools import lru_cache
+from typing import List, Dict, Sequence, Tuple
+
+# 프롬프트 입력 토큰 예산 (프롬프트 본문 + 기사 데이터)
+PROMPT_INPUT_BUDGET = int(os.getenv('PROMPT_INPUT_BUDGET', '3000'))
+SUMMARY_MAX_TOKENS = 120          # 기사 하나의 요약에 쓸 최대 토큰
+FALLBACK_ENCODING = 'cl100k_base'
+
+_TAG = re.compile(r'<[^>]+>')
+_SPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """모델의 tiktoken 인코딩 (tiktoken이 없거나 인코딩을 못 받으면 None)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """로컬 토크나이저로 토큰 수 계산 (사용 불가 시 보수적으로 추정)"""
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # 영문은 약 4자당 1토큰, 한글 등 비ASCII는 글자당 약 1토큰
+    ascii_chars = sum(1 for c in text if c < '\x80')
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str) -> str:
+    """토큰 수가 max_tokens를 넘지 않도록 뒤를 자름"""
+    encoding = _encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens]).rstrip() + '…'
+    while text and count_tokens(text, model) > max_tokens:
+        text = text[:int(len(text) * 0.8)]
+    return text
+
+
+def clean_text(text: str) -> str:
+    """RSS 요약의 HTML 태그/엔티티/연속 공백 제거"""
+    return _SPACE.sub(' ', html.unescape(_TAG.sub(' ', text or ''))).strip()
+
+
+def _compact_json(item: Dict) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+
+
+def pack_items(items: List[Dict], template_tokens: int, model: str,
+               essential: Sequence[str] = ('title', 'source', 'url'),
+               extra: Sequence[str] = ('summary', 'implications'),
+               budget: int = PROMPT_INPUT_BUDGET) -> List[Dict]:
+    """우선순위 순 기사 목록을 입력 예산 안에 최대한 채움
+
+    1차: 필수 필드(제목 등)만으로 가능한 많은 기사를 담고,
+    2차: 남은 예산으로 앞쪽 기사부터 요약 등 부가 필드를 잘라 넣음.
+    빈 필드는 빼서 직렬화하므로 공백/키 낭비가 없음.
+    """
+    remaining = budget - template_tokens
+    packed: List[Dict] = []
+    for item in items:
+        entry = {k: item[k] for k in essential if item.get(k)}
+        cost = count_tokens(_compact_json(entry), model) + 1
+        if cost > remaining:
+            break
+        packed.append(entry)
+        remaining -= cost
+
+    for entry, item in zip(packed, items):
+        for key in extra:
+            value = clean_text(item.get(key, ''))
+            if not value:
+                continue
+            value = truncate_tokens(value, min(SUMMARY_MAX_TOKENS, remaining), model)
+            before = count_tokens(_compact_json(entry), model)
+            entry[key] = value
+            cost = count_tokens(_compact_json(entry), model) - before
+            if cost > remaining:
+                del entry[key]
+                continue
+            remaining -= cost
+    return packed
+
+
+def serialize_items(packed: List[Dict]) -> str:
+    """한 줄에 기사 하나씩 압축 JSON으로 직렬화"""
+    return '[\n' + ',\n'.join(_compact_json(entry) for entry in packed) + '\n]'
+
+
+def build_prompt(template: str, items: List[Dict], model: str, system: str = '',
+                 **pack_options) -> Tuple[str, List[Dict], int]:
+    """template의 {items} 자리에 예산에 맞춰 압축한 기사 목록을 넣음
+
+    → (완성된 프롬프트, 실제 포함된 기사, system 포함 입력 토큰 수)
+    """
+    template_tokens = count_tokens(system + template.replace('{items}', ''), model)
+    packed = pack_items(items, template_tokens, model, **pack_options)
+    prompt = template.replace('{items}', serialize_items(packed))
+    return prompt, packed, count_tokens(system + prompt, model)
@@ -0,0 +1,122 @@
+import math
+import re
+from datetime import datetime
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from article import normalize_published
+
+# 점수 가중치
+WEIGHTS = {
+    'recency': 0.35,
+    'hn_score': 0.2,
+    'hn_comments': 0.1,
+    'source': 0.15,
+    'keywords': 0.2,
+}
+RECENCY_HALF_LIFE_HOURS = 12      # 이 시간마다 최신성 점수가 절반으로
+HN_SCORE_SCALE = 500              # 이 점수 이상이면 HN 점수 만점
+HN_COMMENTS_SCALE = 300
+KEYWORD_SATURATION = 3            # 키워드가 이만큼 맞으면 관련성 만점
+
+# 소스별 가중치 (없는 소스는 DEFAULT_SOURCE_WEIGHT)
+SOURCE_WEIGHTS = {
+    'Perplexity': 1.0,
+    'Hacker News': 0.9,
+    'TechCrunch': 0.9,
+    'Ars Technica': 0.8,
+    'The Verge': 0.7,
+    'WIRED': 0.6,
+}
+DEFAULT_SOURCE_WEIGHT = 0.5
+
+# AI/스타트업 관련 키워드
+KEYWORDS = [
+    'ai', 'llm', 'gpt', 'openai', 'anthropic', 'claude', 'gemini', 'model', 'agent',
+    'startup', 'funding', 'raises', 'series a', 'series b', 'seed', 'launch',
+    'open source', 'open-source', 'api', 'developer', 'sdk', 'inference', 'gpu',
+    '인공지능', '스타트업', '투자', '오픈소스', '개발자',
+]
+_KEYWORD_RE = re.compile(
+    '|'.join(rf'\b{re.escape(k)}\b' if k.isascii() else re.escape(k) for k in KEYWORDS),
+    re.IGNORECASE)
+
+
+def to_datetime(published) -> Optional[datetime]:
+    """기사의 발행일 → datetime (Article은 수집 때 이미 정규화되어 그대로 반환)"""
+    return normalize_published(published)
+
+
+def score_articles(articles: List[Dict], now: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+    """기사 목록의 항목별 점수를 NumPy 배열로 계산 (age가 NaN이면 날짜 없음)"""
+    now = now or datetime.now()
+    n = len(articles)
+
+    # 원시 값만 한 번씩 꺼내고, 점수 계산은 모두 벡터 연산
+    published = [to_datetime(a.get('published')) for a in articles]
+    age_hours = np.array([(now - p).total_seconds() / 3600 if p else np.nan for p in published])
+    hn_score = np.fromiter((a.get('score') or 0 for a in articles), dtype=float, count=n)
+    hn_comments = np.fromiter((a.get('comments') or 0 for a in articles), dtype=float, count=n)
+    source_weight = np.fromiter(
+        (SOURCE_WEIGHTS.get(a.get('source', ''), DEFAULT_SOURCE_WEIGHT) for a in articles),
+        dtype=float, count=n)
+
+    # 키워드: 전체 텍스트를 한 번에 검색한 뒤 매칭 위치를 기사 번호로 환산해 집계
+    texts = [f"{a.get('title', '')} {a.get('summary', '')[:500]}" for a in articles]
+    ends = np.cumsum([len(t) + 1 for t in texts])
+    starts = np.fromiter((m.start() for m in _KEYWORD_RE.finditer('\n'.join(texts))), dtype=np.int64)
+    keyword_hits = np.bincount(np.searchsorted(ends, starts, side='right'), minlength=n)[:n]
+
+    parts = {
+        'recency': np.exp2(-np.clip(np.nan_to_num(age_hours, nan=np.inf), 0, None)
+                           / RECENCY_HALF_LIFE_HOURS),
+        'hn_score': np.minimum(np.log1p(hn_score) / math.log1p(HN_SCORE_SCALE), 1.0),
+        'hn_comments': np.minimum(np.log1p(hn_comments) / math.log1p(HN_COMMENTS_SCALE), 1.0),
+        'source': source_weight,
+        'keywords': np.minimum(keyword_hits / KEYWORD_SATURATION, 1.0),
+    }
+    total = sum(WEIGHTS[name] * values for name, values in parts.items())
+    return {'total': total, 'age_hours': age_hours, **parts}
+
+
+def top_k(scores: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """점수 상위 k개 인덱스 (높은 순). argpartition으로 O(n) 선택 후 k개만 정렬"""
+    candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(scores))
+    if len(candidates) > k:
+        part = np.argpartition(-scores[candidates], k - 1)[:k]
+        candidates = candidates[part]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def rank_articles(articles: List[Dict], k: int = 10,
+                  max_age_hours: Optional[float] = None,
+                  now: Optional[datetime] = None) -> List[Dict]:
+    """기사를 점수순으로 상위 k개 선택. 결과 기사에는 rank_score / rank_breakdown을 붙임
+
+    max_age_hours가 주어지면 발행일이 없거나 그보다 오래된 기사는 제외.
+    """
+    if not articles:
+        return []
+    scores = score_articles(articles, now)
+    mask = None
+    if max_age_hours is not None:
+        age = scores['age_hours']
+        mask = ~np.isnan(age) & (age < max_age_hours)
+
+    ranked = []
+    for idx in top_k(scores['total'], k, mask):
+        article = articles[idx].copy()
+        article['rank_score'] = round(float(scores['total'][idx]), 4)
+        article['rank_breakdown'] = {
+            name: round(float(scores[name][idx]), 3) for name in WEIGHTS
+        }
+        ranked.append(article)
+    return ranked
+
+
+def print_ranking(ranked: List[Dict]):
+    """점수 확인용 출력"""
+    for i, article in enumerate(ranked, 1):
+        parts = ' '.join(f"{k}={v}" for k, v in article['rank_breakdown'].items())
+        print(f"  {i:2d}. [{article['rank_score']:.3f}] {article['title'][:60]} ({article.get('source', '')}) {parts}")
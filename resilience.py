@@ -0,0 +1,246 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from metrics import current as current_metrics
+
+T = TypeVar('T')
+
+# 재시도 (지수 백오프 + full jitter)
+RETRY_ATTEMPTS = 3                # 최초 시도 포함 최대 시도 횟수
+RETRY_BASE_DELAY = 0.5            # 첫 재시도 대기 상한 (초), 시도마다 2배
+RETRY_MAX_DELAY = 8.0             # 재시도 대기 최대값 (초)
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# 서킷 브레이커 (엔드포인트별)
+BREAKER_FAILURE_THRESHOLD = 5     # 연속 실패가 이만큼이면 차단
+BREAKER_RESET_TIMEOUT = 60        # 차단 후 이 시간(초)이 지나면 시험 호출 하나만 허용
+
+# hedged 요청: 응답이 지연 백분위를 넘으면 같은 요청을 하나 더 보내 먼저 온 응답 사용
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 10            # 이보다 표본이 적으면 HEDGE_DEFAULT_DELAY 사용
+HEDGE_DEFAULT_DELAY = 1.0         # 초
+HEDGE_MAX_WORKERS = 32
+LATENCY_WINDOW = 200              # 백분위 계산에 쓸 최근 응답 시간 수
+
+
+class CircuitOpenError(RuntimeError):
+    """차단된 엔드포인트 호출"""
+
+
+def is_retryable(exc: Exception) -> bool:
+    """일시적 장애(타임아웃, 연결 오류, 429/5xx)인지 판단"""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status = getattr(exc, 'status_code', None)
+    response = getattr(exc, 'response', None)
+    if status is None and response is not None:
+        status = getattr(response, 'status_code', None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # requests / httpx / openai의 타임아웃, 연결 오류는 상태 코드가 없음
+    name = type(exc).__name__
+    return isinstance(exc, (TimeoutError, ConnectionError)) or 'Timeout' in name or 'Connection' in name
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY,
+                  max_delay: float = RETRY_MAX_DELAY) -> float:
+    """attempt번째 재시도 전 대기 시간: [0, min(max, base * 2^attempt)] 균등 분포"""
+    return random.uniform(0, min(max_delay, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """closed → (연속 실패) → open → (reset_timeout 경과) → half_open → 시험 호출 성공 시 closed
+
+    half_open에서는 시험 호출 하나만 통과시키고, 결과가 나올 때까지 다른 호출은 open처럼 거절.
+    시험 호출이 실패하면 다시 open.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False              # half_open 시험 호출이 진행 중인지
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (half_open이면 처음 물어본 호출 하나만 시험 호출로 허용)"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'open' or self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def release(self):
+        """시험 호출이 브레이커와 무관한 오류(4xx 등)로 끝남 - 다음 호출이 다시 시험하도록 양보"""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                print(f"  [breaker] {self.name} 복구")
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                if self.opened_at is None:
+                    print(f"  [breaker] {self.name} 차단 ({self.failures}회 연속 실패, {self.reset_timeout}s)")
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class LatencyTracker:
+    """최근 응답 시간으로 hedge 기준 지연(백분위)을 계산"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def hedge_delay(self) -> float:
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return self.percentile(HEDGE_PERCENTILE)
+
+
+class Endpoint:
+    """엔드포인트별 브레이커, 지연 기록, 통계"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker(name)
+        self.latency = LatencyTracker()
+        self.stats = {'calls': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0, 'failures': 0}
+        self._lock = threading.Lock()
+
+    def bump(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+
+_endpoints: Dict[str, Endpoint] = {}
+_endpoints_lock = threading.Lock()
+_hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix='hedge')
+
+
+def endpoint(name: str) -> Endpoint:
+    with _endpoints_lock:
+        if name not in _endpoints:
+            _endpoints[name] = Endpoint(name)
+        return _endpoints[name]
+
+
+def _hedged(ep: Endpoint, func: Callable[[], T]) -> T:
+    """첫 요청이 hedge 지연 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 성공한 결과 사용"""
+    primary = _hedge_executor.submit(func)
+    done, _ = wait([primary], timeout=ep.latency.hedge_delay())
+    if done:
+        return primary.result()
+
+    ep.bump('hedges')
+    backup = _hedge_executor.submit(func)
+    pending = {primary, backup}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is backup:
+                    ep.bump('hedge_wins')
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+def call(name: str, func: Callable[[], T], attempts: int = RETRY_ATTEMPTS,
+         hedge: bool = False, stage: str = 'fetch') -> T:
+    """엔드포인트 name으로 func 호출: 브레이커 확인 → (hedge) 호출 → 일시적 장애면 백오프 후 재시도
+
+    재시도 횟수는 metrics의 stage 단계 retries에 더함.
+    hedge=True는 같은 요청을 두 번 보내도 되는(멱등) 호출에만 사용.
+    """
+    ep = endpoint(name)
+    for attempt in range(attempts):
+        if not ep.breaker.allow():
+            raise CircuitOpenError(f"{name} 차단 중 (최근 {ep.breaker.failures}회 연속 실패)")
+        ep.bump('calls')
+        started = time.perf_counter()
+        try:
+            result = _hedged(ep, func) if hedge else func()
+        except Exception as e:
+            retryable = is_retryable(e)
+            if retryable:
+                ep.breaker.record_failure()
+            else:
+                ep.breaker.release()
+            # 재시도할 수 없거나 마지막 시도이거나 방금 차단됐으면 바로 실패
+            if not retryable or attempt == attempts - 1 or ep.breaker.state == 'open':
+                ep.bump('failures')
+                raise
+            delay = backoff_delay(attempt)
+            ep.bump('retries')
+            current_metrics().count(stage, retries=1)
+            print(f"  [retry] {name} {attempt + 1}/{attempts - 1} ({delay:.2f}s 후): {e}")
+            time.sleep(delay)
+            continue
+        ep.breaker.record_success()
+        ep.latency.add(time.perf_counter() - started)
+        return result
+    raise RuntimeError('unreachable')
+
+
+def call_with_fallback(candidates: List[Tuple[str, Callable[[], T]]],
+                       **call_options) -> Tuple[T, str]:
+    """후보(엔드포인트 이름, 호출)를 순서대로 시도해 처음 성공한 결과 → (결과, 사용한 이름)
+
+    각 후보는 call()의 재시도/브레이커를 거치며, 모두 실패하면 마지막 오류를 다시 발생.
+    """
+    error: Optional[Exception] = None
+    for i, (name, func) in enumerate(candidates):
+        try:
+            result = call(name, func, **call_options)
+        except Exception as e:
+            error = e
+            if i < len(candidates) - 1:
+                print(f"  [fallback] {name} 실패 → {candidates[i + 1][0]} 사용: {e}")
+            continue
+        return result, name
+    raise error
+
+
+def summary() -> Dict[str, Dict]:
+    """엔드포인트별 호출/재시도/hedge/실패 통계와 브레이커 상태"""
+    with _endpoints_lock:
+        return {name: {**ep.stats, 'breaker': ep.breaker.state} for name, ep in _endpoints.items()}
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Union
+
+from article import json_default
+from dedup import canonicalize_url
+from metrics import estimate_cost
+
+# 실행 기록 보관소 설정
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', os.path.join('data', 'archive'))
+ARCHIVE_COMPRESS_LEVEL = 9        # 한 번 쓰고 가끔 읽으므로 압축률 우선
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    day TEXT NOT NULL,              -- YYYY-MM-DD
+    month TEXT NOT NULL,            -- YYYY-MM
+    pipeline TEXT NOT NULL,
+    edition TEXT NOT NULL,
+    model TEXT,
+    post_id INTEGER,                -- outbox 포스트 번호 (발송한 경우)
+    cached INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    post_chars INTEGER NOT NULL DEFAULT 0,
+    items_blob TEXT,                -- 입력 뉴스 (JSON)
+    prompt_blob TEXT,               -- 요청 messages (JSON)
+    post_blob TEXT,                 -- 생성된 마크다운
+    html_blob TEXT                  -- 발송한 HTML
+);
+CREATE INDEX IF NOT EXISTS idx_runs_day ON runs(day);
+CREATE INDEX IF NOT EXISTS idx_runs_month ON runs(month);
+CREATE TABLE IF NOT EXISTS run_sources (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    url TEXT,                       -- canonicalize_url 적용
+    source TEXT,
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_run_sources_url ON run_sources(url);
+CREATE INDEX IF NOT EXISTS idx_run_sources_source ON run_sources(source);
+CREATE INDEX IF NOT EXISTS idx_run_sources_run ON run_sources(run_id);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+BLOB_FIELDS = ('items', 'prompt', 'post', 'html')
+
+
+class RunArchive:
+    """실행마다 입력 뉴스/프롬프트/포스트/HTML/사용량을 보관하는 저장소
+
+    본문은 SHA-256 이름의 zlib 압축 파일(blobs/ab/abcd...)로 한 번만 저장하고,
+    날짜/에디션/출처 URL/토큰 비용은 SQLite 인덱스에 두어 파일을 열지 않고 조회함.
+    """
+
+    def __init__(self, directory: str = ARCHIVE_DIR):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, 'blobs')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.db'))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(_SCHEMA)
+
+    # -----------------------------
+    # blob
+    # -----------------------------
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.z")
+
+    def put_blob(self, data: Union[str, bytes]) -> str:
+        """내용을 압축 저장 → SHA-256 (같은 내용은 다시 쓰지 않음)"""
+        raw = data.encode('utf-8') if isinstance(data, str) else data
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            packed = zlib.compress(raw, ARCHIVE_COMPRESS_LEVEL)
+            # 같은 내용을 여러 스레드가 동시에 써도 섞이지 않도록 임시 파일 이름을 분리
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(packed)
+            os.replace(tmp_path, path)
+            with self.conn:
+                self.conn.execute('INSERT OR IGNORE INTO blobs (hash, size, stored_size, created_at) '
+                                  'VALUES (?, ?, ?, ?)', (digest, len(raw), len(packed), time.time()))
+        return digest
+
+    def get_blob(self, digest: str) -> str:
+        with open(self._blob_path(digest), 'rb') as f:
+            return zlib.decompress(f.read()).decode('utf-8')
+
+    # -----------------------------
+    # 기록
+    # -----------------------------
+    def add_run(self, pipeline: str, edition: str, post: Dict, html: str = '',
+                post_id: Optional[int] = None, created_at: Optional[float] = None) -> int:
+        """Edition.generate 결과(post)와 발송 HTML 기록 → run id"""
+        created_at = created_at or time.time()
+        when = datetime.fromtimestamp(created_at)
+        items = post.get('used', [])
+        usage = post.get('usage', {})
+        model = post.get('model', '')
+        cached = bool(post.get('cached'))
+        blobs = {
+            'items': self.put_blob(json.dumps(items, ensure_ascii=False, default=json_default)),
+            'prompt': self.put_blob(json.dumps(post.get('request', {}).get('messages', []),
+                                               ensure_ascii=False)),
+            'post': self.put_blob(post.get('content', '')),
+            'html': self.put_blob(html) if html else None,
+        }
+        with self.conn:
+            cur = self.conn.execute(
+                'INSERT INTO runs (created_at, day, month, pipeline, edition, model, post_id, cached, '
+                'prompt_tokens, completion_tokens, cached_tokens, cost_usd, post_chars, '
+                'items_blob, prompt_blob, post_blob, html_blob) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (created_at, when.strftime('%Y-%m-%d'), when.strftime('%Y-%m'), pipeline, edition,
+                 model, post_id, int(cached),
+                 usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0),
+                 usage.get('cached_tokens', 0),
+                 # 캐시된 응답은 이번 실행에서 쓴 비용이 없음
+                 0.0 if cached else round(estimate_cost(model, usage), 6),
+                 len(post.get('content', '')),
+                 blobs['items'], blobs['prompt'], blobs['post'], blobs['html']))
+            self.conn.executemany(
+                'INSERT INTO run_sources (run_id, url, source, title) VALUES (?, ?, ?, ?)',
+                [(cur.lastrowid, canonicalize_url(item.get('url') or item.get('link', '')) or None,
+                  item.get('source', ''), item.get('title', '')) for item in items])
+        return cur.lastrowid
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def get_run(self, run_id: int, fields: Sequence[str] = BLOB_FIELDS) -> Optional[Dict]:
+        """실행 메타데이터 + 요청한 본문(fields)"""
+        row = self.conn.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone()
+        if row is None:
+            return None
+        run = dict(row)
+        for field in fields:
+            digest = run.get(f'{field}_blob')
+            value = self.get_blob(digest) if digest else ''
+            run[field] = json.loads(value) if field in ('items', 'prompt') and value else value
+        return run
+
+    def runs_mentioning(self, url: str) -> List[Dict]:
+        """해당 URL을 입력으로 쓴 실행 (최신순)"""
+        rows = self.conn.execute(
+            'SELECT r.id, r.day, r.pipeline, r.edition, r.model, r.post_id, s.title '
+            'FROM run_sources s JOIN runs r ON r.id = s.run_id '
+            'WHERE s.url = ? ORDER BY r.created_at DESC', (canonicalize_url(url),))
+        return [dict(row) for row in rows]
+
+    def runs_between(self, start: str, end: str) -> List[Dict]:
+        """day가 [start, end] (YYYY-MM-DD) 사이인 실행"""
+        rows = self.conn.execute(
+            'SELECT id, day, pipeline, edition, model, post_id, prompt_tokens, completion_tokens, '
+            'cost_usd FROM runs WHERE day BETWEEN ? AND ? ORDER BY created_at', (start, end))
+        return [dict(row) for row in rows]
+
+    def spend_by_month(self) -> List[Dict]:
+        """월별 실행 수, 토큰, 비용"""
+        rows = self.conn.execute(
+            'SELECT month, COUNT(*) AS runs, SUM(prompt_tokens) AS prompt_tokens, '
+            'SUM(completion_tokens) AS completion_tokens, SUM(cached_tokens) AS cached_tokens, '
+            'ROUND(SUM(cost_usd), 4) AS cost_usd FROM runs GROUP BY month ORDER BY month')
+        return [dict(row) for row in rows]
+
+    def top_sources(self, limit: int = 20) -> List[Dict]:
+        """입력으로 많이 쓰인 출처"""
+        rows = self.conn.execute(
+            'SELECT source, COUNT(*) AS items, COUNT(DISTINCT run_id) AS runs FROM run_sources '
+            'GROUP BY source ORDER BY items DESC LIMIT ?', (limit,))
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict:
+        runs = self.conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+        blobs, size, stored = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs').fetchone()
+        return {'runs': runs, 'blobs': blobs, 'bytes': size, 'stored_bytes': stored,
+                'ratio': round(stored / size, 3) if size else 0.0}
+
+    def close(self):
+        self.conn.close()
+
+
+def archive_post(pipeline: str, edition: str, post: Dict, html: str = '',
+                 post_id: Optional[int] = None) -> Optional[int]:
+    """실행 하나 보관 (보관 실패가 발송 흐름을 막지 않도록 오류는 출력만) → run id"""
+    try:
+        archive = RunArchive()
+        try:
+            return archive.add_run(pipeline, edition, post, html, post_id)
+        finally:
+            archive.close()
+    except Exception as e:
+        print(f"실행 기록 보관 실패: {e}")
+        return None
@@ -0,0 +1,43 @@
+from contextlib import contextmanager
+
+import pytest
+
+import resilience
+from benchmarks.replay import FixtureStore, replay
+from benchmarks.stub_server import StubServer
+
+
+class StubHarness:
+    """테스트에서 응답을 직접 등록하고 stub 서버로 재생 (모든 requests/httpx 요청이 stub으로 감)"""
+
+    def __init__(self, path: str):
+        self.fixtures = FixtureStore(path)
+
+    def add(self, method: str, url: str, content, status: int = 200, headers=None, request_body=None):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        self.fixtures.add(method, url, request_body, status, headers or {}, content)
+
+    @contextmanager
+    def serve(self, **options):
+        self.fixtures.save()
+        with StubServer(self.fixtures.path, **options) as server, replay(server.url):
+            yield server
+
+
+@pytest.fixture
+def stub(tmp_path):
+    return StubHarness(str(tmp_path / 'fixtures'))
+
+
+@pytest.fixture(autouse=True)
+def fresh_endpoints():
+    """엔드포인트별 브레이커/통계는 모듈 전역이므로 테스트마다 비움"""
+    resilience._endpoints.clear()
+    yield
+    resilience._endpoints.clear()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, 'backoff_delay', lambda attempt: 0.0)
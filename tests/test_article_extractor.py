@@ -0,0 +1,27 @@
+from article_extractor import ArticleExtractor
+
+PARAGRAPH = '한국어 본문 문단입니다. 인공지능 스타트업이 새로운 모델을 공개했고 개발자들의 반응이 뜨겁습니다.'
+
+
+def page(charset: str) -> str:
+    return (f'<html><head><meta charset="{charset}"><title>t</title></head>'
+            f'<body><article><p>{PARAGRAPH}</p></article></body></html>')
+
+
+def test_meta_charset_used_when_header_has_none(stub, tmp_path):
+    stub.add('GET', 'https://news.example/utf8', page('utf-8').encode('utf-8'),
+             headers={'Content-Type': 'text/html'})
+    stub.add('GET', 'https://news.example/euckr', page('euc-kr').encode('euc-kr'),
+             headers={'Content-Type': 'text/html'})
+    extractor = ArticleExtractor(cache_path=str(tmp_path / 'articles.json'))
+    with stub.serve():
+        assert extractor.extract('https://news.example/utf8')['text'] == PARAGRAPH
+        assert extractor.extract('https://news.example/euckr')['text'] == PARAGRAPH
+
+
+def test_header_charset_wins(stub, tmp_path):
+    stub.add('GET', 'https://news.example/declared', page('utf-8').encode('euc-kr'),
+             headers={'Content-Type': 'text/html; charset=EUC-KR'})
+    extractor = ArticleExtractor(cache_path=str(tmp_path / 'articles.json'))
+    with stub.serve():
+        assert extractor.extract('https://news.example/declared')['text'] == PARAGRAPH
@@ -0,0 +1,18 @@
+from benchmarks.bench_pipeline import REPLAY_ENV, compare, run_benchmarks
+
+
+def test_pipelines_replay_offline_from_committed_fixtures(monkeypatch):
+    for key, value in REPLAY_ENV.items():
+        monkeypatch.setenv(key, value)
+    results = run_benchmarks(['trend', 'blog', 'unified'], repeat=1)
+    # 세 프리셋 모두 cli.run_stages를 거치므로 단계 이름이 같음
+    assert {'fetch', 'filter', 'extract', 'generate:trend', 'publish', 'send'} <= set(results['trend'])
+    assert {'fetch', 'filter', 'extract', 'generate:report', 'publish', 'send'} <= set(results['blog'])
+    assert {'fetch', 'filter', 'extract', 'generate:trend', 'generate:report', 'publish', 'send'} \
+        <= set(results['unified'])
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {'blog': {'fetch': 0.10, 'render': 0.001}}
+    results = {'blog': {'fetch': 0.40, 'render': 0.004}}
+    assert compare(results, baseline) == ['blog.fetch: 0.100s → 0.400s (+300%)']
@@ -0,0 +1,26 @@
+from article import Article
+from dedup import canonicalize_url, dedupe_articles
+
+
+def test_merge_keeps_both_sources():
+    hn = Article(title='OpenAI releases new agent SDK', link='https://techcrunch.com/2025/agent-sdk',
+                 summary='Points: 120', source='Hacker News', score=120)
+    tc = Article(title='OpenAI releases new agent SDK', link='https://techcrunch.com/2025/agent-sdk/?utm_source=rss',
+                 summary='OpenAI released an SDK for building agents.', source='TechCrunch')
+    [merged] = dedupe_articles([hn, tc])
+    assert merged['sources'] == ['Hacker News', 'TechCrunch']
+    assert merged['source'] == 'TechCrunch'
+    assert merged['summary'] == tc['summary']
+    assert merged['score'] == 120
+
+
+def test_merge_does_not_mutate_input_sources():
+    first = Article(title='Same story', link='https://a.example/x', source='A', sources=['A'])
+    second = Article(title='Same story', link='https://a.example/x', source='B')
+    dedupe_articles([first, second])
+    assert first['sources'] == ['A']
+
+
+def test_canonicalize_keeps_content_params():
+    assert canonicalize_url('http://www.site.example/read/?source=42&ref=abc&utm_medium=rss&fbclid=x') == \
+        'https://site.example/read?ref=abc&source=42'
@@ -0,0 +1,25 @@
+from editions import EDITIONS, covered_articles
+
+ARTICLES = [{'title': f'뉴스 {i}', 'link': f'https://news.example/{i}'} for i in range(4)]
+
+
+def test_covered_articles_ignores_editions_that_reached_nobody():
+    results = {
+        'trend': {'used': ARTICLES[:3], 'delivery': {'post_id': 1, 'sent': 0, 'failed': 2, 'retried': 0}},
+        'report': {'used': ARTICLES[:1], 'delivery': {'post_id': 2, 'sent': 1, 'failed': 1, 'retried': 0}},
+    }
+    assert [a['title'] for a in covered_articles(ARTICLES, results)] == ['뉴스 0']
+
+
+def test_covered_articles_without_send_marks_nothing():
+    # 렌더링까지만 했거나 에디션이 실패한 경우
+    results = {'trend': {'used': ARTICLES[:3]}, 'report': {'error': 'boom', 'used': []}}
+    assert covered_articles(ARTICLES, results) == []
+
+
+def test_trend_page_has_one_h1():
+    edition = EDITIONS['trend']
+    titled = edition.render('# AI가 책 읽고 공부했는데… 법원은 OK했대?\n\n## 무슨 일\n본문')
+    assert titled.count('<h1') == 1 and 'AI가 책 읽고' in titled
+    untitled = edition.render('## 무슨 일\n본문')
+    assert untitled.count('<h1') == 1 and edition.heading in untitled
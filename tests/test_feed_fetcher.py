@@ -0,0 +1,52 @@
+from feed_cache import FeedCache
+from feed_fetcher import fetch_feed, load_feed_list
+
+
+def test_feed_list_keeps_url_fragments(tmp_path):
+    path = tmp_path / 'feeds.txt'
+    path.write_text('# 주석 줄\n'
+                    'https://x.example/feed#atom\n'
+                    'https://y.example/rss  # 뒤에 붙은 주석\n'
+                    '\n'
+                    'https://y.example/rss\n', encoding='utf-8')
+    assert load_feed_list(str(path)) == ['https://x.example/feed#atom', 'https://y.example/rss']
+
+
+FEED_URL = 'https://feed.example/rss'
+RSS = ("<?xml version='1.0'?><rss><channel><title>Feed</title>"
+       "<item><title>새 기사</title><link>https://feed.example/1</link>"
+       "<pubDate>Mon, 02 Jun 2025 09:00:00 +0000</pubDate></item></channel></rss>")
+
+
+def test_304_without_cached_body_refetches_unconditionally(stub, tmp_path):
+    stub.add('GET', FEED_URL, b'', status=304)
+    stub.add('GET', FEED_URL, RSS, headers={'content-type': 'application/rss+xml', 'etag': '"v2"'})
+    cache = FeedCache(str(tmp_path / 'feeds.json'), max_age=0)
+    cache.store(FEED_URL, '"v1"', None, [])
+    original = cache.conditional_headers
+
+    def headers_then_evicted(url):
+        # 검증자를 보낸 직후 다른 실행의 정리로 항목이 사라진 상황
+        headers = original(url)
+        cache._entries.pop(url)
+        return headers
+
+    cache.conditional_headers = headers_then_evicted
+    with stub.serve() as server:
+        articles, _ = fetch_feed(FEED_URL, cache=cache, stream=True)
+    assert [a['title'] for a in articles] == ['새 기사']
+    assert server.stats['served'] == 2
+
+
+def test_save_keeps_entries_read_this_run(tmp_path):
+    path = str(tmp_path / 'feeds.json')
+    cache = FeedCache(path, ttl=float('inf'))
+    for url in ('https://a.example/rss', 'https://b.example/rss'):
+        cache.store(url, '"e"', None, [])
+        cache._entries[url]['validated_at'] = 0     # TTL 지난 항목
+    cache.save()
+
+    cache = FeedCache(path, ttl=60)
+    cache.conditional_headers('https://a.example/rss')   # 이번 실행에서 검증자를 보냄
+    cache.save()
+    assert list(FeedCache(path)._entries) == ['https://a.example/rss']
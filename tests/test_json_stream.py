@@ -0,0 +1,58 @@
+from json_stream import JSONArrayStreamParser, parse_json_objects
+
+REQUIRED = ('title', 'url')
+
+
+def feed_in_chunks(text: str, size: int) -> JSONArrayStreamParser:
+    parser = JSONArrayStreamParser(REQUIRED)
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+    parser.close()
+    return parser
+
+
+def test_leading_prose_with_brackets():
+    text = ("Here are today's top 5 news [as of today]:\n```json\n"
+            '[{"title": "A", "url": "https://a"}, {"title": "B", "url": "https://b"}]\n```')
+    assert [item['title'] for item in parse_json_objects(text, REQUIRED)] == ['A', 'B']
+
+
+def test_citations_between_objects():
+    text = ('[{"title": "A", "url": "https://a"} [1], [2][3]\n'
+            '{"title": "B", "url": "https://b"}]\nSources: [1] https://x')
+    parser = feed_in_chunks(text, 1)
+    assert [item['title'] for item in parser.items] == ['A', 'B']
+    assert parser.done and parser.skipped == 0
+
+
+def test_array_start_split_across_chunks():
+    text = 'Top news [today]: [\n  {"title": "A", "url": "https://a"}]'
+    for size in (1, 3, 7):
+        assert [item['title'] for item in feed_in_chunks(text, size).items] == ['A']
+
+
+def test_brackets_and_braces_inside_strings():
+    text = '[{"title": "C# [beta] {x}", "url": "https://a", "summary": "\\"]\\""}]'
+    assert parse_json_objects(text, REQUIRED)[0]['title'] == 'C# [beta] {x}'
+
+
+def test_cut_off_tail():
+    text = '[{"title": "A", "url": "https://a"}, {"title": "B", "url": "https://b"}, {"title": "C", "ur'
+    parser = feed_in_chunks(text, 5)
+    assert [item['title'] for item in parser.items] == ['A', 'B']
+    assert parser.skipped == 1
+
+
+def test_malformed_and_incomplete_items_skipped():
+    text = '[{"title": "A", "url": "https://a"}, {"title": "B"}, {"title": "C", "url": }, {"title": "D", "url": "https://d"}]'
+    parser = feed_in_chunks(text, 4)
+    assert [item['title'] for item in parser.items] == ['A', 'D']
+    assert parser.skipped == 2
+
+
+def test_feed_after_done_is_ignored():
+    parser = JSONArrayStreamParser(REQUIRED)
+    parser.feed('[{"title": "A", "url": "https://a"}]')
+    assert parser.done
+    assert parser.feed('[{"title": "B", "url": "https://b"}]') == []
+    assert len(parser.close()) == 1
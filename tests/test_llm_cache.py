@@ -0,0 +1,18 @@
+import os
+
+from llm_cache import ResponseCache
+
+
+def test_entry_removed_during_hit_is_a_miss(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / 'llm'))
+    key = cache.make_key(model='m', messages=[])
+    cache.put(key, {'content': 'hi'})
+
+    def evicted(path, *args):
+        # 읽은 직후 다른 프로세스의 정리로 파일이 사라진 상황
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, 'utime', evicted)
+    assert cache.get(key) is None
+    assert cache.stats == {'hits': 0, 'misses': 1}
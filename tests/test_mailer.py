@@ -0,0 +1,82 @@
+import json
+import sqlite3
+
+import pytest
+
+from mailer import RESEND_BATCH_URL, BatchMailer, Outbox
+
+RECIPIENTS = ['a@example.com', 'b@example.com', 'c@example.com']
+
+
+def batch_response(*ids) -> str:
+    return json.dumps({'data': [{'id': message_id} for message_id in ids]})
+
+
+def make_mailer(tmp_path, **options) -> BatchMailer:
+    return BatchMailer(outbox=Outbox(str(tmp_path / 'outbox.db')), rate_limit=1000, **options)
+
+
+def test_sends_and_records_message_ids(stub, tmp_path):
+    stub.add('POST', RESEND_BATCH_URL, batch_response('m1', 'm2', 'm3'))
+    mailer = make_mailer(tmp_path)
+    with stub.serve():
+        result = mailer.send('from@example.com', 'subject', '<p>hi</p>', 'hi', RECIPIENTS)
+    post_id = result['post_id']
+    assert result == {'post_id': post_id, 'sent': 3, 'failed': 0, 'retried': 0}
+    assert mailer.outbox.summary(post_id) == {'sent': 3}
+    ids = [row['message_id'] for row in mailer.outbox.conn.execute(
+        'SELECT message_id FROM outbox ORDER BY recipient')]
+    assert ids == ['m1', 'm2', 'm3']
+
+
+def test_response_without_data_is_a_failure(stub, tmp_path, no_backoff):
+    # 200인데 data가 없는 응답, statusCode 없는 오류 응답 모두 발송 실패로 기록
+    stub.add('POST', RESEND_BATCH_URL, json.dumps({'message': 'queued?'}))
+    for _ in range(3):
+        stub.add('POST', RESEND_BATCH_URL, json.dumps({'error': 'internal'}), status=500)
+    mailer = make_mailer(tmp_path, batch_size=2)
+    with stub.serve():
+        result = mailer.send('from@example.com', 'subject', '<p>hi</p>', 'hi', RECIPIENTS)
+    post_id = result['post_id']
+    assert result['sent'] == 0 and result['failed'] == 3
+    assert mailer.outbox.summary(post_id) == {'failed': 3}
+    assert mailer.outbox.pending(post_id) == {post_id: RECIPIENTS}
+
+
+def test_partial_batch_failure_is_resent_from_outbox(stub, tmp_path):
+    # 수신자 2명씩 순서대로 발송: 첫 batch 성공, 둘째 batch 실패 → deliver()로 실패한 수신자만 재발송
+    stub.add('POST', RESEND_BATCH_URL, batch_response('m1', 'm2'))
+    stub.add('POST', RESEND_BATCH_URL, json.dumps({'message': 'invalid'}), status=422)
+    stub.add('POST', RESEND_BATCH_URL, batch_response('m3'))
+    mailer = make_mailer(tmp_path, batch_size=2, max_parallel=1)
+    with stub.serve() as server:
+        post_id = mailer.send('from@example.com', 'subject', '<p>hi</p>', 'hi', RECIPIENTS)['post_id']
+        assert mailer.outbox.summary(post_id) == {'sent': 2, 'failed': 1}
+        assert mailer.outbox.pending() == {post_id: ['c@example.com']}
+
+        totals = mailer.deliver()
+    assert totals == {'sent': 1, 'failed': 0, 'retried': 1}
+    assert mailer.outbox.summary(post_id) == {'sent': 3}
+    assert mailer.outbox.pending() == {}
+    assert server.stats['served'] == 3
+
+
+def test_unauthorized_send_reports_nothing_sent(stub, tmp_path):
+    stub.add('POST', RESEND_BATCH_URL, json.dumps({'message': 'API key is invalid'}), status=401)
+    mailer = make_mailer(tmp_path)
+    with stub.serve():
+        result = mailer.send('from@example.com', 'subject', '<p>hi</p>', 'hi', RECIPIENTS)
+    assert result['sent'] == 0 and result['failed'] == 3
+
+
+def test_mailer_closes_only_the_outbox_it_opened(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)     # 기본 outbox는 data/outbox.db
+    shared = Outbox(str(tmp_path / 'shared.db'))
+    with BatchMailer(outbox=shared):
+        pass
+    assert shared.summary(1) == {}       # 넘겨받은 outbox는 그대로 사용 가능
+
+    with BatchMailer() as mailer:
+        own = mailer.outbox
+    with pytest.raises(sqlite3.ProgrammingError):
+        own.summary(1)
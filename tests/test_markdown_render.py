@@ -0,0 +1,31 @@
+from markdown_render import IncrementalRenderer, render_inline, render_markdown
+
+
+def test_heading_keeps_hash_inside_text():
+    assert render_markdown('## C#') == '<h2>C#</h2>\n'
+    assert render_markdown('### F# 와 C# 비교') == '<h3>F# 와 C# 비교</h3>\n'
+
+
+def test_heading_strips_closing_hashes_after_space():
+    assert render_markdown('## Title ##') == '<h2>Title</h2>\n'
+
+
+def test_links_only_for_allowed_schemes():
+    assert render_inline('[x](javascript:alert%281%29)') == 'x'
+    assert render_inline('[x](JavaScript:alert)') == 'x'
+    assert render_inline('[**굵게**](data:text/html,hi)') == '<strong>굵게</strong>'
+    assert render_inline('[a](https://a.example/?q=1&r=2)') == \
+        '<a href="https://a.example/?q=1&amp;r=2" target="_blank">a</a>'
+    assert render_inline('[메일](mailto:hi@example.com)') == \
+        '<a href="mailto:hi@example.com" target="_blank">메일</a>'
+
+
+def test_plain_text_is_escaped():
+    assert render_inline('a < b & c > d') == 'a &lt; b &amp; c &gt; d'
+
+
+def test_incremental_matches_whole_document():
+    md = "# 제목\n\n- **하나** [링크](http://x.example)\n- 둘\n\n```\n<code>\n```\n> 인용\n"
+    renderer = IncrementalRenderer()
+    chunks = ''.join(renderer.feed(md[i:i + 3]) for i in range(0, len(md), 3)) + renderer.close()
+    assert chunks == render_markdown(md)
@@ -0,0 +1,27 @@
+import threading
+import time
+
+from pipeline import UnifiedPipeline
+
+
+def test_timed_out_source_does_not_touch_history_or_closed_pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pipeline = UnifiedPipeline(timeouts={'perplexity': 0.05}, sources=['perplexity'])
+    finished = threading.Event()
+    errors = []
+
+    def slow_search(on_item=None, skip_covered=True):
+        # 타임아웃 뒤에 도착한 뉴스: 이력 조회 없이 돌려주고, 닫힌 풀에는 제출하지 않아야 함
+        time.sleep(0.2)
+        try:
+            assert not skip_covered
+            on_item({'title': '늦은 뉴스', 'url': 'https://late.example/1'})
+        except Exception as e:
+            errors.append(e)
+        finished.set()
+        return [{'title': '늦은 뉴스', 'url': 'https://late.example/1'}]
+
+    monkeypatch.setattr(pipeline.trend, 'search_news_with_perplexity', slow_search)
+    assert pipeline.collect() == []
+    assert finished.wait(2)
+    assert errors == [] and pipeline._prefetch == {}
@@ -0,0 +1,14 @@
+from datetime import datetime, timedelta
+
+from ranking import rank_articles
+
+NOW = datetime(2025, 6, 2, 9, 0, 0)
+
+
+def test_top_k_matches_full_sort_prefix():
+    articles = [{'title': f'AI startup news {i}', 'source': 'Hacker News', 'score': (i * 37) % 500,
+                 'comments': i, 'published': NOW - timedelta(hours=i % 30)} for i in range(200)]
+    full = rank_articles(articles, k=len(articles), max_age_hours=24, now=NOW)
+    top = rank_articles(articles, k=10, max_age_hours=24, now=NOW)
+    assert len(top) == 10
+    assert [a['title'] for a in top] == [a['title'] for a in full[:10]]
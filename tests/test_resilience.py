@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+import requests
+
+import resilience
+from resilience import CircuitBreaker, CircuitOpenError
+
+URL = 'https://api.example/status'
+
+
+def get_status():
+    resp = requests.get(URL, timeout=5)
+    resp.raise_for_status()
+    return resp.status_code
+
+
+def test_backoff_delay_is_capped_full_jitter():
+    for attempt in range(10):
+        delay = resilience.backoff_delay(attempt, base=0.5, max_delay=4.0)
+        assert 0 <= delay <= min(4.0, 0.5 * 2 ** attempt)
+
+
+def test_retries_transient_failure(stub, no_backoff):
+    stub.add('GET', URL, 'busy', status=503)
+    stub.add('GET', URL, 'ok')
+    with stub.serve() as server:
+        assert resilience.call('api', get_status) == 200
+    assert server.stats['served'] == 2
+    assert resilience.endpoint('api').stats['retries'] == 1
+
+
+def test_client_error_is_not_retried(stub, no_backoff):
+    stub.add('GET', URL, 'bad request', status=400)
+    with stub.serve() as server, pytest.raises(requests.HTTPError):
+        resilience.call('api', get_status)
+    assert server.stats['served'] == 1
+    assert resilience.endpoint('api').breaker.state == 'closed'
+
+
+def test_breaker_open_half_open_closed(stub):
+    breaker = resilience.endpoint('api').breaker
+    breaker.failure_threshold, breaker.reset_timeout = 2, 0.2
+    for _ in range(3):
+        stub.add('GET', URL, 'down', status=503)
+    stub.add('GET', URL, 'ok')
+    with stub.serve() as server:
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                resilience.call('api', get_status, attempts=1)
+        assert breaker.state == 'open'
+        # 차단 중에는 요청을 보내지 않음
+        with pytest.raises(CircuitOpenError):
+            resilience.call('api', get_status, attempts=1)
+        assert server.stats['served'] == 2
+
+        # 시험 호출이 실패하면 다시 open
+        time.sleep(0.25)
+        assert breaker.state == 'half_open'
+        with pytest.raises(requests.HTTPError):
+            resilience.call('api', get_status, attempts=1)
+        assert breaker.state == 'open'
+
+        # 시험 호출이 성공하면 closed
+        time.sleep(0.25)
+        assert resilience.call('api', get_status, attempts=1) == 200
+        assert breaker.state == 'closed' and breaker.failures == 0
+    assert server.stats['served'] == 4
+
+
+def test_half_open_admits_single_probe(stub):
+    breaker = resilience.endpoint('api').breaker
+    breaker.failure_threshold, breaker.reset_timeout = 1, 0.1
+    breaker.record_failure()
+    time.sleep(0.15)
+    stub.add('GET', URL, 'ok')
+    results = []
+
+    def worker():
+        try:
+            results.append(resilience.call('api', get_status, attempts=1))
+        except CircuitOpenError:
+            results.append('rejected')
+
+    with stub.serve(latency=0.3) as server:
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        for thread in threads:
+            thread.join()
+    assert sorted(results, key=str) == [200, 'rejected', 'rejected', 'rejected']
+    assert server.stats['served'] == 1
+    assert breaker.state == 'closed'
+
+
+def test_probe_released_on_non_breaker_error():
+    breaker = CircuitBreaker('unit', failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow() and not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_hedge_uses_faster_backup():
+    ep = resilience.endpoint('slow')
+    for _ in range(resilience.HEDGE_MIN_SAMPLES):
+        ep.latency.add(0.01)
+    calls = []
+
+    def func():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return 'primary'
+        return 'backup'
+
+    started = time.monotonic()
+    assert resilience.call('slow', func, hedge=True) == 'backup'
+    assert time.monotonic() - started < 0.4
+    assert ep.stats['hedges'] == 1 and ep.stats['hedge_wins'] == 1
@@ -0,0 +1,140 @@
+import os
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# 주제 군집 설정
+CLUSTER_SIMILARITY = float(os.getenv('CLUSTER_SIMILARITY', '0.3'))   # 이 코사인 유사도 이상이면 같은 주제
+CLUSTER_MAX_DF_RATIO = 0.05       # 이보다 많은 비율의 기사에 나오는 단어는 유사도 계산에서 제외 (정규화에는 포함)
+CLUSTER_MAX_DF_MIN = 20           # 기사 수가 적을 때도 이 수까지는 제외하지 않음
+CLUSTER_SUMMARY_CHARS = 500       # 기사당 요약에서 사용할 글자 수
+RELATED_MAX = 4                   # 대표 기사 하나에 붙일 같은 주제 기사 수
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'[a-z0-9][a-z0-9+#]+')
+_HANGUL_BIGRAM = re.compile(r'(?=([가-힣]{2}))')     # 조사가 붙어도 맞도록 한글은 두 글자씩 겹쳐 끊음
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have how in is it its of on or that the this to was were
+will with what why you your we our new says said after over into more about than just can not
+""".split())
+
+
+def _tokenize(texts: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """전체 텍스트를 한 번에 정규식으로 훑어 (문서 번호 배열, 토큰 리스트)"""
+    parts = [_TAG.sub(' ', text).lower() for text in texts]
+    ends = np.cumsum([len(part) + 1 for part in parts])
+    joined = '\n'.join(parts)
+    positions: List[int] = []
+    tokens: List[str] = []
+    for m in _WORD.finditer(joined):
+        if m.group() not in STOPWORDS:
+            positions.append(m.start())
+            tokens.append(m.group())
+    for m in _HANGUL_BIGRAM.finditer(joined):
+        positions.append(m.start())
+        tokens.append(m.group(1))
+    docs = np.searchsorted(ends, np.array(positions, dtype=np.int64), side='right')
+    return docs, tokens
+
+
+def article_text(article: Dict) -> str:
+    """제목은 두 번 넣어 요약보다 가중치를 줌"""
+    title = article.get('title', '')
+    return f"{title} {title} {(article.get('summary') or '')[:CLUSTER_SUMMARY_CHARS]}"
+
+
+def tfidf(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """희소 TF-IDF (COO 형식, 문서 → 단어 순 정렬, 행마다 L2 정규화) → (doc, term, weight, df)"""
+    vocab: Dict[str, int] = {}
+    docs, tokens = _tokenize(texts)
+    terms = np.array([vocab.setdefault(token, len(vocab)) for token in tokens], dtype=np.int64)
+    n, size = len(texts), max(len(vocab), 1)
+    keys, tf = np.unique(docs * size + terms, return_counts=True)
+    doc, term = np.divmod(keys, size)
+    df = np.bincount(term, minlength=size)
+    weight = (1 + np.log(tf)) * (np.log((1 + n) / (1 + df[term])) + 1)
+    norms = np.sqrt(np.bincount(doc, weights=weight * weight, minlength=n))
+    weight /= np.where(norms[doc] > 0, norms[doc], 1)
+    return doc, term, weight, df
+
+
+def similar_pairs(texts: Sequence[str], threshold: float = CLUSTER_SIMILARITY
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """코사인 유사도가 threshold 이상인 문서 쌍 (i < j) → (i, j, 유사도)
+
+    두 문서가 함께 가진 단어의 가중치 곱만 합산하므로 n×n 행렬을 만들지 않음.
+    한 문서에만 있는 단어와 너무 흔한 단어는 쌍을 만들지 않아 계산량이 기사 수에 거의 비례.
+    """
+    n = len(texts)
+    empty = np.array([], dtype=np.int64)
+    if n < 2:
+        return empty, empty, np.array([])
+    doc, term, weight, df = tfidf(texts)
+    max_df = max(CLUSTER_MAX_DF_MIN, int(CLUSTER_MAX_DF_RATIO * n))
+    keep = (df[term] >= 2) & (df[term] <= max_df)
+    # 단어별로 모으면 같은 단어 안에서는 문서 번호가 오름차순
+    order = np.argsort(term[keep], kind='stable')
+    doc, term, weight = doc[keep][order], term[keep][order], weight[keep][order]
+    if not len(term):
+        return empty, empty, np.array([])
+
+    # 단어 그룹 안의 모든 (앞 문서, 뒤 문서) 조합을 반복문 없이 생성
+    starts = np.flatnonzero(np.r_[True, term[1:] != term[:-1]])
+    sizes = np.diff(np.r_[starts, len(term)])
+    counts = np.repeat(starts + sizes, sizes) - np.arange(len(term)) - 1
+    left = np.repeat(np.arange(len(term)), counts)
+    right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    pairs, inverse = np.unique(doc[left] * n + doc[right], return_inverse=True)
+    sims = np.bincount(inverse.ravel(), weights=weight[left] * weight[right])
+    mask = sims >= threshold
+    return pairs[mask] // n, pairs[mask] % n, sims[mask]
+
+
+def cluster_articles(articles: Sequence[Dict], threshold: float = CLUSTER_SIMILARITY) -> List[List[int]]:
+    """우선순위 순 기사 목록을 주제별로 묶음 → [[대표, 같은 주제 기사...], ...] (대표 순서 = 우선순위)
+
+    앞에서부터 아직 묶이지 않은 기사를 대표로 삼고, 대표와 유사도가 threshold 이상인
+    나머지 기사를 같은 군집에 넣음 (대표 = 군집에서 가장 우선순위가 높은 기사).
+    """
+    left, right, sims = similar_pairs([article_text(a) for a in articles], threshold)
+    # 대표 기준 이웃 목록 (유사도 높은 순)
+    neighbors: Dict[int, List[int]] = {}
+    for i in np.lexsort((-sims, left)) if len(left) else ():
+        neighbors.setdefault(int(left[i]), []).append(int(right[i]))
+    for i in np.lexsort((-sims, right)) if len(right) else ():
+        neighbors.setdefault(int(right[i]), []).append(int(left[i]))
+
+    label = [-1] * len(articles)
+    clusters: List[List[int]] = []
+    for i in range(len(articles)):
+        if label[i] >= 0:
+            continue
+        label[i] = len(clusters)
+        members = [i]
+        for j in neighbors.get(i, ()):
+            if label[j] < 0:
+                label[j] = label[i]
+                members.append(j)
+        clusters.append(members)
+    return clusters
+
+
+def select_diverse(articles: List[Dict], k: int, threshold: float = CLUSTER_SIMILARITY) -> List[Dict]:
+    """주제 군집마다 대표 기사 하나씩 최대 k개 선택
+
+    대표 기사에는 같은 주제의 다른 기사를 cluster(제목/링크/출처 목록)와
+    프롬프트용 related("출처: 제목; ...")로 붙임.
+    """
+    selected = []
+    for members in cluster_articles(articles, threshold)[:k]:
+        leader = articles[members[0]]
+        others = [articles[j] for j in members[1:]]
+        if others:
+            leader['cluster'] = [{'title': a.get('title', ''), 'link': a.get('link', ''),
+                                  'source': a.get('source', '')} for a in others]
+            leader['related'] = '; '.join(f"{a.get('source', '')}: {a.get('title', '')}"
+                                          for a in others[:RELATED_MAX])
+        selected.append(leader)
+    return selected